@@ -7,6 +7,13 @@ from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense
 from tensorflow.keras.optimizers import Adam
 import matplotlib.pyplot as plt
+from lstm_inference import recursive_forecast, keras_step_function
+from rate_history import load_rate_history
+from lstm_windowing import sliding_windows, fit_inputs, validation_inputs
+from lstm_rate_controller import DEFAULT_HYPERPARAMETERS, load_tuned_hyperparameters
+
+# Same settings as the served model: defaults, overridden by lstm_tuning.py's best config
+HYPERPARAMETERS = dict(DEFAULT_HYPERPARAMETERS, **load_tuned_hyperparameters())
 
 # ==============================================================================
 # PART 1: DATA SETUP AND SEQUENCE CREATION
@@ -16,7 +23,7 @@ print("--- Part 1: Starting Data Preparation and Splitting ---")
 
 # Load the prepared data (from previous steps)
 try:
-    data = pd.read_csv('ai_model_input_data.csv', index_col='Date', parse_dates=True)
+    data = load_rate_history('ai_model_input_data.csv').frame
 except FileNotFoundError:
     print("Error: The file 'ai_model_input_data.csv' was not found.")
     print("Please ensure all data preparation steps were run successfully to create this file.")
@@ -30,18 +37,15 @@ scaler = MinMaxScaler(feature_range=(0, 1))
 scaled_data = scaler.fit_transform(data_for_model)
 
 # --- 3. Sequence Formatting (Lookback Window) ---
-def create_sequences(data, lookback):
-    X, y = [], []
-    for i in range(lookback, len(data)):
-        X.append(data[i-lookback:i, :])
-        y.append(data[i, :])
-    return np.array(X), np.array(y)
-
-# Hyperparameter: We use 12 months of history to predict the next month
-LOOKBACK = 12 
+# sliding_windows returns strided views over scaled_data (no per-window copies)
+
+# Hyperparameters: months of history used to predict the next month (default 12), epochs and batch size
+LOOKBACK = HYPERPARAMETERS['lookback']
+EPOCHS = HYPERPARAMETERS['epochs']
+BATCH_SIZE = HYPERPARAMETERS['batch_size']
 features = scaled_data.shape[1] 
 
-X, y = create_sequences(scaled_data, LOOKBACK)
+X, y = sliding_windows(scaled_data, LOOKBACK)
 
 # --- 4. Data Splitting (80% Train, 10% Validation, 10% Test) ---
 TOTAL_SEQUENCES = len(X)
@@ -62,24 +66,24 @@ print(f"Training sequences: {len(X_train)} | Validation: {len(X_val)} | Test: {l
 
 # --- 5. Model Definition ---
 model = Sequential([
-    LSTM(50, activation='relu', input_shape=(LOOKBACK, features)),
+    LSTM(HYPERPARAMETERS['lstm_units'], activation='relu', input_shape=(LOOKBACK, features)),
     Dense(features) 
 ])
 
-model.compile(optimizer=Adam(learning_rate=0.005), loss='mse')
+model.compile(optimizer=Adam(learning_rate=HYPERPARAMETERS['learning_rate']), loss='mse')
 
 print("\n--- Training and Evaluation ---")
 
 # --- 6. Training ---
 # Use the validation set to monitor loss and prevent overfitting
-history = model.fit(X_train, y_train, epochs=30, batch_size=32, verbose=0, 
-                    validation_data=(X_val, y_val))
+history = model.fit(**fit_inputs(X_train, y_train, batch_size=BATCH_SIZE), epochs=EPOCHS, verbose=0,
+                    validation_data=validation_inputs(X_val, y_val, batch_size=BATCH_SIZE))
 print("Training Complete.")
 
 
 # --- 7. Performance Metrics on Test Set ---
 # Use the Test Set (unseen data) to measure final performance
-y_pred_scaled = model.predict(X_test)
+y_pred_scaled = model.predict(np.asarray(X_test, dtype=np.float32))
 
 # Inverse transform predictions and actuals to original scale (rates/percentages)
 y_test_actual = scaler.inverse_transform(y_test)
@@ -106,26 +110,18 @@ print(f"YoY Inflation (RMSE): {rmse_inflation:.4f} | MAE: {mae_inflation:.4f}")
 # (Train + Validation) to maximize the information content, using the test set performance as assurance.
 X_full_train = X[:TRAIN_SIZE+VALIDATION_SIZE]
 y_full_train = y[:TRAIN_SIZE+VALIDATION_SIZE]
-model.fit(X_full_train, y_full_train, epochs=30, batch_size=32, verbose=0)
+model.fit(**fit_inputs(X_full_train, y_full_train, batch_size=BATCH_SIZE), epochs=EPOCHS, verbose=0)
 
 
 # --- 9. Recursive Forecasting ---
 forecast_steps = 60 # 5 years
 # Start with the last sequence from the full training set (X_full_train)
-last_known_sequence = X_full_train[-1].copy() 
-forecasted_scaled = []
-
-for _ in range(forecast_steps):
-    input_seq = last_known_sequence.reshape(1, LOOKBACK, features)
-    predicted_step = model.predict(input_seq, verbose=0)[0]
-    forecasted_scaled.append(predicted_step)
-    
-    # Recursive update
-    last_known_sequence = np.roll(last_known_sequence, -1, axis=0)
-    last_known_sequence[-1] = predicted_step
+# Compiled single-step inference over a preallocated lookback buffer
+# (model.predict per step is dominated by Keras/tf.data overhead)
+step_fn = keras_step_function(model, LOOKBACK, features)
+forecasted_scaled = recursive_forecast(step_fn, X_full_train[-1], forecast_steps)
 
 # --- 10. Final Output Processing ---
-forecasted_scaled = np.array(forecasted_scaled)
 forecasted_actual = scaler.inverse_transform(forecasted_scaled)
 
 last_historical_date = data.index[-1]
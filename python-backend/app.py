@@ -1,40 +1,256 @@
 
-from flask import Flask, request, jsonify
+import functools
+import json
+import math
+import os
+import time
+from flask import Flask, request, jsonify, Response, stream_with_context, g, has_request_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from customer_categorizer import NewCustomerCategorizer
-from life_stage_expense_prediction import ExpensePredictor
-from lstm_rate_controller import LSTMRateController
+from customer_categorizer import NewCustomerCategorizer, DEFAULT_STREAM_CHUNK_SIZE
+from product_recommendations import DEFAULT_TOP_SEGMENTS, DEFAULT_MAX_PRODUCTS
+from life_stage_expense_prediction import ExpensePredictor, EVENT_TYPES
+from lstm_rate_controller import LSTMRateController, DEFAULT_ENSEMBLE_PATHS, MAX_ENSEMBLE_PATHS, MAX_FORECAST_MONTHS
+from cashflow_projection import CashflowProjector, SCENARIO_DEFAULTS
+from insurance_gap import (InsuranceGapSimulator, SIMULATOR_DEFAULTS, SCENARIO_RATE_DEFAULTS, COVERAGE_SCENARIOS,
+                           MAX_SIMULATED_CUSTOMERS, MAX_DEATH_AGES, MAX_RATE_SCENARIOS)
+from parallel_scoring import ParallelScorer, DEFAULT_WORKERS as SCORING_WORKERS
+from response_cache import ResponseCache, cache_key
+from customer_features import profile_fingerprint
+from metrics import metrics, stage_timer
+from model_registry import ModelRegistry, ModelNotReady, READY, PENDING
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Times request body parsing and response serialization per endpoint"""
+    
+    def loads(self, s, **kwargs):
+        with stage_timer(request.endpoint if has_request_context() else 'app', 'json_parse'):
+            return super().loads(s, **kwargs)
+    
+    def dumps(self, obj, **kwargs):
+        with stage_timer(request.endpoint if has_request_context() else 'app', 'serialization'):
+            return super().dumps(obj, **kwargs)
 
 app = Flask(__name__)
+app.json = TimedJSONProvider(app)
 CORS(app)  # Enable CORS for all routes
 
-categorizer = NewCustomerCategorizer()
-expense_predictor = ExpensePredictor()
-lstm_controller = LSTMRateController()
+# Models load in background threads (MODEL_LOADING=eager, in parallel) or on
+# first use (MODEL_LOADING=lazy); the module-level names are proxies to them
+model_registry = ModelRegistry()
+
+def load_parallel_scorer():
+    # Workers fork with whichever scoring models loaded (None for a failed one)
+    model_registry.wait('categorizer')
+    model_registry.wait('expense_predictor')
+    return ParallelScorer(model_registry.loaded('categorizer'), model_registry.loaded('expense_predictor'))
+
+model_registry.register('categorizer', NewCustomerCategorizer, check=lambda model: model.gmm is not None)
+model_registry.register('expense_predictor', ExpensePredictor, check=lambda model: model.model is not None)
+model_registry.register('lstm_controller', LSTMRateController)
+if SCORING_WORKERS > 1:
+    # Shards large batches across SCORING_WORKERS processes (disabled by default)
+    model_registry.register('parallel_scorer', load_parallel_scorer)
+model_registry.start()
+
+categorizer = model_registry.proxy('categorizer')
+expense_predictor = model_registry.proxy('expense_predictor')
+lstm_controller = model_registry.proxy('lstm_controller')
+
+def batch_scorer():
+    """The process-pool scorer if it is enabled and loaded, else None (score in-process)"""
+    if SCORING_WORKERS <= 1:
+        return None
+    try:
+        return model_registry.get('parallel_scorer', timeout=0)
+    except ModelNotReady:
+        return None
+
+# Repeat profiles from the voice agent are served from here
+response_cache = ResponseCache()
+# Multi-year what-if projections from the rate forecast and expense bumps
+cashflow_projector = CashflowProjector(lstm_controller, expense_predictor)
+# Death-age x scenario bank balance and insurance gap grids
+insurance_gap_simulator = InsuranceGapSimulator()
+
+@app.before_request
+def start_request_timer():
+    if metrics.enabled:
+        g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_time(response):
+    start = g.get('request_start')
+    if start is not None:
+        metrics.observe(request.endpoint or 'unmatched', 'request_total', time.perf_counter() - start)
+        metrics.flush()
+    return response
+
+@app.errorhandler(ModelNotReady)
+def model_not_ready(e):
+    response = jsonify({
+        "success": False,
+        "error": f"Model '{e.name}' is not ready",
+        "model": e.name,
+        "state": e.state,
+        "details": e.error
+    })
+    response.status_code = 503
+    if e.retry_after:
+        response.headers['Retry-After'] = str(e.retry_after)
+    return response
+
+def requires_models(*names):
+    """Respond 503 until every named model is ready (waiting up to MODEL_WAIT_SECONDS)"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            for name in names:
+                model_registry.get(name)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
 
 @app.route('/')
 def index():
     return jsonify({"message": "WealthWise Python backend is running!"})
 
+@app.route('/api/health', methods=['GET'])
+def health():
+    """
+    Load state of every model (pending, loading, ready, unavailable, failed),
+    with load time and error. 200 when no model is loading or broken, else
+    503; in lazy mode models nobody has used yet stay pending.
+    """
+    models = model_registry.status()
+    healthy = all(model['state'] in (READY, PENDING) for model in models.values())
+    return jsonify({
+        "success": True,
+        "ready": model_registry.ready,
+        "loading_mode": model_registry.mode,
+        "models": models
+    }), 200 if healthy else 503
+
+def non_negative_int(value):
+    """value as an int if it is a non-negative integer (JSON number or query string digits), else None"""
+    if isinstance(value, str) and value.isascii() and value.isdigit():
+        return int(value)
+    if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+        return value
+    return None
+
+def finite_number(value):
+    """True for a finite int or float (not bool)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+def wait_seconds(value):
+    """value as float seconds if it is a non-negative finite number, else None"""
+    if isinstance(value, bool):
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    return seconds if math.isfinite(seconds) and seconds >= 0 else None
+
+def scenario_error(scenarios, defaults):
+    """
+    Validation error for a "scenarios" list of named settings dicts, or None
+    Names (default scenario_<index>) key the response, so they must be unique.
+    """
+    if not isinstance(scenarios, list) or not scenarios or not all(isinstance(s, dict) for s in scenarios):
+        return "'scenarios' must be a non-empty list of objects"
+    unknown = sorted({key for s in scenarios for key in s if key != 'name' and key not in defaults})
+    if unknown:
+        return f"Unknown scenario setting(s) {unknown}. Supported: {list(defaults)}"
+    names = []
+    for index, scenario in enumerate(scenarios):
+        name = scenario.get('name', f'scenario_{index}')
+        if not isinstance(name, str) or not name:
+            return f"scenarios[{index}].name must be a non-empty string"
+        invalid = [key for key, value in scenario.items()
+                   if key != 'name' and not (value is None and defaults[key] is None)
+                   and not finite_number(value)]
+        if invalid:
+            return f"scenarios[{index}] has non-numeric value(s) for {invalid}"
+        names.append(name)
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        return f"Duplicate scenario name(s) {duplicates}"
+    return None
+
+def product_options():
+    """
+    Product recommendation query parameters shared by the clustering routes:
+    include_products=true, top_segments (segments blended by posterior) and
+    max_products. Returns (options, error message).
+    """
+    if request.args.get('include_products', 'false').lower() != 'true':
+        return {}, None
+    if categorizer.product_index is None:
+        return None, "Product recommendations not available"
+    top_segments = request.args.get('top_segments', DEFAULT_TOP_SEGMENTS, type=int)
+    max_products = request.args.get('max_products', DEFAULT_MAX_PRODUCTS, type=int)
+    if top_segments is None or not 1 <= top_segments <= categorizer.product_index.n_segments:
+        return None, f"top_segments must be an integer between 1 and {categorizer.product_index.n_segments}"
+    if max_products is None or max_products < 1:
+        return None, "max_products must be a positive integer"
+    return {"include_products": True, "top_segments": top_segments, "max_products": max_products}, None
+
 @app.route('/api/categorize', methods=['POST'])
+@requires_models('categorizer')
 def categorize():
     data = request.get_json()
     if not data or not isinstance(data, list):
         return jsonify({"error": "Input must be a list of customer records."}), 400
-    results = categorizer.preprocess_and_categorize(data)
+    include_posteriors = request.args.get('include_posteriors', 'false').lower() == 'true'
+    options, error = product_options()
+    if error:
+        return jsonify({"error": error}), 400
+    scorer = batch_scorer()
+    if scorer is not None:
+        results = scorer.categorize(data, include_posteriors=include_posteriors, **options)
+    else:
+        results = categorizer.preprocess_and_categorize(data, include_posteriors=include_posteriors, **options)
     return jsonify({"results": results})
 
+@app.route('/api/categorize/stream', methods=['POST'])
+@requires_models('categorizer')
+def categorize_stream():
+    """
+    Streaming bulk segmentation endpoint
+    Accepts newline-delimited customer JSON (application/x-ndjson) and streams
+    one NDJSON result per customer back while the request body is still being
+    read. Optional query parameter: chunk_size (records per model call).
+    """
+    chunk_size = request.args.get('chunk_size', DEFAULT_STREAM_CHUNK_SIZE, type=int)
+    if chunk_size is None or chunk_size <= 0:
+        return jsonify({"error": "chunk_size must be a positive integer"}), 400
+    
+    results = categorizer.categorize_stream(request.stream, chunk_size)
+    return Response(
+        stream_with_context(json.dumps(result) + '\n' for result in results),
+        mimetype='application/x-ndjson'
+    )
+
 @app.route('/api/cluster-customer', methods=['POST'])
+@requires_models('categorizer')
 def cluster_customer():
     """
     New endpoint that accepts a single customer record in the specified format
     and returns clustering results
+    With ?include_products=true each result also carries "Products", ranked by
+    blending the top_segments most probable segments' product lists.
     """
     try:
         data = request.get_json()
         if not data:
             return jsonify({"error": "No data provided"}), 400
         
+        options, error = product_options()
+        if error:
+            return jsonify({"error": error}), 400
+        
         # Convert single customer record to list format for existing categorizer
         if not isinstance(data, list):
             customer_data = [data]  # Wrap single customer in list
@@ -52,23 +268,33 @@ def cluster_customer():
                 if key not in customer:
                     return jsonify({"error": f"Missing required field: {key}"}), 400
         
+        # Serve unchanged profiles from the response cache
+        key = cache_key('cluster-customer',
+                        [[customer.get("Customer_ID"), profile_fingerprint(customer)] for customer in customer_data],
+                        options)
+        response = response_cache.get(key)
+        if response is not None:
+            return jsonify(response)
+        
         # Use existing categorizer
-        results = categorizer.preprocess_and_categorize(customer_data)
+        results = categorizer.preprocess_and_categorize(customer_data, **options)
         
         # Return single result if single customer was sent
         if len(customer_data) == 1:
-            return jsonify({
+            response = {
                 "success": True,
                 "customer_id": customer_data[0].get("Customer_ID"),
                 "cluster_result": results[0] if results else None,
                 "message": "Customer successfully clustered"
-            })
+            }
         else:
-            return jsonify({
+            response = {
                 "success": True,
                 "results": results,
                 "message": f"Successfully clustered {len(results)} customers"
-            })
+            }
+        response_cache.put(key, response)
+        return jsonify(response)
             
     except Exception as e:
         return jsonify({
@@ -78,6 +304,7 @@ def cluster_customer():
         }), 500
 
 @app.route('/api/predict-expense', methods=['POST'])
+@requires_models('expense_predictor')
 def predict_expense():
     """
     New endpoint for life stage expense prediction
@@ -111,20 +338,23 @@ def predict_expense():
             if key not in customer_data:
                 return jsonify({"error": f"Missing required field in customer_data: {key}"}), 400
         
-        # Check if models are loaded
-        if not expense_predictor.model:
-            return jsonify({
-                "error": "Expense prediction models not available"
-            }), 500
+        # Serve unchanged profiles from the response cache
+        key = cache_key('predict-expense', customer_data.get("Customer_ID"),
+                        profile_fingerprint(customer_data), event_type)
+        response = response_cache.get(key)
+        if response is not None:
+            return jsonify(response)
         
         # Make prediction
         prediction_result = expense_predictor.predict_event_expense(customer_data, event_type)
         
-        return jsonify({
+        response = {
             "success": True,
             "prediction": prediction_result,
             "message": f"Successfully predicted expense bump for {event_type} event"
-        })
+        }
+        response_cache.put(key, response)
+        return jsonify(response)
         
     except Exception as e:
         return jsonify({
@@ -133,7 +363,63 @@ def predict_expense():
             "details": str(e)
         }), 500
 
+@app.route('/api/predict-expense/batch', methods=['POST'])
+@requires_models('expense_predictor')
+def predict_expense_batch():
+    """
+    Batch life stage expense prediction
+    Accepts {"customers": [...], "event_types": [...]} and predicts the expense
+    bump for every customer x event type in one vectorized model call.
+    event_types defaults to all supported events.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+        
+        customers = data.get("customers")
+        if not isinstance(customers, list) or not customers:
+            return jsonify({"error": "'customers' must be a non-empty list of customer records"}), 400
+        
+        event_types = data.get("event_types", EVENT_TYPES)
+        if not isinstance(event_types, list) or not event_types:
+            return jsonify({"error": "'event_types' must be a non-empty list"}), 400
+        invalid_events = [event for event in event_types if event not in EVENT_TYPES]
+        if invalid_events:
+            return jsonify({
+                "error": f"Invalid event type(s) {invalid_events}. Must be one of: {EVENT_TYPES}"
+            }), 400
+        
+        required_keys = ["Customer_ID", "Personal Details", "Financial Details"]
+        for index, customer in enumerate(customers):
+            if not isinstance(customer, dict):
+                return jsonify({"error": f"Invalid customer data format at index {index}"}), 400
+            for key in required_keys:
+                if key not in customer:
+                    return jsonify({"error": f"Missing required field in customers[{index}]: {key}"}), 400
+        
+        scorer = batch_scorer()
+        if scorer is not None:
+            results = scorer.predict_event_expenses(customers, event_types)
+        else:
+            results = expense_predictor.predict_event_expenses(customers, event_types)
+        
+        return jsonify({
+            "success": True,
+            "event_types": event_types,
+            "results": results,
+            "message": f"Predicted {len(event_types)} event(s) for {len(results)} customers"
+        })
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": "Batch expense prediction failed",
+            "details": str(e)
+        }), 500
+
 @app.route('/api/predict-rates', methods=['GET', 'POST'])
+@requires_models('lstm_controller')
 def predict_rates():
     """
     LSTM Rate Prediction endpoint
@@ -141,9 +427,21 @@ def predict_rates():
     
     GET: Uses default forecast period (60 months)
     POST: Accepts {"months_ahead": number} for custom forecast period
+    
+    If the model still has to be trained, training runs as a single background
+    job and this returns 202 with the job (poll /api/predict-rates/jobs/<job_id>).
+    ?wait=<seconds> (or "wait" in the POST body) waits up to that long first.
+    
+    ?ensemble=<paths> (or {"ensemble": paths | true, "seed": n}) adds p10/p50/p90
+    fan-chart bands from a residual-bootstrap ensemble to every rate entry.
     """
     try:
         months_ahead = None
+        wait = request.args.get('wait', 0)
+        ensemble_paths = request.args.get('ensemble', None)
+        if ensemble_paths is not None and non_negative_int(ensemble_paths) is not None:
+            ensemble_paths = int(ensemble_paths)
+        seed = request.args.get('seed', 0)
         
         if request.method == 'POST':
             data = request.get_json()
@@ -156,12 +454,43 @@ def predict_rates():
                         "success": False,
                         "error": "months_ahead must be a positive integer between 1 and 120"
                     }), 400
+            
+            if data and 'wait' in data:
+                wait = data['wait']
+            if data and data.get('ensemble'):
+                ensemble_paths = DEFAULT_ENSEMBLE_PATHS if data['ensemble'] is True else data['ensemble']
+                seed = data.get('seed', 0)
+        
+        wait = wait_seconds(wait)
+        if wait is None:
+            return jsonify({
+                "success": False,
+                "error": "wait must be a non-negative number of seconds"
+            }), 400
+        seed = non_negative_int(seed)
+        if seed is None:
+            return jsonify({
+                "success": False,
+                "error": "seed must be a non-negative integer"
+            }), 400
+        if ensemble_paths is not None and (not isinstance(ensemble_paths, int) or isinstance(ensemble_paths, bool)
+                                           or not 2 <= ensemble_paths <= MAX_ENSEMBLE_PATHS):
+            return jsonify({
+                "success": False,
+                "error": f"ensemble must be an integer between 2 and {MAX_ENSEMBLE_PATHS}"
+            }), 400
         
         # Generate predictions
-        result = lstm_controller.predict_rates(months_ahead)
+        result = lstm_controller.predict_rates(months_ahead, wait=min(wait, 300.0),
+                                               ensemble_paths=ensemble_paths, seed=seed)
         
         if result["success"]:
             return jsonify(result), 200
+        elif result.get("status") == "training":
+            response = jsonify(result)
+            response.headers['Location'] = f"/api/predict-rates/jobs/{result['job']['job_id']}"
+            response.headers['Retry-After'] = str(int(result['job']['eta_seconds'] or 5))
+            return response, 202
         else:
             return jsonify(result), 500
             
@@ -172,7 +501,209 @@ def predict_rates():
             "details": str(e)
         }), 500
 
+@app.route('/api/project-cashflow', methods=['POST'])
+@requires_models('lstm_controller')
+def project_cashflow():
+    """
+    Vectorized cashflow projection over customers x scenarios x months
+    Accepts {"customer_data": {...}} or {"customers": [...]}, plus optional
+    "months" (default 120), "events" ([{"event_type", "month" | "age",
+    "monthly_bump"}]; missing bumps are predicted), "scenarios" ([{"name", ...
+    settings}]), "ensemble" (rate paths for p10/p50/p90 bands), "seed",
+    "resolution" ("yearly" | "monthly") and "wait".
+    Returns cash balance, real balance, net worth and real net worth paths.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+        
+        customers = data.get("customers") or ([data["customer_data"]] if "customer_data" in data else None)
+        if not isinstance(customers, list) or not customers:
+            return jsonify({"error": "Provide 'customer_data' or a non-empty 'customers' list"}), 400
+        required_keys = ["Personal Details", "Financial Details"]
+        for index, customer in enumerate(customers):
+            if not isinstance(customer, dict) or any(key not in customer for key in required_keys):
+                return jsonify({"error": f"customers[{index}] must include {required_keys}"}), 400
+        
+        months = data.get("months", MAX_FORECAST_MONTHS)
+        if not isinstance(months, int) or not 1 <= months <= MAX_FORECAST_MONTHS:
+            return jsonify({"error": f"months must be an integer between 1 and {MAX_FORECAST_MONTHS}"}), 400
+        
+        events = data.get("events", [])
+        if not isinstance(events, list):
+            return jsonify({"error": "'events' must be a list"}), 400
+        for index, event in enumerate(events):
+            if not isinstance(event, dict) or ("month" not in event and "age" not in event):
+                return jsonify({"error": f"events[{index}] needs a 'month' or 'age'"}), 400
+            if "month" in event and not (finite_number(event["month"]) and 0 <= event["month"] < months):
+                return jsonify({"error": f"events[{index}].month must be a number between 0 and {months - 1}"}), 400
+            if "month" not in event and not (finite_number(event["age"]) and 0 <= event["age"] <= 120):
+                return jsonify({"error": f"events[{index}].age must be a number between 0 and 120"}), 400
+            if event.get("monthly_bump") is not None and not finite_number(event["monthly_bump"]):
+                return jsonify({"error": f"events[{index}].monthly_bump must be a number"}), 400
+            if event.get("monthly_bump") is None and event.get("event_type") not in EVENT_TYPES:
+                return jsonify({
+                    "error": f"events[{index}] needs a 'monthly_bump' or an event_type in {EVENT_TYPES}"
+                }), 400
+        
+        scenarios = data.get("scenarios")
+        if scenarios is not None:
+            error = scenario_error(scenarios, SCENARIO_DEFAULTS)
+            if error:
+                return jsonify({"error": error}), 400
+        
+        ensemble_paths = data.get("ensemble")
+        if ensemble_paths is True:
+            ensemble_paths = DEFAULT_ENSEMBLE_PATHS
+        if ensemble_paths and (not isinstance(ensemble_paths, int) or not 2 <= ensemble_paths <= MAX_ENSEMBLE_PATHS):
+            return jsonify({"error": f"ensemble must be an integer between 2 and {MAX_ENSEMBLE_PATHS}"}), 400
+        
+        resolution = data.get("resolution", "yearly")
+        if resolution not in ("yearly", "monthly"):
+            return jsonify({"error": "resolution must be 'yearly' or 'monthly'"}), 400
+        
+        seed = non_negative_int(data.get("seed", 0))
+        if seed is None:
+            return jsonify({"error": "seed must be a non-negative integer"}), 400
+        wait = wait_seconds(data.get("wait", 0))
+        if wait is None:
+            return jsonify({"error": "wait must be a non-negative number of seconds"}), 400
+        
+        result = cashflow_projector.project_customers(
+            customers, months=months, events=events, scenarios=scenarios,
+            ensemble_paths=ensemble_paths or None, seed=seed, resolution=resolution,
+            wait=min(wait, 300.0))
+        
+        if result["success"]:
+            return jsonify(result), 200
+        elif result.get("status") == "training":
+            return jsonify(result), 202
+        else:
+            return jsonify(result), 500
+        
+    except ModelNotReady:
+        # Predicting event bumps needs the expense model; answered with 503
+        raise
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": "Cashflow projection request failed",
+            "details": str(e)
+        }), 500
+
+@app.route('/api/insurance-gap', methods=['POST'])
+def insurance_gap():
+    """
+    Vectorized death-scenario simulator (bank_balance_calculator.js and
+    calculateCoverageNeeds over every customer x scenario x death age)
+    Accepts {"inputs": [{current_age, monthly_active_income, ...}]} or raw
+    profiles as {"customer_data": {...}} / {"customers": [...]}, plus
+    "death_ages" (required), optional "scenarios" ([{"name", ...rates}]),
+    "coverage_scenarios", "coverage_years", "years_after_death" and
+    "include_trajectories" (default true).
+    Returns balance at death, insurance gap and depletion age per death age.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+        
+        inputs = data.get("inputs")
+        profiles = None
+        if inputs is not None:
+            if not isinstance(inputs, list) or not inputs or not all(isinstance(item, dict) for item in inputs):
+                return jsonify({"error": "'inputs' must be a non-empty list of objects"}), 400
+            if len(inputs) > MAX_SIMULATED_CUSTOMERS:
+                return jsonify({"error": f"At most {MAX_SIMULATED_CUSTOMERS} customers per request"}), 400
+            for index, item in enumerate(inputs):
+                invalid = [key for key in SIMULATOR_DEFAULTS if key in item and not finite_number(item[key])]
+                if invalid:
+                    return jsonify({"error": f"inputs[{index}] has non-numeric value(s) for {invalid}"}), 400
+                if not 0 <= item.get("current_age", SIMULATOR_DEFAULTS["current_age"]) <= 120:
+                    return jsonify({"error": f"inputs[{index}].current_age must be between 0 and 120"}), 400
+        else:
+            profiles = data.get("customers") or ([data["customer_data"]] if "customer_data" in data else None)
+            if not isinstance(profiles, list) or not profiles:
+                return jsonify({"error": "Provide 'inputs', 'customer_data' or a non-empty 'customers' list"}), 400
+            if len(profiles) > MAX_SIMULATED_CUSTOMERS:
+                return jsonify({"error": f"At most {MAX_SIMULATED_CUSTOMERS} customers per request"}), 400
+            required_keys = ["Personal Details", "Financial Details"]
+            for index, customer in enumerate(profiles):
+                if not isinstance(customer, dict) or any(key not in customer for key in required_keys):
+                    return jsonify({"error": f"customers[{index}] must include {required_keys}"}), 400
+                age = customer["Personal Details"].get("Age") if isinstance(customer["Personal Details"], dict) else None
+                if not (finite_number(age) and 0 <= age <= 120):
+                    return jsonify({"error": f"customers[{index}] needs a Personal Details Age between 0 and 120"}), 400
+        
+        death_ages = data.get("death_ages")
+        if (not isinstance(death_ages, list) or not 1 <= len(death_ages) <= MAX_DEATH_AGES
+                or not all(finite_number(age) and 0 < age <= 120 for age in death_ages)):
+            return jsonify({
+                "error": f"'death_ages' must be a list of 1 to {MAX_DEATH_AGES} ages between 0 and 120"
+            }), 400
+        
+        scenarios = data.get("scenarios")
+        if scenarios is not None:
+            error = scenario_error(scenarios, SCENARIO_RATE_DEFAULTS)
+            if not error and len(scenarios) > MAX_RATE_SCENARIOS:
+                error = f"At most {MAX_RATE_SCENARIOS} scenarios per request"
+            if error:
+                return jsonify({"error": error}), 400
+        
+        coverage_scenarios = data.get("coverage_scenarios", ["baseline"])
+        if (not isinstance(coverage_scenarios, list) or not coverage_scenarios
+                or any(name not in COVERAGE_SCENARIOS for name in coverage_scenarios)):
+            return jsonify({"error": f"'coverage_scenarios' must be a non-empty list from {COVERAGE_SCENARIOS}"}), 400
+        
+        coverage_years = data.get("coverage_years", 20)
+        years_after_death = data.get("years_after_death", 5)
+        if not isinstance(coverage_years, int) or not 1 <= coverage_years <= 60:
+            return jsonify({"error": "coverage_years must be an integer between 1 and 60"}), 400
+        if not isinstance(years_after_death, int) or not 0 <= years_after_death <= 60:
+            return jsonify({"error": "years_after_death must be an integer between 0 and 60"}), 400
+        
+        include_trajectories = data.get("include_trajectories", True)
+        if not isinstance(include_trajectories, bool):
+            return jsonify({"error": "include_trajectories must be true or false"}), 400
+        
+        result = insurance_gap_simulator.simulate_customers(
+            inputs=inputs, profiles=profiles, death_ages=death_ages, scenarios=scenarios,
+            coverage_scenarios=coverage_scenarios, coverage_years=coverage_years,
+            years_after_death=years_after_death, include_trajectories=include_trajectories)
+        
+        if result["success"]:
+            return jsonify(result), 200
+        else:
+            return jsonify(result), 500
+        
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": "Insurance gap request failed",
+            "details": str(e)
+        }), 500
+
+@app.route('/api/predict-rates/jobs/<job_id>', methods=['GET'])
+@requires_models('lstm_controller')
+def rate_training_job(job_id):
+    """
+    Progress of a background LSTM training job started by /api/predict-rates
+    """
+    job = lstm_controller.training_status(job_id)
+    if job is None:
+        return jsonify({
+            "success": False,
+            "error": f"Unknown training job '{job_id}'"
+        }), 404
+    
+    return jsonify({
+        "success": True,
+        "job": job
+    }), 200
+
 @app.route('/api/latest-rates', methods=['GET'])
+@requires_models('lstm_controller')
 def get_latest_rates():
     """
     Get the most recent historical nominal and inflation rates
@@ -192,7 +723,18 @@ def get_latest_rates():
             "details": str(e)
         }), 500
 
+@app.route('/api/cache-stats', methods=['GET'])
+def cache_stats():
+    """
+    Hit/miss/eviction counters for the cluster-customer / predict-expense response cache
+    """
+    return jsonify({
+        "success": True,
+        "response_cache": response_cache.stats()
+    }), 200
+
 @app.route('/api/rates-health', methods=['GET'])
+@requires_models('lstm_controller')
 def rates_health_check():
     """
     Health check endpoint for LSTM rate prediction service
@@ -208,5 +750,35 @@ def rates_health_check():
             "details": str(e)
         }), 500
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """
+    Stage latency histograms and p50/p95/p99 in Prometheus text format
+    (?format=json for a readable summary in milliseconds). Set
+    METRICS_ENABLED=0 to switch instrumentation off.
+    """
+    if not metrics.enabled:
+        return jsonify({"error": "Metrics are disabled (METRICS_ENABLED=0)"}), 404
+    if request.args.get('format') == 'json':
+        return jsonify({"success": True, "stages": metrics.summary()})
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+def create_app():
+    """
+    Application factory for production WSGI servers (see wsgi.py and
+    gunicorn.conf.py). Waits for the parallel model loads started at import
+    and precomputes the rate forecast cache, so that with preload_app the
+    master holds every model and cache before forking and workers share them
+    copy-on-write. With MODEL_LOADING=lazy nothing is loaded here and each
+    worker loads a model the first time it needs it.
+    """
+    if model_registry.mode == 'eager':
+        model_registry.wait_all()
+        if model_registry.status()['lstm_controller']['state'] == READY:
+            lstm_controller.warm_up()
+    return app
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=9000, debug=True)
+    # Development server; use `gunicorn -c gunicorn.conf.py wsgi:application` in production
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', '9000')),
+            debug=os.environ.get('FLASK_DEBUG', '1') == '1')
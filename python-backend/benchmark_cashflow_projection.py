@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the vectorized cashflow projection engine.
+
+Compares a per-scenario, per-month Python loop (how the frontend's
+calculateFinancialProjections steps a projection) with one project() call
+over all scenarios, and checks that both give the same cash balances.
+Rate paths are synthetic random walks, so no trained LSTM is needed.
+
+Usage:
+    python benchmark_cashflow_projection.py [--scenarios 100 1000 10000] [--months 120] [--loop-limit 1000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from cashflow_projection import customer_inputs, scenario_arrays, project
+from synthetic_profiles import generate_profiles
+
+
+def loop_balance(c, s, bumps, i, j):
+    """Cash balance path of customer i under scenario j, one month at a time"""
+    cash = c['cash'][i]
+    bump_total = 0.0
+    price_index = 1.0
+    balances = []
+    for m in range(s['nominal'].shape[1]):
+        t = (m + 1) / 12.0
+        price_index *= 1 + s['inflation'][j, m] / 1200
+        age = c['age'][i] + t
+        working = age < s['retirement_age'][j] and age < s['death_age'][j]
+        income = (c['active_income'][i] * working * (1 + s['active_income_growth'][j]) ** t
+                  + c['passive_income'][i] * (1 + s['passive_income_growth'][j]) ** t)
+        bump_total += bumps[i, m] / price_index
+        expense = (c['monthly_expense'][i] * s['expense_multiplier'][j] + bump_total) * price_index
+        flow = income - expense
+        if flow >= 0:
+            flow *= s['surplus_saved'][j]
+        cash = cash * (1 + max(s['nominal'][j, m], 0) / 1200) + flow
+        balances.append(cash)
+    return balances
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized cashflow projection")
+    parser.add_argument('--scenarios', type=int, nargs='+', default=[100, 1_000, 10_000])
+    parser.add_argument('--months', type=int, default=120)
+    parser.add_argument('--loop-limit', type=int, default=1_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    customers = customer_inputs(generate_profiles(1))
+    bumps = np.zeros((1, args.months))
+    bumps[0, 24] = 500.0
+
+    print(f"{'scenarios':>10} {'loop scen/s':>12} {'vector scen/s':>14} {'speedup':>8} {'max rel diff':>13}")
+    for size in args.scenarios:
+        nominal = 3.0 + np.cumsum(rng.normal(0, 0.1, (size, args.months)), axis=1)
+        inflation = 2.0 + np.cumsum(rng.normal(0, 0.1, (size, args.months)), axis=1)
+        settings = [{'expense_multiplier': float(m), 'retirement_age': int(r)}
+                    for m, r in zip(rng.uniform(0.8, 1.2, size), rng.integers(55, 70, size))]
+        scenarios = scenario_arrays(settings, nominal, inflation)
+
+        start = time.perf_counter()
+        balance = project(customers, scenarios, bumps)['balance']
+        vector_time = time.perf_counter() - start
+
+        if size > args.loop_limit:
+            print(f"{size:>10} {'skipped':>12} {size / vector_time:>14,.0f} {'-':>8} {'-':>13}")
+            continue
+
+        start = time.perf_counter()
+        looped = np.array([loop_balance(customers, scenarios, bumps, 0, j) for j in range(size)])
+        loop_time = time.perf_counter() - start
+
+        diff = np.max(np.abs(looped - balance[0]) / np.maximum(np.abs(looped), 1.0))
+        print(f"{size:>10} {size / loop_time:>12,.0f} {size / vector_time:>14,.0f} "
+              f"{loop_time / vector_time:>7.0f}x {diff:>13.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for batch life-stage expense prediction.
+
+Compares calling predict_event_expense once per customer and event (the
+advisor UI's current pattern) with one predict_event_expenses call over all
+customers x events, and checks that both give the same bumps.
+
+Usage:
+    python benchmark_expense_batch.py [--sizes 1000 10000 50000] [--legacy-limit 10000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from life_stage_expense_prediction import ExpensePredictor, EVENT_TYPES
+from synthetic_profiles import generate_profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch expense prediction")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 50_000])
+    parser.add_argument('--legacy-limit', type=int, default=10_000)
+    args = parser.parse_args()
+
+    predictor = ExpensePredictor()
+    print(f"{'customers':>10} {'per-call pred/s':>16} {'batch pred/s':>13} {'speedup':>8} {'max diff':>9}")
+    for size in args.sizes:
+        customers = generate_profiles(size)
+        n_predictions = size * len(EVENT_TYPES)
+
+        start = time.perf_counter()
+        batch = predictor.predict_batch(customers, EVENT_TYPES)
+        batch_time = time.perf_counter() - start
+
+        if size > args.legacy_limit:
+            print(f"{size:>10} {'skipped':>16} {n_predictions / batch_time:>13,.0f} {'-':>8} {'-':>9}")
+            continue
+
+        start = time.perf_counter()
+        legacy = np.array([
+            [float(predictor.predict_event_expense(customer, event)['Predicted_Expense_Bump_SGD']
+                   .lstrip('$').replace(',', '')) for event in EVENT_TYPES]
+            for customer in customers
+        ])
+        legacy_time = time.perf_counter() - start
+
+        # The per-call path only returns the bump formatted to cents
+        max_diff = float(np.max(np.abs(legacy - np.round(batch, 2))))
+        print(f"{size:>10} {n_predictions / legacy_time:>16,.0f} {n_predictions / batch_time:>13,.0f} "
+              f"{legacy_time / batch_time:>7.0f}x {max_diff:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
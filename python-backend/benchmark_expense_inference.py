@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for expense MLP inference.
+
+Compares the sklearn serving path (DataFrame -> scaler.transform ->
+MLPRegressor.predict) with the scaler-folded NumPy engine on a preallocated
+feature array, for single-row and batch inputs, and reports the largest
+relative difference between the two.
+
+Usage:
+    python benchmark_expense_inference.py [--batch-size 10000]
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from life_stage_expense_prediction import ExpensePredictor, TRAINING_FEATURE_ORDER, build_event_feature_matrix
+from synthetic_profiles import generate_profiles
+
+
+def per_call_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark expense MLP inference")
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    args = parser.parse_args()
+
+    predictor = ExpensePredictor()
+    features = build_event_feature_matrix(generate_profiles(args.batch_size), ['Marriage'])
+    features_f32 = features.astype(np.float32)
+    single_df = pd.DataFrame(features[:1], columns=TRAINING_FEATURE_ORDER)
+    batch_df = pd.DataFrame(features, columns=TRAINING_FEATURE_ORDER)
+    single = np.empty((1, features.shape[1]), dtype=np.float64)
+    single[:] = features[:1]
+    single_f32 = single.astype(np.float32)
+
+    def sklearn_path(df):
+        return predictor.model.predict(predictor.scaler.transform(df))
+
+    reference = sklearn_path(batch_df)
+    rows = [
+        ('single row, sklearn', per_call_us(lambda: sklearn_path(single_df), 2000)),
+        ('single row, numpy float64', per_call_us(lambda: predictor.engine.predict(single), 20000)),
+        ('single row, numpy float32', per_call_us(lambda: predictor.engine.predict(single_f32), 20000)),
+        (f'batch {args.batch_size}, sklearn', per_call_us(lambda: sklearn_path(batch_df), 20)),
+        (f'batch {args.batch_size}, numpy float64', per_call_us(lambda: predictor.engine.predict(features), 20)),
+        (f'batch {args.batch_size}, numpy float32', per_call_us(lambda: predictor.engine.predict(features_f32), 20)),
+    ]
+    for label, microseconds in rows:
+        print(f"{label:<32} {microseconds:>12.1f} us")
+
+    scale = np.maximum(np.abs(reference), 1)
+    for dtype, X in (('float64', features), ('float32', features_f32)):
+        diff = np.max(np.abs(predictor.engine.predict(X) - reference) / scale)
+        print(f"max relative difference vs sklearn ({dtype}): {diff:.2e}")
+
+
+if __name__ == '__main__':
+    main()
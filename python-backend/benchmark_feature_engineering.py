@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark for categorizer feature engineering.
+
+Compares the per-record feature_engineer_new_record path with the columnar
+build_feature_matrix on synthetic profiles, and checks that both produce
+bit-identical feature matrices. The per-record path is slow at large sizes,
+so it is skipped above --legacy-limit records.
+
+Usage:
+    python benchmark_feature_engineering.py [--sizes 1000 100000 1000000] [--legacy-limit 100000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from customer_categorizer import FEATURE_NAMES, build_feature_matrix, feature_engineer_new_record
+from synthetic_profiles import generate_profiles
+
+
+def per_record_matrix(records):
+    engineered = [feature_engineer_new_record(record) for record in records]
+    return pd.DataFrame(engineered, columns=FEATURE_NAMES).to_numpy(dtype=np.float64)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark categorizer feature engineering")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--legacy-limit', type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'records':>9} {'per-record (s)':>15} {'batch (s)':>10} {'speedup':>8} {'identical':>10}")
+    for size in args.sizes:
+        records = generate_profiles(size)
+
+        start = time.perf_counter()
+        batch = build_feature_matrix(records)
+        batch_time = time.perf_counter() - start
+
+        if size <= args.legacy_limit:
+            start = time.perf_counter()
+            legacy = per_record_matrix(records)
+            legacy_time = time.perf_counter() - start
+            identical = bool(np.array_equal(legacy, batch))
+            print(f"{size:>9} {legacy_time:>15.3f} {batch_time:>10.3f} {legacy_time / batch_time:>7.1f}x {str(identical):>10}")
+        else:
+            print(f"{size:>9} {'skipped':>15} {batch_time:>10.3f} {'-':>8} {'-':>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the vectorized death-scenario simulator.
+
+Runs the year-by-year loop of bank_balance_calculator.js (without its
+logging) in node for every customer x death age, one at a time, and the
+same grid through insurance_gap.simulate, then checks that both give the
+same balance at death. Skips the JS side if node is not installed.
+
+Usage:
+    python benchmark_insurance_gap.py [--customers 100 1000 10000] [--death-ages 40 50 60 70 80]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+
+from insurance_gap import SCENARIO_RATE_DEFAULTS, simulate, scenario_rates
+
+# The bank_balance_calculator.js loop as a function; timed inside node
+JS_LOOP = """
+const fs = require('fs');
+const { customers, deathAges, rates } = JSON.parse(fs.readFileSync(process.argv[2], 'utf8'));
+
+function bankBalanceAtDeath(c, deathAge) {
+    let bankBalance = c.initial_balance;
+    const projections = [];
+    for (let year = 0; year <= (deathAge - c.current_age); year++) {
+        const age = c.current_age + year;
+        const isAlive = age < deathAge;
+        const isWorkingAge = age < rates.retirement_age;
+        let annualActiveIncome = 0;
+        if (isAlive && isWorkingAge) {
+            annualActiveIncome = 12 * c.monthly_active_income * Math.pow(1 + rates.active_income_growth, year);
+        }
+        const annualPassiveIncome = 12 * c.monthly_passive_income * Math.pow(1 + rates.passive_income_growth, year);
+        const annualExpense = 12 * c.monthly_expense * Math.pow(1 + rates.expense_inflation, year);
+        const annualSavings = isAlive ? 12 * c.monthly_savings : 0;
+        const netCashflow = annualActiveIncome + annualPassiveIncome + annualSavings - annualExpense;
+        if (netCashflow < 0) {
+            bankBalance += netCashflow;
+        }
+        bankBalance = bankBalance * (1 + rates.bank_growth_rate);
+        projections.push({ age, year, isAlive, bankBalance });
+    }
+    return projections[deathAge - c.current_age]?.bankBalance || 0;
+}
+
+const start = process.hrtime.bigint();
+const results = customers.map(c => deathAges.map(d => bankBalanceAtDeath(c, d)));
+const seconds = Number(process.hrtime.bigint() - start) / 1e9;
+process.stdout.write(JSON.stringify({ seconds, results }));
+"""
+
+
+def random_customers(n, rng):
+    return {
+        'current_age': rng.integers(25, 40, n).astype(np.float64),
+        'monthly_active_income': rng.uniform(3000, 15000, n).round(),
+        'monthly_passive_income': rng.uniform(0, 2000, n).round(),
+        'monthly_expense': rng.uniform(2000, 10000, n).round(),
+        'initial_balance': rng.uniform(0, 300000, n).round(),
+        'monthly_savings': np.zeros(n),
+        'dependents': np.zeros(n),
+        'monthly_mortgage': np.zeros(n),
+    }
+
+
+def run_js(customers, death_ages):
+    rows = [{key: float(values[i]) for key, values in customers.items()}
+            for i in range(len(customers['current_age']))]
+    with tempfile.TemporaryDirectory() as tmp:
+        script, payload = os.path.join(tmp, 'loop.js'), os.path.join(tmp, 'input.json')
+        with open(script, 'w') as f:
+            f.write(JS_LOOP)
+        with open(payload, 'w') as f:
+            json.dump({'customers': rows, 'deathAges': death_ages, 'rates': SCENARIO_RATE_DEFAULTS}, f)
+        output = subprocess.run(['node', script, payload], capture_output=True, text=True, check=True).stdout
+    result = json.loads(output)
+    return result['seconds'], np.array(result['results'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized death-scenario simulator against the JS loop")
+    parser.add_argument('--customers', type=int, nargs='+', default=[100, 1_000, 10_000])
+    parser.add_argument('--death-ages', type=int, nargs='+', default=[40, 50, 60, 70, 80])
+    args = parser.parse_args()
+
+    has_node = shutil.which('node') is not None
+    if not has_node:
+        print("node not found: timing the vectorized simulator only")
+
+    rng = np.random.default_rng(0)
+    scenarios = scenario_rates([{}])
+    print(f"{'customers':>10} {'grid cells':>11} {'JS loop cells/s':>16} {'NumPy cells/s':>14} {'speedup':>8} {'max rel diff':>13}")
+    for size in args.customers:
+        customers = random_customers(size, rng)
+        cells = size * len(args.death_ages)
+
+        start = time.perf_counter()
+        at_death = simulate(customers, scenarios, args.death_ages, keep_balance=False)['balance_at_death'][:, 0]
+        numpy_time = time.perf_counter() - start
+
+        if not has_node:
+            print(f"{size:>10} {cells:>11,} {'-':>16} {cells / numpy_time:>14,.0f} {'-':>8} {'-':>13}")
+            continue
+
+        js_time, js_values = run_js(customers, args.death_ages)
+        diff = np.max(np.abs(js_values - at_death) / np.maximum(np.abs(js_values), 1.0))
+        print(f"{size:>10} {cells:>11,} {cells / js_time:>16,.0f} {cells / numpy_time:>14,.0f} "
+              f"{js_time / numpy_time:>7.1f}x {diff:>13.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Cold-start and memory comparison of the LSTM serving backends.
+
+Each backend is measured in a fresh interpreter that imports the controller,
+loads the persisted artifact and serves one 60-month forecast, mirroring what
+a newly forked backend worker does. Reports wall time to the first forecast,
+whether TensorFlow was imported, and peak RSS.
+
+Usage:
+    python benchmark_lstm_backends.py [--runs 3]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+WORKER_SCRIPT = r"""
+import json, resource, sys, time
+start = time.perf_counter()
+from lstm_rate_controller import LSTMRateController
+controller = LSTMRateController(inference_backend=sys.argv[1])
+loaded = time.perf_counter()
+result = controller.predict_rates(60)
+done = time.perf_counter()
+print(json.dumps({
+    "success": result["success"],
+    "load_s": loaded - start,
+    "first_forecast_s": done - start,
+    "tensorflow_imported": "tensorflow" in sys.modules,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+
+def run_worker(backend):
+    completed = subprocess.run([sys.executable, '-c', WORKER_SCRIPT, backend],
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare LSTM serving backends")
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'backend':>8} {'load (s)':>9} {'first forecast (s)':>19} {'peak RSS (MB)':>14} {'TF imported':>12}")
+    for backend in ('keras', 'numpy'):
+        runs = [run_worker(backend) for _ in range(args.runs)]
+        best = min(runs, key=lambda r: r['first_forecast_s'])
+        print(f"{backend:>8} {best['load_s']:>9.2f} {best['first_forecast_s']:>19.2f} "
+              f"{max(r['peak_rss_mb'] for r in runs):>14.0f} {str(best['tensorflow_imported']):>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark for recursive LSTM rate forecasting.
+
+Compares the original per-step model.predict + np.roll loop with the compiled
+single-step Keras path and the pure-NumPy LSTM in lstm_inference.py, per
+forecast horizon. Requires a trained artifact (run train_lstm_model.py first,
+otherwise the controller trains on startup).
+
+Usage:
+    python benchmark_lstm_inference.py [--repeats 3]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from lstm_rate_controller import LSTMRateController
+from lstm_inference import recursive_forecast, keras_step_function, NumpyLSTM
+
+HORIZONS = [1, 12, 60, 120]
+
+
+def legacy_forecast(model, last_sequence, steps, lookback, features):
+    """The original forecasting loop, kept here as the baseline"""
+    last_known_sequence = last_sequence.copy()
+    forecasted_scaled = []
+    for _ in range(steps):
+        input_seq = last_known_sequence.reshape(1, lookback, features)
+        predicted_step = model.predict(input_seq, verbose=0)[0]
+        forecasted_scaled.append(predicted_step)
+        last_known_sequence = np.roll(last_known_sequence, -1, axis=0)
+        last_known_sequence[-1] = predicted_step
+    return np.array(forecasted_scaled)
+
+
+def best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recursive LSTM forecasting")
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    controller = LSTMRateController(inference_backend='keras')
+    if not controller.is_trained:
+        controller.train_and_save()
+
+    features = len(controller.model_vars)
+    step_fn = keras_step_function(controller.model, controller.lookback, features)
+    step_fn(controller.last_sequence[np.newaxis])  # trace the graph once up front
+    numpy_model = NumpyLSTM.from_keras(controller.model)
+
+    print(f"{'horizon':>8} {'legacy (ms)':>12} {'compiled (ms)':>14} {'numpy (ms)':>11} "
+          f"{'speedup':>8} {'max abs diff':>13}")
+    for horizon in HORIZONS:
+        legacy_time, legacy = best_of(
+            lambda: legacy_forecast(controller.model, controller.last_sequence, horizon,
+                                    controller.lookback, features),
+            args.repeats)
+        fast_time, fast = best_of(
+            lambda: recursive_forecast(step_fn, controller.last_sequence, horizon),
+            args.repeats)
+        numpy_time, numpy_result = best_of(
+            lambda: recursive_forecast(numpy_model, controller.last_sequence, horizon),
+            args.repeats)
+        diff = max(float(np.max(np.abs(legacy - fast))), float(np.max(np.abs(legacy - numpy_result))))
+        print(f"{horizon:>8} {legacy_time * 1000:>12.1f} {fast_time * 1000:>14.1f} {numpy_time * 1000:>11.1f} "
+              f"{legacy_time / min(fast_time, numpy_time):>7.1f}x {diff:>13.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for multi-process batch scoring.
+
+Scores the same synthetic batch through ParallelScorer with 1..N worker
+processes and reports throughput, speedup and parallel efficiency
+(speedup / workers) for categorization and expense prediction.
+
+Usage:
+    python benchmark_parallel_scoring.py [--records 200000] [--max-workers 8]
+"""
+
+import argparse
+import os
+import time
+
+from customer_categorizer import NewCustomerCategorizer
+from life_stage_expense_prediction import ExpensePredictor, EVENT_TYPES
+from parallel_scoring import ParallelScorer
+from synthetic_profiles import generate_profiles
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multi-process scoring")
+    parser.add_argument('--records', type=int, default=200_000)
+    parser.add_argument('--expense-records', type=int, default=200_000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    categorizer = NewCustomerCategorizer()
+    expense_predictor = ExpensePredictor()
+    records = generate_profiles(args.records)
+    expense_customers = records[:args.expense_records]
+
+    worker_counts = sorted({1, 2, 4, 8, 16, 32, args.max_workers} & set(range(1, args.max_workers + 1)))
+    print(f"CPUs available: {os.cpu_count()}")
+    print(f"{'workers':>8} {'categorize rec/s':>17} {'speedup':>8} {'eff.':>6} "
+          f"{'expense rec/s':>14} {'speedup':>8} {'eff.':>6}")
+
+    baseline = None
+    for workers in worker_counts:
+        scorer = ParallelScorer(categorizer, expense_predictor, workers=workers, min_batch_size=1)
+        categorize_time = timed(lambda: scorer.categorize(records))
+        expense_time = timed(lambda: scorer.predict_event_expenses(expense_customers, EVENT_TYPES))
+        scorer.shutdown()
+
+        if baseline is None:
+            baseline = (categorize_time, expense_time)
+        cat_speedup = baseline[0] / categorize_time
+        exp_speedup = baseline[1] / expense_time
+        print(f"{workers:>8} {len(records) / categorize_time:>17,.0f} {cat_speedup:>7.2f}x {cat_speedup / workers:>6.2f} "
+              f"{len(expense_customers) / expense_time:>14,.0f} {exp_speedup:>7.2f}x {exp_speedup / workers:>6.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmark suite for the WealthWise Python backend.
+
+Measures every model endpoint with the same synthetic profiles (fixed seed,
+NEW_CUSTOMERS_DATA schema) over two transports:
+
+    inprocess  Flask test client in this process (routing, JSON, models; no sockets)
+    http       a real server on a free port (python app.py, or gunicorn)
+
+plus cold start (import, first cluster-customer and first predict-rates
+request in a fresh interpreter) and peak RSS of each process. Response
+caches are sized to zero so repeated profiles measure the model path; the
+rate forecast keeps its own per-horizon cache, as in production.
+
+Results are written as JSON. --compare diffs them against an earlier run
+and exits non-zero if any latency or throughput regressed beyond --threshold.
+
+Usage:
+    python benchmark_suite.py [--output benchmark_results.json] [--requests 200]
+    python benchmark_suite.py --skip-http --output new.json --compare benchmark_results.json --threshold 0.2
+    python benchmark_suite.py --compare-only new.json benchmark_results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from loadtest import free_port, send, wait_until_up, BACKEND_DIR
+from synthetic_profiles import generate_profiles
+
+SUITE_VERSION = 1
+PROFILE_SEED = 42
+PROFILE_POOL = 2000
+RATE_HORIZONS = [12, 60, 120]
+
+# Measure the model path, not the response cache
+BENCHMARK_ENV = {'RESPONSE_CACHE_MAX_ENTRIES': '0', 'FLASK_DEBUG': '0'}
+
+# Metrics compared by --compare, and whether higher is better
+COMPARED_METRICS = {'p50_ms': False, 'p95_ms': False, 'items_per_s': True,
+                    'import_s': False, 'first_request_s': False, 'peak_rss_mb': False}
+
+COLD_START_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+from synthetic_profiles import generate_profiles
+status = client.post('/api/cluster-customer', json=generate_profiles(1)[0]).status_code
+first_request = time.perf_counter()
+rates_status = client.post('/api/predict-rates', json={'months_ahead': 60, 'wait': 600}).status_code
+first_rates = time.perf_counter()
+print(json.dumps({
+    'import_s': imported - start,
+    'first_request_s': first_request - imported,
+    'first_rates_s': first_rates - first_request,
+    'statuses': [status, rates_status],
+    'maxrss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+
+def check_schema(profile, reference):
+    """Fail fast if the synthetic profiles drift from the NEW_CUSTOMERS_DATA schema"""
+    for key, value in reference.items():
+        if key not in profile:
+            raise ValueError(f"Synthetic profile is missing '{key}'")
+        if isinstance(value, dict):
+            check_schema(profile[key], value)
+
+
+def maxrss_mb(maxrss):
+    """ru_maxrss is in KB on Linux and in bytes on macOS"""
+    return maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+
+
+def process_group_peak_rss_mb(pgid):
+    """Sum of VmHWM (peak RSS) over a process group's live processes, Linux only"""
+    total_kb, found = 0, False
+    for entry in os.listdir('/proc') if os.path.isdir('/proc') else []:
+        if not entry.isdigit():
+            continue
+        try:
+            if os.getpgid(int(entry)) != pgid:
+                continue
+            with open(f'/proc/{entry}/status') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        total_kb += int(line.split()[1])
+                        found = True
+        except (OSError, ValueError):
+            continue
+    return round(total_kb / 1024, 1) if found else None
+
+
+def build_cases(profiles, n_requests):
+    """
+    (name, method, path, body(i), items per request, requests) for every
+    endpoint; body(i) cycles through the profile pool
+    """
+    def pick(i, size):
+        start = (i * size) % len(profiles)
+        return (profiles[start:] + profiles[:start])[:size]
+
+    batch_requests = max(10, n_requests // 10)
+    cases = [
+        ('categorize_1', 'POST', '/api/categorize', lambda i: pick(i, 1), 1, n_requests),
+        ('categorize_100', 'POST', '/api/categorize', lambda i: pick(i, 100), 100, batch_requests),
+        ('categorize_1000', 'POST', '/api/categorize', lambda i: pick(i, 1000), 1000, batch_requests),
+        ('cluster_customer', 'POST', '/api/cluster-customer', lambda i: profiles[i % len(profiles)], 1, n_requests),
+        ('predict_expense', 'POST', '/api/predict-expense',
+         lambda i: {"customer_data": profiles[i % len(profiles)], "event_type": "Marriage"}, 1, n_requests),
+        ('predict_expense_batch_100', 'POST', '/api/predict-expense/batch',
+         lambda i: {"customers": pick(i, 100)}, 100, batch_requests),
+        ('predict_expense_batch_1000', 'POST', '/api/predict-expense/batch',
+         lambda i: {"customers": pick(i, 1000)}, 1000, batch_requests),
+    ]
+    for horizon in RATE_HORIZONS:
+        cases.append((f'predict_rates_{horizon}', 'POST', '/api/predict-rates',
+                      lambda i, h=horizon: {"months_ahead": h}, 1, n_requests))
+    return cases
+
+
+def summarize(latencies, items):
+    latencies = np.asarray(latencies)
+    total = latencies.sum()
+    return {
+        'requests': len(latencies),
+        'mean_ms': round(1000 * latencies.mean(), 3),
+        'p50_ms': round(1000 * np.percentile(latencies, 50), 3),
+        'p95_ms': round(1000 * np.percentile(latencies, 95), 3),
+        'p99_ms': round(1000 * np.percentile(latencies, 99), 3),
+        'requests_per_s': round(len(latencies) / total, 2),
+        'items_per_s': round(len(latencies) * items / total, 2),
+    }
+
+
+def run_cases(cases, call, warmup, rounds):
+    """
+    Time every case sequentially with call(method, path, body) -> status
+
+    Each case is timed for `rounds` rounds and the round with the lowest p50
+    is reported (the least disturbed by other load on the machine), with
+    every round's p50 kept to show the spread.
+    """
+    results = {}
+    for name, method, path, body, items, n_requests in cases:
+        for i in range(warmup):
+            call(method, path, body(i))
+        best, round_p50s, errors = None, [], 0
+        for _ in range(rounds):
+            latencies = []
+            for i in range(n_requests):
+                payload = body(warmup + i)
+                start = time.perf_counter()
+                status = call(method, path, payload)
+                latencies.append(time.perf_counter() - start)
+                errors += status >= 400
+            summary = summarize(latencies, items)
+            round_p50s.append(summary['p50_ms'])
+            if best is None or summary['p50_ms'] < best['p50_ms']:
+                best = summary
+        results[name] = dict(best, items_per_request=items, errors=errors, round_p50_ms=round_p50s)
+        print(f"  {name:<28} p50 {results[name]['p50_ms']:>9.3f} ms  p95 {results[name]['p95_ms']:>9.3f} ms  "
+              f"{results[name]['items_per_s']:>12,.1f} items/s" + (f"  ({errors} errors)" if errors else ""))
+    return results
+
+
+def measure_cold_start():
+    env = dict(os.environ, **BENCHMARK_ENV)
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', COLD_START_SCRIPT], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    wall = time.perf_counter() - start
+    result = json.loads(output.strip().splitlines()[-1])
+    return {
+        'process_wall_s': round(wall, 3),
+        'import_s': round(result['import_s'], 3),
+        'first_request_s': round(result['first_request_s'], 4),
+        'first_rates_s': round(result['first_rates_s'], 4),
+        'statuses': result['statuses'],
+        'peak_rss_mb': round(maxrss_mb(result['maxrss']), 1),
+    }
+
+
+def run_inprocess(cases, warmup, rounds):
+    os.environ.update(BENCHMARK_ENV)
+    import app
+    client = app.app.test_client()
+    # Train or load the rate model before timing
+    client.post('/api/predict-rates', json={"months_ahead": 60, "wait": 600})
+
+    def call(method, path, body):
+        return client.open(path, method=method, json=body).status_code
+
+    results = run_cases(cases, call, warmup, rounds)
+    return {'cases': results,
+            'peak_rss_mb': round(maxrss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss), 1)}
+
+
+def run_http(cases, warmup, rounds, server):
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, PORT=str(port), **BENCHMARK_ENV)
+    if server == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:application']
+    else:
+        command = [sys.executable, 'app.py']
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, start_new_session=True)
+    try:
+        started = time.perf_counter()
+        wait_until_up(url, process)
+        ready_s = time.perf_counter() - started
+        send(url, 'POST', '/api/predict-rates', {"months_ahead": 60, "wait": 600})
+
+        def call(method, path, body):
+            try:
+                return send(url, method, path, body)
+            except OSError as e:
+                return getattr(e, 'code', 599)
+
+        results = run_cases(cases, call, warmup, rounds)
+        return {'server': server, 'ready_s': round(ready_s, 3), 'cases': results,
+                'peak_rss_mb': process_group_peak_rss_mb(process.pid)}
+    finally:
+        os.killpg(process.pid, 15)
+        process.wait()
+
+
+def flatten(results):
+    """{metric path: value} for the metrics in COMPARED_METRICS"""
+    flat = {}
+    cold = results.get('cold_start') or {}
+    for metric in ('import_s', 'first_request_s', 'peak_rss_mb'):
+        if cold.get(metric) is not None:
+            flat[f'cold_start.{metric}'] = cold[metric]
+    for transport in ('inprocess', 'http'):
+        section = results.get(transport) or {}
+        if section.get('peak_rss_mb') is not None:
+            flat[f'{transport}.peak_rss_mb'] = section['peak_rss_mb']
+        for name, case in (section.get('cases') or {}).items():
+            for metric in ('p50_ms', 'p95_ms', 'items_per_s'):
+                flat[f'{transport}.{name}.{metric}'] = case[metric]
+    return flat
+
+
+def compare(new, baseline, threshold):
+    """Print metric changes vs the baseline; returns the regressed metric paths"""
+    new_flat, old_flat = flatten(new), flatten(baseline)
+    regressions = []
+    print(f"\n{'metric':<52} {'baseline':>12} {'new':>12} {'change':>8}")
+    for path in sorted(set(new_flat) & set(old_flat)):
+        old, value = old_flat[path], new_flat[path]
+        if not old:
+            continue
+        change = (value - old) / old
+        higher_is_better = COMPARED_METRICS[path.rsplit('.', 1)[1]]
+        regressed = (-change if higher_is_better else change) > threshold
+        if regressed:
+            regressions.append(path)
+        print(f"{path:<52} {old:>12.3f} {value:>12.3f} {change:>+7.1%}{'  REGRESSION' if regressed else ''}")
+    missing = sorted({path.split('.', 1)[0] for path in set(old_flat) - set(new_flat)})
+    if missing:
+        print(f"In the baseline but not measured in this run: {', '.join(missing)}")
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every Python backend model and endpoint")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--requests', type=int, default=200, help="Timed requests per single-record case")
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--rounds', type=int, default=3, help="Timed rounds per case; the best is reported")
+    parser.add_argument('--server', choices=['dev', 'gunicorn'], default='dev',
+                        help="HTTP server: python app.py (FLASK_DEBUG=0) or gunicorn")
+    parser.add_argument('--skip-inprocess', action='store_true')
+    parser.add_argument('--skip-http', action='store_true')
+    parser.add_argument('--skip-cold-start', action='store_true')
+    parser.add_argument('--compare', metavar='BASELINE', help="Diff this run against an earlier results file")
+    parser.add_argument('--compare-only', nargs=2, metavar=('NEW', 'BASELINE'),
+                        help="Diff two existing results files without running anything")
+    parser.add_argument('--threshold', type=float, default=0.20, help="Relative change counted as a regression")
+    args = parser.parse_args()
+
+    if args.compare_only:
+        with open(args.compare_only[0]) as f:
+            new = json.load(f)
+        with open(args.compare_only[1]) as f:
+            baseline = json.load(f)
+        return 1 if compare(new, baseline, args.threshold) else 0
+
+    from life_stage_expense_prediction import NEW_CUSTOMERS_DATA
+    profiles = generate_profiles(PROFILE_POOL, seed=PROFILE_SEED)
+    check_schema(profiles[0], NEW_CUSTOMERS_DATA[0])
+    cases = build_cases(profiles, args.requests)
+
+    results = {
+        'suite_version': SUITE_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': git_commit(),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'config': {'requests': args.requests, 'warmup': args.warmup, 'rounds': args.rounds, 'profile_seed': PROFILE_SEED,
+                   'profile_pool': PROFILE_POOL, 'rate_horizons': RATE_HORIZONS, 'server': args.server},
+    }
+
+    if not args.skip_cold_start:
+        print("Cold start")
+        results['cold_start'] = measure_cold_start()
+        print(f"  import {results['cold_start']['import_s']:.2f} s, first request "
+              f"{results['cold_start']['first_request_s'] * 1000:.1f} ms, peak RSS {results['cold_start']['peak_rss_mb']} MB")
+    if not args.skip_inprocess:
+        print("In-process (Flask test client)")
+        results['inprocess'] = run_inprocess(cases, args.warmup, args.rounds)
+    if not args.skip_http:
+        print(f"HTTP ({args.server} server)")
+        results['http'] = run_http(cases, args.warmup, args.rounds, args.server)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
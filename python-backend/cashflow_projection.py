@@ -0,0 +1,278 @@
+import numpy as np
+from typing import Dict, Any, List, Optional
+
+from model_registry import ModelNotReady
+
+# --- Vectorized Cashflow Projection ---
+# Arrays over (customers, scenarios, months), following calculateFinancialProjections in public/app.js.
+# cash[m] = cash[m-1] * (1 + rate / 12) + flow[m] is solved as G[m] * (cash[0] + cumsum(flow / G)[m])
+
+# Assets earning the forecast nominal rate; all others compound at their own Return on Investment
+CASH_ASSET_TYPES = {'Bank Savings', 'Cash', 'Fixed Deposit'}
+
+# Scenario settings and their defaults (annual rates as decimals, rate and
+# inflation shifts in percentage points)
+SCENARIO_DEFAULTS = {
+    'active_income_growth': 0.05,
+    'passive_income_growth': 0.02,
+    'expense_multiplier': 1.0,
+    'rate_shift': 0.0,
+    'inflation_shift': 0.0,
+    'return_shift': 0.0,
+    'retirement_age': 65,
+    'death_age': None,
+    # Share of a monthly surplus added to cash (0 keeps only deficits, like the frontend)
+    'surplus_saved': 1.0,
+}
+
+# Bounds each (customers x scenarios x months) intermediate to ~32 MB
+MAX_CHUNK_ELEMENTS = 4_000_000
+
+
+def customer_inputs(records: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Starting position of each customer profile as (C,) arrays (expense implied by income and Net_Cashflow)"""
+    n = len(records)
+    columns = {key: np.zeros(n) for key in ('age', 'active_income', 'passive_income', 'monthly_expense',
+                                            'cash', 'invested', 'invested_return', 'liabilities')}
+    for i, record in enumerate(records):
+        financial = record.get('Financial Details', {})
+        incomes = financial.get('Income', [])
+        active = next((inc.get('Amount', 0) for inc in incomes if inc.get('Income_Type') == 'Active'), 0)
+        passive = sum(inc.get('Amount', 0) for inc in incomes if inc.get('Income_Type') == 'Passive')
+        net_cashflow = financial.get('Derived', {}).get('Net_Cashflow', 0) or 0
+
+        cash = invested = weighted_return = 0.0
+        for asset in financial.get('Assets', []):
+            value = asset.get('Current Value', 0) or 0
+            if asset.get('Asset Type') in CASH_ASSET_TYPES:
+                cash += value
+            else:
+                invested += value
+                weighted_return += value * float(asset.get('Return on Investment', 0) or 0)
+
+        columns['age'][i] = record['Personal Details']['Age']
+        columns['active_income'][i] = active
+        columns['passive_income'][i] = passive
+        columns['monthly_expense'][i] = max(active + passive - net_cashflow / 12, 0)
+        columns['cash'][i] = cash
+        columns['invested'][i] = invested
+        columns['invested_return'][i] = weighted_return / invested if invested > 0 else 0.0
+        columns['liabilities'][i] = sum(l.get('Current Value', 0) or 0 for l in financial.get('Liabilities', []))
+    return columns
+
+
+def scenario_arrays(scenarios: List[Dict[str, Any]], nominal: np.ndarray, inflation: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Stack scenario settings into (S,) arrays next to their (S, M) rate paths
+
+    Args:
+        scenarios: One settings dict per scenario (missing keys use SCENARIO_DEFAULTS)
+        nominal, inflation: (S, M) annual rates in percent
+    """
+    settings = [dict(SCENARIO_DEFAULTS, **{k: v for k, v in s.items() if k in SCENARIO_DEFAULTS}) for s in scenarios]
+    arrays = {key: np.array([s[key] for s in settings], dtype=np.float64)
+              for key in SCENARIO_DEFAULTS if key != 'death_age'}
+    arrays['death_age'] = np.array([np.inf if s['death_age'] is None else s['death_age'] for s in settings],
+                                   dtype=np.float64)
+    arrays['nominal'] = np.asarray(nominal, dtype=np.float64) + arrays['rate_shift'][:, np.newaxis]
+    arrays['inflation'] = np.asarray(inflation, dtype=np.float64) + arrays['inflation_shift'][:, np.newaxis]
+    return arrays
+
+
+def _project_chunk(c, s, bumps, include_components):
+    months = s['nominal'].shape[1]
+    t = np.arange(1, months + 1) / 12.0                                          # years elapsed, (M,)
+
+    # Scenario-level paths, (S, M)
+    growth = np.cumprod(1 + np.maximum(s['nominal'], 0) / 1200, axis=1)          # cash interest factor G
+    price_index = np.cumprod(1 + s['inflation'] / 1200, axis=1)                  # inflation index I
+    active_growth = (1 + s['active_income_growth'][:, np.newaxis]) ** t
+    passive_growth = (1 + s['passive_income_growth'][:, np.newaxis]) ** t
+
+    # Customer x scenario x month, (C, S, M)
+    age = c['age'][:, np.newaxis, np.newaxis] + t
+    working = (age < s['retirement_age'][:, np.newaxis]) & (age < s['death_age'][:, np.newaxis])
+    income = (c['active_income'][:, np.newaxis, np.newaxis] * working * active_growth
+              + c['passive_income'][:, np.newaxis, np.newaxis] * passive_growth)
+
+    # Event bumps are in the event month's money, then inflate with the index
+    bump_total = np.cumsum(bumps[:, np.newaxis, :] / price_index, axis=2)
+    base_expense = c['monthly_expense'][:, np.newaxis] * s['expense_multiplier']  # (C, S)
+    expense = (base_expense[:, :, np.newaxis] + bump_total) * price_index
+
+    flow = income - expense
+    flow = np.where(flow < 0, flow, flow * s['surplus_saved'][:, np.newaxis])
+    cash = growth * (c['cash'][:, np.newaxis, np.newaxis] + np.cumsum(flow / growth, axis=2))
+
+    invested_rate = c['invested_return'][:, np.newaxis] + s['return_shift']      # (C, S)
+    invested = c['invested'][:, np.newaxis, np.newaxis] * (1 + invested_rate[:, :, np.newaxis]) ** t
+    net_worth = cash + invested - c['liabilities'][:, np.newaxis, np.newaxis]
+
+    result = {
+        'balance': cash,
+        'real_balance': cash / price_index,
+        'net_worth': net_worth,
+        'real_net_worth': net_worth / price_index,
+    }
+    if include_components:
+        result.update(income=income, expense=expense, invested=invested)
+    return result
+
+
+def project(customers: Dict[str, np.ndarray], scenarios: Dict[str, np.ndarray],
+            event_bumps: Optional[np.ndarray] = None, include_components: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Project every customer under every scenario
+
+    Args:
+        customers: (C,) arrays from customer_inputs
+        scenarios: (S,) / (S, M) arrays from scenario_arrays
+        event_bumps: (C, M) monthly expense increase starting in each month
+            (in that month's money); None for no events
+        include_components: Also return income, expense and invested arrays
+
+    Returns:
+        dict: (C, S, M) float64 arrays 'balance', 'real_balance', 'net_worth'
+        and 'real_net_worth' (plus the components if requested)
+    """
+    n_customers = len(customers['age'])
+    n_scenarios, months = scenarios['nominal'].shape
+    if event_bumps is None:
+        event_bumps = np.zeros((n_customers, months))
+
+    # Chunk over customers to bound the (C, S, M) intermediates
+    chunk = max(1, MAX_CHUNK_ELEMENTS // max(n_scenarios * months, 1))
+    if chunk >= n_customers:
+        return _project_chunk(customers, scenarios, event_bumps, include_components)
+
+    parts = [_project_chunk({key: values[i:i + chunk] for key, values in customers.items()},
+                            scenarios, event_bumps[i:i + chunk], include_components)
+             for i in range(0, n_customers, chunk)]
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+def first_shortfall_month(balance: np.ndarray) -> np.ndarray:
+    """Index of the first month with a negative cash balance, -1 if none, (C, S)"""
+    negative = balance < 0
+    return np.where(negative.any(axis=-1), negative.argmax(axis=-1), -1)
+
+
+def sample_months(months, resolution='yearly'):
+    """Reported month indices: every 12th month plus the last one for 'yearly', all for 'monthly'"""
+    if resolution != 'yearly':
+        return np.arange(months)
+    sample = list(range(11, months, 12))
+    if not sample or sample[-1] != months - 1:
+        sample.append(months - 1)
+    return np.array(sample)
+
+
+class CashflowProjector:
+    """Projections for profiles, life events and named scenarios over the LSTM rate paths"""
+
+    def __init__(self, lstm_controller, expense_predictor):
+        self.lstm_controller = lstm_controller
+        self.expense_predictor = expense_predictor
+
+    def _event_bumps(self, customers, inputs, events, months):
+        """(C, M) bump matrix; missing monthly_bump amounts are predicted per customer"""
+        bumps = np.zeros((len(customers), months))
+        predicted_types = sorted({e['event_type'] for e in events if e.get('monthly_bump') is None})
+        predicted = {}
+        if predicted_types:
+            if not self.expense_predictor.model:
+                raise Exception("Expense model not initialized; pass monthly_bump for every event")
+            values = self.expense_predictor.predict_batch(customers, predicted_types)
+            predicted = {event_type: values[:, j] for j, event_type in enumerate(predicted_types)}
+
+        for event in events:
+            if 'month' in event:
+                start = np.full(len(customers), int(event['month']))
+            else:
+                start = np.round((float(event['age']) - inputs['age']) * 12).astype(int)
+            amount = (np.full(len(customers), float(event['monthly_bump']))
+                      if event.get('monthly_bump') is not None else predicted[event['event_type']])
+            inside = (start >= 0) & (start < months)
+            bumps[np.nonzero(inside)[0], start[inside]] += amount[inside]
+        return bumps
+
+    def project_customers(self, customers, months=120, events=None, scenarios=None,
+                          ensemble_paths=None, seed=0, resolution='yearly', wait=0):
+        """
+        Args:
+            customers (list): Raw customer profiles
+            months (int): Projection horizon (up to the rate forecast horizon)
+            events (list): [{"event_type", "month" | "age", "monthly_bump" (optional)}]
+            scenarios (list): Named settings dicts, see SCENARIO_DEFAULTS
+                (default: one "baseline" scenario)
+            ensemble_paths (int): Run every scenario over this many bootstrapped
+                rate paths and report p10/p50/p90 instead of a single path
+            seed (int): Ensemble seed
+            resolution (str): 'yearly' (every 12th month and the last) or 'monthly'
+            wait (float): Seconds to wait if the rate model is still training
+
+        Returns:
+            dict: JSON-ready response
+        """
+        try:
+            events = events or []
+            scenarios = scenarios or [{'name': 'baseline'}]
+            rates = self.lstm_controller.rate_paths(months, paths=ensemble_paths, seed=seed, wait=wait)
+            if not rates["success"]:
+                return rates
+
+            paths = rates["paths"]                                   # (P, M, 2)
+            n_paths = len(paths)
+            # Scenario axis: every named scenario over every rate path
+            expanded = [scenario for scenario in scenarios for _ in range(n_paths)]
+            scenario_set = scenario_arrays(expanded, np.tile(paths[:, :, 0], (len(scenarios), 1)),
+                                           np.tile(paths[:, :, 1], (len(scenarios), 1)))
+
+            inputs = customer_inputs(customers)
+            bumps = self._event_bumps(customers, inputs, events, months)
+            projection = project(inputs, scenario_set, bumps)
+            shortfall = first_shortfall_month(projection['balance'])
+
+            sample = sample_months(months, resolution)
+            dates = [rates["dates"][m] for m in sample]
+            series = ('balance', 'real_balance', 'net_worth', 'real_net_worth')
+
+            results = []
+            for i, customer in enumerate(customers):
+                per_scenario = {}
+                for j, scenario in enumerate(scenarios):
+                    block = slice(j * n_paths, (j + 1) * n_paths)
+                    entry = {}
+                    for name in series:
+                        values = projection[name][i, block, sample]
+                        if n_paths == 1:
+                            entry[name] = np.round(values[0], 2).tolist()
+                        else:
+                            for label, q in (('p10', 10), ('p50', 50), ('p90', 90)):
+                                entry[f"{name}_{label}"] = np.round(np.percentile(values, q, axis=0), 2).tolist()
+                    months_short = shortfall[i, block]
+                    entry["shortfall_probability"] = round(float(np.mean(months_short >= 0)), 4)
+                    entry["first_shortfall_month"] = (int(np.min(months_short[months_short >= 0]))
+                                                      if np.any(months_short >= 0) else None)
+                    per_scenario[scenario.get('name', f'scenario_{j}')] = entry
+                results.append({"Customer_ID": customer.get('Customer_ID', 'N/A'), "scenarios": per_scenario})
+
+            return {
+                "success": True,
+                "months": months,
+                "resolution": resolution,
+                "dates": dates,
+                "rate_paths": n_paths,
+                "model_version": self.lstm_controller.model_version,
+                "results": results
+            }
+
+        except ModelNotReady:
+            # The expense model is still loading or failed; app.py answers 503
+            raise
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "Cashflow projection failed",
+                "details": str(e)
+            }
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Bulk customer segmentation from the command line.
+
+Reads newline-delimited customer JSON (one profile per line, same schema as
+/api/categorize) and writes one NDJSON result per line, processing the input
+in fixed-size chunks so memory stays flat regardless of file size. This is
+the offline counterpart of POST /api/categorize/stream.
+
+Usage:
+    python categorize_ndjson.py customers.ndjson -o segments.ndjson
+    cat customers.ndjson | python categorize_ndjson.py > segments.ndjson
+"""
+
+import argparse
+import json
+import sys
+
+from customer_categorizer import NewCustomerCategorizer, DEFAULT_STREAM_CHUNK_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Segment customers from an NDJSON file")
+    parser.add_argument('input', nargs='?', default='-', help="Input NDJSON file (default: stdin)")
+    parser.add_argument('-o', '--output', default='-', help="Output NDJSON file (default: stdout)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_STREAM_CHUNK_SIZE,
+                        help="Records scored per model call")
+    args = parser.parse_args()
+
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be a positive integer")
+
+    categorizer = NewCustomerCategorizer()
+    if not categorizer.gmm:
+        print("Error: categorizer models are not available", file=sys.stderr)
+        return 1
+
+    source = sys.stdin if args.input == '-' else open(args.input, 'r')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w')
+    processed = failed = 0
+    try:
+        for result in categorizer.categorize_stream(source, args.chunk_size):
+            sink.write(json.dumps(result) + '\n')
+            processed += 1
+            failed += 'error' in result
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    print(f"Processed {processed} records ({failed} failed)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,13 @@
 import joblib
+import json
 import pandas as pd
 import numpy as np
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable, Iterator
+from customer_features import flatten_customer_records, extract_customer_columns
+from gmm_scoring import GMMScoringEngine
+from metrics import stage_timer
+from product_recommendations import ProductRecommendationIndex, DEFAULT_TOP_SEGMENTS, DEFAULT_MAX_PRODUCTS
 
 MODEL_DIR = './deployment_models/'
 GMM_MODEL_PATH = os.path.join(MODEL_DIR, 'gmm_k8_segmenter.joblib')
@@ -19,6 +24,9 @@ ARCHETYPE_MAP = {
     7: "Pre-Retirement Accumulator",
 }
 
+# Records scored per scaler/GMM call when streaming NDJSON; bounds peak memory
+DEFAULT_STREAM_CHUNK_SIZE = 5000
+
 def feature_engineer_new_record(raw_row: Dict[str, Any]) -> pd.Series:
     active_income = next((i.get('Amount', 0) * 12 for i in raw_row.get('Financial Details', {}).get('Income', []) if i.get('Income_Type') == 'Active'), 0)
     assets_list = raw_row.get('Financial Details', {}).get('Assets', [])
@@ -46,37 +54,154 @@ def feature_engineer_new_record(raw_row: Dict[str, Any]) -> pd.Series:
         'Gender_Male': 1 if raw_row['Personal Details']['Gender'] == 'Male' else 0,
     })
 
+FEATURE_NAMES = [
+    'Age', 'Net_Worth', 'Net_Cashflow', 'Active_Income_Annual', 'Mortgage_Ratio', 
+    'Asset_Return_Weighted', 'Child_Count', 
+    'Marital_Status_Married', 'Marital_Status_Single', 'Marital_Status_Widowed', 
+    'Gender_Male' 
+]
+
+def build_feature_matrix(raw_rows: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Batch equivalent of feature_engineer_new_record: an (n, 11) float64 matrix
+    in FEATURE_NAMES order, identical to stacking the per-record Series.
+    """
+    return feature_matrix_from_columns(flatten_customer_records(raw_rows))
+
+def feature_matrix_from_columns(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Categorizer feature matrix from shared base feature columns"""
+    marital = columns['Marital_Status']
+    matrix = np.empty((len(marital), len(FEATURE_NAMES)), dtype=np.float64)
+    matrix[:, 0] = columns['Age']
+    matrix[:, 1] = columns['Net_Worth']
+    matrix[:, 2] = columns['Net_Cashflow']
+    matrix[:, 3] = columns['Active_Income_Annual']
+    matrix[:, 4] = columns['Mortgage_Ratio']
+    matrix[:, 5] = columns['Asset_Return_Weighted']
+    matrix[:, 6] = columns['Child_Count']
+    matrix[:, 7] = marital == 'Married'
+    matrix[:, 8] = marital == 'Single'
+    matrix[:, 9] = marital == 'Widowed'
+    matrix[:, 10] = columns['Gender'] == 'Male'
+    return matrix
+
 class NewCustomerCategorizer:
     def __init__(self):
         try:
             model_dir = os.path.join(os.path.dirname(__file__), 'models', 'cluster')
             self.gmm = joblib.load(os.path.join(model_dir, 'gmm_k8_segmenter.joblib'))
             self.scaler = joblib.load(os.path.join(model_dir, 'scaler_transform.joblib'))
-            self.feature_names = [
-                'Age', 'Net_Worth', 'Net_Cashflow', 'Active_Income_Annual', 'Mortgage_Ratio', 
-                'Asset_Return_Weighted', 'Child_Count', 
-                'Marital_Status_Married', 'Marital_Status_Single', 'Marital_Status_Widowed', 
-                'Gender_Male' 
-            ]
+            self.feature_names = FEATURE_NAMES
+            # Single-pass scoring with the scaler folded in (raw features in)
+            self.engine = GMMScoringEngine(self.gmm, self.scaler)
         except Exception as e:
             print(f"Error loading models: {e}. Ensure models are saved to ./models/ directory.")
             self.gmm = None
             self.scaler = None
-    def preprocess_and_categorize(self, new_raw_data: List[Dict[str, Any]]):
+            self.engine = None
+        try:
+            # Products per Segment_ID, loaded once
+            self.product_index = ProductRecommendationIndex(ARCHETYPE_MAP)
+        except Exception as e:
+            print(f"Warning: Could not load product recommendations: {e}")
+            self.product_index = None
+    def preprocess_and_categorize(self, new_raw_data: List[Dict[str, Any]], include_posteriors: bool = False,
+                                  include_products: bool = False, top_segments: int = DEFAULT_TOP_SEGMENTS,
+                                  max_products: int = DEFAULT_MAX_PRODUCTS):
         if not self.gmm:
             return "Models not initialized."
-        engineered_features_list = [feature_engineer_new_record(record) for record in new_raw_data]
-        engineered_df = pd.DataFrame(engineered_features_list, columns=self.feature_names)
-        X_new_scaled = self.scaler.transform(engineered_df)
-        segment_ids = self.gmm.predict(X_new_scaled)
-        probabilities = self.gmm.predict_proba(X_new_scaled)
-        confidence_scores = np.max(probabilities, axis=1)
+        if include_products and self.product_index is None:
+            raise Exception("Product recommendations not available")
+        with stage_timer('categorizer', 'feature_engineering'):
+            features = feature_matrix_from_columns(extract_customer_columns(new_raw_data))
+        # The scaler is folded into the engine, so scaling is part of this stage
+        with stage_timer('categorizer', 'model_inference'):
+            scores = self.engine.score(features,
+                                       return_posteriors=include_posteriors or include_products,
+                                       return_log_likelihood=include_posteriors)
+        products = None
+        if include_products:
+            with stage_timer('categorizer', 'product_ranking'):
+                products = self.product_index.recommend(scores['posteriors'], top_segments, max_products)
+        with stage_timer('categorizer', 'result_formatting'):
+            return self._format_results(new_raw_data, scores, include_posteriors, products)
+
+    def _format_results(self, new_raw_data, scores, include_posteriors, products):
+        segment_ids = scores['segment_ids']
+        confidence_scores = scores['confidence']
         results = []
         for i, segment_id in enumerate(segment_ids):
-            results.append({
+            result = {
                 'Customer_ID': new_raw_data[i].get('Customer_ID', 'N/A'),
                 'Segment_ID': int(segment_id),
                 'Confidence': float(f"{confidence_scores[i]:.8f}"),
                 'Archetype': ARCHETYPE_MAP.get(int(segment_id), "Unidentified Archetype")
-            })
+            }
+            if include_posteriors:
+                result['Posteriors'] = [float(f"{p:.8f}") for p in scores['posteriors'][i]]
+                result['Log_Likelihood'] = float(scores['log_likelihood'][i])
+            if products is not None:
+                result['Products'] = products[i]
+            results.append(result)
         return results
+
+    def _categorize_chunk(self, entries):
+        """
+        Score one chunk of (line_number, record, error) entries, in order.
+        A chunk that fails as a whole is retried record by record so one
+        malformed profile only fails its own line.
+        """
+        records = [record for _, record, error in entries if error is None]
+        try:
+            results = iter(self.preprocess_and_categorize(records)) if records else iter(())
+        except Exception:
+            results = None
+
+        for line_number, record, error in entries:
+            if error is None:
+                if results is not None:
+                    yield next(results)
+                    continue
+                try:
+                    yield self.preprocess_and_categorize([record])[0]
+                    continue
+                except Exception as e:
+                    error = f"Categorization failed: {e}"
+            yield {
+                'Customer_ID': record.get('Customer_ID', 'N/A') if isinstance(record, dict) else 'N/A',
+                'line': line_number,
+                'error': error
+            }
+
+    def categorize_stream(self, lines: Iterable, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Categorize newline-delimited customer JSON in fixed-size chunks.
+
+        Yields one result per non-blank input line, in input order, as soon as
+        its chunk is scored, so memory is bounded by chunk_size rather than
+        by the size of the input. Invalid lines yield an error entry instead
+        of aborting the stream.
+        """
+        entries = []
+        for line_number, line in enumerate(lines, start=1):
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    entries.append((line_number, None, "Invalid customer data format"))
+                else:
+                    entries.append((line_number, record, None))
+            except ValueError as e:
+                entries.append((line_number, None, f"Invalid JSON: {e}"))
+
+            if len(entries) >= chunk_size:
+                yield from self._categorize_chunk(entries)
+                entries = []
+
+        if entries:
+            yield from self._categorize_chunk(entries)
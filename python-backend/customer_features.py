@@ -0,0 +1,252 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+import numpy as np
+from typing import Dict, Any, List
+
+# --- Columnar Customer Features ---
+# Batch feature engineering matching the per-record paths exactly (sums accumulate in list order)
+
+BASE_NUMERIC_FEATURES = [
+    'Age', 'Net_Worth', 'Net_Cashflow', 'Active_Income_Annual',
+    'Mortgage_Ratio', 'Asset_Return_Weighted', 'Child_Count'
+]
+
+
+def _owner_index(nested_lists: List[list], n: int) -> np.ndarray:
+    """Record index for every element of the flattened nested lists"""
+    counts = np.fromiter(map(len, nested_lists), dtype=np.intp, count=n)
+    return np.repeat(np.arange(n, dtype=np.intp), counts)
+
+
+def _first_match(owner: np.ndarray, mask: np.ndarray, values: np.ndarray, n: int) -> np.ndarray:
+    """Per record, the value of the first matching element (0 if none), like next(..., 0)"""
+    result = np.zeros(n, dtype=np.float64)
+    matched_owner = owner[mask]
+    owners, first = np.unique(matched_owner, return_index=True)
+    result[owners] = values[mask][first]
+    return result
+
+
+def _ordered_sum(owner: np.ndarray, values: np.ndarray, n: int) -> np.ndarray:
+    """Per-record sum, accumulated in list order"""
+    return np.bincount(owner, weights=values, minlength=n)
+
+
+def flatten_customer_records(records: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Derive the shared base features for a batch of raw customer profiles
+
+    Returns:
+        dict: Float64 arrays for BASE_NUMERIC_FEATURES plus object arrays
+        'Marital_Status' and 'Gender', each of length len(records)
+    """
+    n = len(records)
+    personal = [r['Personal Details'] for r in records]
+    financial = [r.get('Financial Details', {}) for r in records]
+    derived = [r['Financial Details']['Derived'] for r in records]
+
+    # Income: first Active entry, annualised
+    incomes = [f.get('Income', []) for f in financial]
+    flat_incomes = [i for income_list in incomes for i in income_list]
+    income_owner = _owner_index(incomes, n)
+    income_active = np.array([i.get('Income_Type') == 'Active' for i in flat_incomes], dtype=bool)
+    income_amount = np.array([i.get('Amount', 0) for i in flat_incomes], dtype=np.float64)
+    active_income = _first_match(income_owner, income_active, income_amount, n) * 12
+
+    # Assets: first Residential Property, total value and value-weighted return
+    assets = [f.get('Assets', []) for f in financial]
+    flat_assets = [a for asset_list in assets for a in asset_list]
+    asset_owner = _owner_index(assets, n)
+    asset_value = np.array([a.get('Current Value', 0) for a in flat_assets], dtype=np.float64)
+    asset_roi = np.array([float(a.get('Return on Investment', 0) or 0) for a in flat_assets], dtype=np.float64)
+    asset_is_property = np.array([a.get('Asset Type') == 'Residential Property' for a in flat_assets], dtype=bool)
+    property_value = _first_match(asset_owner, asset_is_property, asset_value, n)
+    total_assets_val = _ordered_sum(asset_owner, asset_value, n)
+    weighted_sum = _ordered_sum(asset_owner, asset_value * asset_roi, n)
+
+    # Liabilities: first Mortgage
+    liabilities = [f.get('Liabilities', []) for f in financial]
+    flat_liabilities = [l for liability_list in liabilities for l in liability_list]
+    liability_owner = _owner_index(liabilities, n)
+    liability_value = np.array([l.get('Current Value', 0) for l in flat_liabilities], dtype=np.float64)
+    liability_is_mortgage = np.array([l.get('Liability Type') == 'Mortgage' for l in flat_liabilities], dtype=bool)
+    mortgage_value = _first_match(liability_owner, liability_is_mortgage, liability_value, n)
+
+    # Dependents: number of children
+    dependents = [r.get('Dependents', []) for r in records]
+    flat_dependents = [d for dependent_list in dependents for d in dependent_list]
+    dependent_owner = _owner_index(dependents, n)
+    dependent_is_child = np.array([d.get('Relationship') == 'Child' for d in flat_dependents], dtype=bool)
+    child_count = np.bincount(dependent_owner[dependent_is_child], minlength=n).astype(np.float64)
+
+    has_property = property_value > 0
+    has_assets = total_assets_val > 0
+    mortgage_ratio = np.divide(mortgage_value, property_value,
+                               out=np.zeros(n, dtype=np.float64), where=has_property)
+    weighted_return = np.divide(weighted_sum, total_assets_val,
+                                out=np.zeros(n, dtype=np.float64), where=has_assets)
+
+    return {
+        'Age': np.array([p['Age'] for p in personal], dtype=np.float64),
+        'Net_Worth': np.array([d['Total_Networth'] for d in derived], dtype=np.float64),
+        'Net_Cashflow': np.array([d['Net_Cashflow'] for d in derived], dtype=np.float64),
+        'Active_Income_Annual': active_income,
+        'Mortgage_Ratio': mortgage_ratio,
+        'Asset_Return_Weighted': weighted_return,
+        'Child_Count': child_count,
+        'Marital_Status': np.array([p['Marital Status'] for p in personal], dtype=object),
+        'Gender': np.array([p['Gender'] for p in personal], dtype=object),
+    }
+
+
+# --- Per-Profile Feature Records ---
+# The advisor dashboard asks for segmentation and expense predictions for the
+# same profile, and the voice agent re-sends unchanged profiles. A profile is
+# parsed once into a compact CustomerFeatures record, cached by Customer_ID
+# plus a hash of the fields the models read, and shared by both models.
+
+# Batches up to this size go through the per-profile cache; larger ones use
+# the columnar path, where hashing every record would cost more than it saves
+CACHED_BATCH_LIMIT = 32
+FEATURE_CACHE_SIZE = 4096
+
+
+def consumed_fields(raw_row: Dict[str, Any]) -> Dict[str, Any]:
+    """The subset of a profile that feature engineering reads"""
+    personal = raw_row.get('Personal Details', {})
+    financial = raw_row.get('Financial Details', {})
+    derived = financial.get('Derived', {})
+    return {
+        'Personal Details': {key: personal.get(key) for key in ('Age', 'Gender', 'Marital Status')},
+        'Dependents': [d.get('Relationship') for d in raw_row.get('Dependents', [])],
+        'Assets': [[a.get('Asset Type'), a.get('Current Value', 0), a.get('Return on Investment', 0)]
+                   for a in financial.get('Assets', [])],
+        'Liabilities': [[l.get('Liability Type'), l.get('Current Value', 0)]
+                        for l in financial.get('Liabilities', [])],
+        'Income': [[i.get('Income_Type'), i.get('Amount', 0)] for i in financial.get('Income', [])],
+        'Derived': {key: derived.get(key) for key in ('Total_Networth', 'Net_Cashflow')},
+    }
+
+
+def profile_fingerprint(raw_row: Dict[str, Any]) -> str:
+    """Content hash of the model-relevant fields of a profile"""
+    payload = json.dumps(consumed_fields(raw_row), sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class CustomerFeatures:
+    """Typed base features of one customer profile, shared by all models"""
+
+    __slots__ = ('customer_id', 'age', 'net_worth', 'net_cashflow', 'active_income_annual',
+                 'mortgage_ratio', 'asset_return_weighted', 'child_count', 'marital_status', 'gender')
+
+    def __init__(self, customer_id, age, net_worth, net_cashflow, active_income_annual,
+                 mortgage_ratio, asset_return_weighted, child_count, marital_status, gender):
+        self.customer_id = customer_id
+        self.age = age
+        self.net_worth = net_worth
+        self.net_cashflow = net_cashflow
+        self.active_income_annual = active_income_annual
+        self.mortgage_ratio = mortgage_ratio
+        self.asset_return_weighted = asset_return_weighted
+        self.child_count = child_count
+        self.marital_status = marital_status
+        self.gender = gender
+
+    @classmethod
+    def from_profile(cls, raw_row: Dict[str, Any]) -> 'CustomerFeatures':
+        """Parse a profile in one pass per nested list (same rules as the per-record paths)"""
+        personal = raw_row['Personal Details']
+        financial = raw_row.get('Financial Details', {})
+        derived = raw_row['Financial Details']['Derived']
+
+        active_income = next((i.get('Amount', 0) * 12 for i in financial.get('Income', [])
+                              if i.get('Income_Type') == 'Active'), 0)
+
+        property_value = None
+        total_assets_val = 0
+        weighted_sum = 0
+        for a in financial.get('Assets', []):
+            value = a.get('Current Value', 0)
+            if property_value is None and a.get('Asset Type') == 'Residential Property':
+                property_value = value
+            total_assets_val += value
+            weighted_sum += value * float(a.get('Return on Investment', 0) or 0)
+        property_value = property_value or 0
+
+        mortgage_value = next((l.get('Current Value', 0) for l in financial.get('Liabilities', [])
+                               if l.get('Liability Type') == 'Mortgage'), 0)
+        child_count = sum(1 for d in raw_row.get('Dependents', []) if d.get('Relationship') == 'Child')
+
+        return cls(
+            customer_id=raw_row.get('Customer_ID', 'N/A'),
+            age=float(personal['Age']),
+            net_worth=float(derived['Total_Networth']),
+            net_cashflow=float(derived['Net_Cashflow']),
+            active_income_annual=float(active_income),
+            mortgage_ratio=float(mortgage_value / property_value) if property_value > 0 else 0.0,
+            asset_return_weighted=float(weighted_sum / total_assets_val) if total_assets_val > 0 else 0.0,
+            child_count=float(child_count),
+            marital_status=personal['Marital Status'],
+            gender=personal['Gender'],
+        )
+
+
+class CustomerFeatureCache:
+    """Thread-safe LRU of CustomerFeatures keyed by (Customer_ID, profile hash)"""
+
+    def __init__(self, maxsize: int = FEATURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, raw_row: Dict[str, Any]) -> CustomerFeatures:
+        key = (str(raw_row.get('Customer_ID')), profile_fingerprint(raw_row))
+        with self._lock:
+            features = self._entries.get(key)
+            if features is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return features
+            self.misses += 1
+
+        features = CustomerFeatures.from_profile(raw_row)
+        with self._lock:
+            self._entries[key] = features
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return features
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+feature_cache = CustomerFeatureCache()
+
+
+def features_to_columns(features_list: List[CustomerFeatures]) -> Dict[str, np.ndarray]:
+    """Stack CustomerFeatures records into the flatten_customer_records layout"""
+    return {
+        'Age': np.array([f.age for f in features_list], dtype=np.float64),
+        'Net_Worth': np.array([f.net_worth for f in features_list], dtype=np.float64),
+        'Net_Cashflow': np.array([f.net_cashflow for f in features_list], dtype=np.float64),
+        'Active_Income_Annual': np.array([f.active_income_annual for f in features_list], dtype=np.float64),
+        'Mortgage_Ratio': np.array([f.mortgage_ratio for f in features_list], dtype=np.float64),
+        'Asset_Return_Weighted': np.array([f.asset_return_weighted for f in features_list], dtype=np.float64),
+        'Child_Count': np.array([f.child_count for f in features_list], dtype=np.float64),
+        'Marital_Status': np.array([f.marital_status for f in features_list], dtype=object),
+        'Gender': np.array([f.gender for f in features_list], dtype=object),
+    }
+
+
+def extract_customer_columns(records: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Base feature columns: small batches through the per-profile cache, large ones columnar"""
+    if len(records) <= CACHED_BATCH_LIMIT:
+        return features_to_columns([feature_cache.get(record) for record in records])
+    return flatten_customer_records(records)
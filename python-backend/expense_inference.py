@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+NumPy inference engine for the life-stage expense MLP.
+
+The StandardScaler is folded into the first layer: for x_scaled = (x - m) / s,
+    x_scaled @ W1 + b1 = x @ (W1 / s[:, None]) + (b1 - (m / s) @ W1)
+so raw features go straight into a plain matmul/ReLU stack, skipping pandas,
+scaler.transform and sklearn's input validation.
+
+The trained MLP also has hundreds of subnormal (< 1e-308) weights left by
+dead units; subnormal arithmetic makes the float64 matmul ~25x slower, so
+they are flushed to zero. Their contribution is below float64 resolution.
+
+Run this module to export the folded weights next to the joblib models:
+    python expense_inference.py [--check]
+"""
+
+import argparse
+import hashlib
+import os
+
+import numpy as np
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'life_stage')
+MLP_MODEL_PATH = os.path.join(MODEL_DIR, 'mlp_unified_expense_predictor.joblib')
+SCALER_PATH = os.path.join(MODEL_DIR, 'scaler_expense.joblib')
+FOLDED_MODEL_PATH = os.path.join(MODEL_DIR, 'mlp_expense_folded.npz')
+
+_ACTIVATIONS = {
+    'relu': lambda x: np.maximum(x, 0, out=x),
+    'tanh': lambda x: np.tanh(x, out=x),
+    'logistic': lambda x: np.divide(1, 1 + np.exp(-x, out=x), out=x),
+    'identity': lambda x: x,
+}
+
+
+def _flush_subnormals(array, dtype=np.float64):
+    array = np.array(array, dtype=dtype)
+    array[np.abs(array) < np.finfo(dtype).tiny] = 0
+    return array
+
+
+def source_fingerprint(paths=(MLP_MODEL_PATH, SCALER_PATH)):
+    """Hash of the joblib files an exported engine was folded from"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class FoldedMLP:
+    """
+    Scaler-folded MLPRegressor forward pass in NumPy
+
+    predict() accepts raw (n, 11) features in TRAINING_FEATURE_ORDER as
+    float32 or float64; weights are cast once per dtype and cached.
+    """
+
+    def __init__(self, coefs, intercepts, activation='relu', out_activation='identity', fingerprint=None):
+        self.coefs = [_flush_subnormals(w) for w in coefs]
+        self.intercepts = [_flush_subnormals(b) for b in intercepts]
+        self.activation = activation
+        self.out_activation = out_activation
+        self.fingerprint = fingerprint
+        self._by_dtype = {np.dtype(np.float64): (self.coefs, self.intercepts)}
+
+    @classmethod
+    def from_sklearn(cls, model, scaler, fingerprint=None):
+        coefs = [np.array(w, dtype=np.float64) for w in model.coefs_]
+        intercepts = [np.array(b, dtype=np.float64) for b in model.intercepts_]
+
+        scale = scaler.scale_ if getattr(scaler, 'scale_', None) is not None else np.ones(len(coefs[0]))
+        mean = scaler.mean_ if getattr(scaler, 'mean_', None) is not None else np.zeros(len(coefs[0]))
+        intercepts[0] = intercepts[0] - (mean / scale) @ coefs[0]
+        coefs[0] = coefs[0] / scale[:, np.newaxis]
+
+        return cls(coefs, intercepts, model.activation, model.out_activation_, fingerprint)
+
+    def save(self, path):
+        arrays = {f'coef_{i}': w for i, w in enumerate(self.coefs)}
+        arrays.update({f'intercept_{i}': b for i, b in enumerate(self.intercepts)})
+        np.savez(path, n_layers=len(self.coefs), activation=self.activation,
+                 out_activation=self.out_activation, fingerprint=self.fingerprint or '', **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            n_layers = int(data['n_layers'])
+            return cls([data[f'coef_{i}'] for i in range(n_layers)],
+                       [data[f'intercept_{i}'] for i in range(n_layers)],
+                       str(data['activation']), str(data['out_activation']),
+                       str(data['fingerprint']) or None)
+
+    def _weights(self, dtype):
+        dtype = np.dtype(dtype)
+        if dtype not in self._by_dtype:
+            self._by_dtype[dtype] = ([_flush_subnormals(w, dtype) for w in self.coefs],
+                                     [_flush_subnormals(b, dtype) for b in self.intercepts])
+        return self._by_dtype[dtype]
+
+    def predict(self, X):
+        """
+        Forward pass on raw features
+
+        Args:
+            X (np.ndarray): (n, n_features) float32/float64 array; computation
+                runs in X's dtype (other dtypes are promoted to float64)
+
+        Returns:
+            np.ndarray: (n,) predictions
+        """
+        if X.dtype not in (np.float32, np.float64):
+            X = X.astype(np.float64)
+        coefs, intercepts = self._weights(X.dtype)
+
+        hidden_activation = _ACTIVATIONS[self.activation]
+        activation = X
+        for layer in range(len(coefs) - 1):
+            activation = hidden_activation(activation @ coefs[layer] + intercepts[layer])
+        output = _ACTIVATIONS[self.out_activation](activation @ coefs[-1] + intercepts[-1])
+        return output[:, 0] if output.shape[1] == 1 else output
+
+
+def load_engine(model, scaler):
+    """
+    Use the exported engine if it was folded from the current joblib files,
+    otherwise fold the loaded sklearn models in memory
+    """
+    try:
+        fingerprint = source_fingerprint()
+        if os.path.exists(FOLDED_MODEL_PATH):
+            engine = FoldedMLP.load(FOLDED_MODEL_PATH)
+            if engine.fingerprint == fingerprint:
+                return engine
+    except OSError:
+        fingerprint = None
+    return FoldedMLP.from_sklearn(model, scaler, fingerprint)
+
+
+def main():
+    import joblib
+
+    parser = argparse.ArgumentParser(description="Export the scaler-folded expense MLP")
+    parser.add_argument('--output', default=FOLDED_MODEL_PATH)
+    parser.add_argument('--check', action='store_true', help="Compare against sklearn on random inputs")
+    args = parser.parse_args()
+
+    model = joblib.load(MLP_MODEL_PATH)
+    scaler = joblib.load(SCALER_PATH)
+    engine = FoldedMLP.from_sklearn(model, scaler, source_fingerprint())
+    engine.save(args.output)
+    print(f"Folded expense MLP written to {args.output}")
+
+    if args.check:
+        rng = np.random.default_rng(0)
+        X = scaler.mean_ + rng.standard_normal((10_000, len(scaler.mean_))) * scaler.scale_
+        reference = model.predict(scaler.transform(X))
+        for dtype in (np.float64, np.float32):
+            diff = np.max(np.abs(engine.predict(X.astype(dtype)) - reference) / np.maximum(np.abs(reference), 1))
+            print(f"  {np.dtype(dtype).name}: max relative difference vs sklearn {diff:.2e}")
+
+
+if __name__ == '__main__':
+    main()
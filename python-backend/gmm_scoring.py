@@ -0,0 +1,95 @@
+import numpy as np
+
+# --- Single-Pass GMM Scoring ---
+# One log-likelihood pass per batch, with the StandardScaler folded into the component parameters
+
+
+class GMMScoringEngine:
+    """
+    Scoring engine for a fitted full-covariance GaussianMixture
+
+    ||Xs @ P_k - mu_k @ P_k||^2 with Xs = (X - m) / s becomes X @ (P_k / s[:, None]) - (m / s + mu_k) @ P_k
+    """
+
+    def __init__(self, gmm, scaler=None, block_size=65536):
+        if gmm.covariance_type != 'full':
+            raise ValueError(f"Unsupported covariance_type '{gmm.covariance_type}'; expected 'full'")
+
+        precisions_chol = np.asarray(gmm.precisions_cholesky_, dtype=np.float64)  # (K, d, d)
+        means = np.asarray(gmm.means_, dtype=np.float64)                          # (K, d)
+        n_components, n_features = means.shape
+
+        # Scaler as x_scaled = x * scale_inv - offset
+        scale_inv = np.ones(n_features)
+        offset = np.zeros(n_features)
+        if scaler is not None:
+            if getattr(scaler, 'scale_', None) is not None:
+                scale_inv = 1.0 / scaler.scale_
+            if getattr(scaler, 'mean_', None) is not None:
+                offset = scaler.mean_ * scale_inv
+
+        # (d, K*d) projection and (K*d,) shift covering all components
+        self.projection = np.concatenate(
+            [precisions_chol[k] * scale_inv[:, np.newaxis] for k in range(n_components)], axis=1)
+        self.shift = np.concatenate(
+            [(offset + means[k]) @ precisions_chol[k] for k in range(n_components)])
+
+        # Per-component constant: log weight + log det(P_k) - d/2 log(2 pi)
+        log_det = np.sum(np.log(np.diagonal(precisions_chol, axis1=1, axis2=2)), axis=1)
+        self.log_constant = (np.log(gmm.weights_) + log_det
+                             - 0.5 * n_features * np.log(2 * np.pi))
+
+        self.n_components = n_components
+        self.n_features = n_features
+        self.block_size = block_size
+
+    def _weighted_log_prob(self, X):
+        """log(weight_k) + log N(x | k) for every sample and component, (n, K)"""
+        projected = X @ self.projection - self.shift
+        squared = np.einsum('nkd,nkd->nk',
+                            projected.reshape(len(X), self.n_components, self.n_features),
+                            projected.reshape(len(X), self.n_components, self.n_features))
+        return self.log_constant - 0.5 * squared
+
+    def score(self, X, return_posteriors=False, return_log_likelihood=False):
+        """
+        Score raw (unscaled) feature rows in a single likelihood pass
+
+        Args:
+            X (np.ndarray): (n, d) raw features in the scaler's column order
+            return_posteriors (bool): Include the full (n, K) posterior matrix
+            return_log_likelihood (bool): Include per-sample log-likelihood,
+                as gmm.score_samples reports it on scaled features
+
+        Returns:
+            dict: 'segment_ids' (n,) int, 'confidence' (n,) float and the
+            optional 'posteriors' / 'log_likelihood' arrays
+        """
+        X = np.asarray(X, dtype=np.float64)
+        n = len(X)
+        segment_ids = np.empty(n, dtype=np.int64)
+        confidence = np.empty(n, dtype=np.float64)
+        posteriors = np.empty((n, self.n_components)) if return_posteriors else None
+        log_likelihood = np.empty(n) if return_log_likelihood else None
+
+        # Blocks bound the (n, K*d) intermediate for very large batches
+        for start in range(0, n, self.block_size):
+            stop = min(start + self.block_size, n)
+            weighted = self._weighted_log_prob(X[start:stop])
+            best = np.argmax(weighted, axis=1)
+            best_log_prob = weighted[np.arange(stop - start), best]
+            log_norm = best_log_prob + np.log(np.sum(np.exp(weighted - best_log_prob[:, np.newaxis]), axis=1))
+
+            segment_ids[start:stop] = best
+            confidence[start:stop] = np.exp(best_log_prob - log_norm)
+            if return_posteriors:
+                posteriors[start:stop] = np.exp(weighted - log_norm[:, np.newaxis])
+            if return_log_likelihood:
+                log_likelihood[start:stop] = log_norm
+
+        result = {'segment_ids': segment_ids, 'confidence': confidence}
+        if return_posteriors:
+            result['posteriors'] = posteriors
+        if return_log_likelihood:
+            result['log_likelihood'] = log_likelihood
+        return result
@@ -0,0 +1,82 @@
+"""
+Gunicorn configuration for the WealthWise Python backend.
+
+    pip install gunicorn
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+The app is preloaded in the master (preload_app), so the GMM, MLP and LSTM
+weights and the warmed forecast cache are loaded once and shared
+copy-on-write by every forked worker. Settings come from the environment:
+
+    PORT               listen port (default 9000)
+    WEB_CONCURRENCY    worker processes (default: number of CPUs)
+    GUNICORN_THREADS   threads per worker (default 4)
+    GUNICORN_TIMEOUT   worker timeout in seconds (default 120)
+    GUNICORN_MAX_REQUESTS  recycle workers after N requests (default 0 = off)
+    METRICS_MULTIPROC_DIR  where workers share /metrics histograms
+                       (default: a fresh temporary directory per master)
+    MODEL_LOADING      eager (default: load every model in parallel in the
+                       master before forking) or lazy (each worker loads a
+                       model on first use; nothing is shared)
+
+Graceful reload:
+    kill -HUP <master>    restart workers gracefully from the preloaded app
+                          (picks up config changes; in-flight requests finish)
+    kill -USR2 <master>   start a new master with fresh code and models, then
+    kill -TERM <old>      stop the old one once the new one is serving
+"""
+
+import gc
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+chdir = os.path.dirname(os.path.abspath(__file__))
+bind = f"0.0.0.0:{os.environ.get('PORT', '9000')}"
+
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+worker_class = 'gthread'
+
+preload_app = True
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '0'))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
+
+# Set before the app is preloaded, so every worker's metrics registry merges
+# the others' histograms when /metrics is scraped
+_metrics_tmpdir = None
+if not os.environ.get('METRICS_MULTIPROC_DIR'):
+    _metrics_tmpdir = tempfile.mkdtemp(prefix='wealthwise-metrics-')
+    os.environ['METRICS_MULTIPROC_DIR'] = _metrics_tmpdir
+
+
+def on_exit(server):
+    if _metrics_tmpdir:
+        shutil.rmtree(_metrics_tmpdir, ignore_errors=True)
+
+
+def pre_fork(server, worker):
+    # Move everything allocated while preloading out of the GC's tracked
+    # generations, so collections in workers don't touch (and copy) those pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Process pools cannot be inherited across fork; give each worker its own
+    from app import model_registry
+    parallel_scorer = model_registry.loaded('parallel_scorer')
+    if parallel_scorer is not None:
+        parallel_scorer.reset_after_fork()
+
+
+def child_exit(server, worker):
+    # A replaced worker's histograms would otherwise be counted forever
+    from metrics import metrics
+    metrics.remove_process(worker.pid)
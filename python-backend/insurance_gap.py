@@ -0,0 +1,303 @@
+import numpy as np
+from typing import Dict, Any, List, Optional
+
+from cashflow_projection import customer_inputs
+
+# --- Vectorized Death-Scenario Simulator ---
+# Port of bank_balance_calculator.js and calculateCoverageNeeds (server.js) over customers x scenarios x death ages.
+# Only deficits touch the balance, so balance[y] = g^(y+1) * (balance0 + cumsum(deficit / g^k)[y]), g = 1 + bank growth
+
+# Simulator inputs and their defaults (the constants of bank_balance_calculator.js)
+SIMULATOR_DEFAULTS = {
+    'current_age': 34,
+    'monthly_active_income': 7000.0,
+    'monthly_passive_income': 900.0,
+    'monthly_expense': 4500.0,
+    'initial_balance': 85000.0,
+    'monthly_savings': 0.0,
+    'dependents': 0,
+    'monthly_mortgage': 0.0,
+}
+
+# Scenario settings (annual rates as decimals) and their defaults
+SCENARIO_RATE_DEFAULTS = {
+    'active_income_growth': 0.05,
+    'passive_income_growth': 0.02,
+    'expense_inflation': 0.017,
+    'bank_growth_rate': 0.06,
+    'retirement_age': 65,
+}
+
+# calculateCoverageNeeds scenario buffers (server.js)
+COVERAGE_SCENARIOS = ['baseline', 'job_loss', 'medical', 'new_dependent', 'recession']
+EDUCATION_FUND_PER_CHILD = 150000
+MIN_COVERAGE = 200000
+COVERAGE_ROUNDING = 50000
+
+# Years after death simulated (and covered by the insurance gap), as the JS script prints
+DEFAULT_YEARS_AFTER_DEATH = 5
+
+# Per-request limits for /api/insurance-gap
+MAX_SIMULATED_CUSTOMERS = 1000
+MAX_DEATH_AGES = 50
+MAX_RATE_SCENARIOS = 20
+
+# Bounds each (customers x scenarios x death ages x years) intermediate to ~32 MB
+MAX_CHUNK_ELEMENTS = 4_000_000
+
+
+def _round_half_up(values):
+    """Math.round semantics (np.round rounds halves to even)"""
+    return np.floor(np.asarray(values, dtype=np.float64) + 0.5)
+
+
+def simulator_inputs(items: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """(C,) float64 arrays from explicit input dicts (missing keys use SIMULATOR_DEFAULTS)"""
+    rows = [dict(SIMULATOR_DEFAULTS, **{k: v for k, v in item.items() if k in SIMULATOR_DEFAULTS})
+            for item in items]
+    return {key: np.array([float(row[key]) for row in rows]) for key in SIMULATOR_DEFAULTS}
+
+
+def profile_simulator_inputs(records: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """(C,) simulator inputs from raw profiles (mortgages spread over calculateCoverageNeeds' 15 years)"""
+    inputs = customer_inputs(records)
+    dependents = np.zeros(len(records))
+    monthly_mortgage = np.zeros(len(records))
+    for i, record in enumerate(records):
+        dependents[i] = sum(1 for d in record.get('Dependents', []) if d.get('Relationship') == 'Child')
+        monthly_mortgage[i] = sum(l.get('Current Value', 0) or 0
+                                  for l in record.get('Financial Details', {}).get('Liabilities', [])
+                                  if l.get('Liability Type') == 'Mortgage') / (12 * 15)
+    return {
+        'current_age': inputs['age'],
+        'monthly_active_income': inputs['active_income'],
+        'monthly_passive_income': inputs['passive_income'],
+        'monthly_expense': inputs['monthly_expense'],
+        'initial_balance': inputs['cash'],
+        'monthly_savings': np.zeros(len(records)),
+        'dependents': dependents,
+        'monthly_mortgage': monthly_mortgage,
+    }
+
+
+def scenario_rates(scenarios: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """(S,) float64 arrays of scenario settings (missing keys use SCENARIO_RATE_DEFAULTS)"""
+    settings = [dict(SCENARIO_RATE_DEFAULTS, **{k: v for k, v in s.items() if k in SCENARIO_RATE_DEFAULTS})
+                for s in scenarios]
+    return {key: np.array([float(s[key]) for s in settings]) for key in SCENARIO_RATE_DEFAULTS}
+
+
+def horizon_years(customers: Dict[str, np.ndarray], death_ages, years_after_death: int = DEFAULT_YEARS_AFTER_DEATH) -> int:
+    """Projection years: from the youngest customer to years_after_death past the oldest death age"""
+    return max(int(np.ceil(np.max(death_ages) - customers['current_age'].min())) + years_after_death + 1, 1)
+
+
+def _simulate_chunk(c, s, death_ages, years, years_after_death, keep_balance):
+    y = np.arange(years, dtype=np.float64)                                       # (Y,)
+    age = c['current_age'][:, None, None, None] + y                              # (C, 1, 1, Y)
+    alive = age < death_ages[:, None]                                            # (C, 1, D, Y)
+    working = age < s['retirement_age'][:, None, None]                           # (C, S, 1, Y)
+
+    # Scenario growth paths, (S, 1, Y)
+    active_growth = ((1 + s['active_income_growth'][:, None]) ** y)[:, None, :]
+    passive_growth = ((1 + s['passive_income_growth'][:, None]) ** y)[:, None, :]
+    price_index = ((1 + s['expense_inflation'][:, None]) ** y)[:, None, :]
+    bank_growth = 1 + s['bank_growth_rate']                                      # (S,)
+    discount = (bank_growth[:, None] ** -y)[:, None, :]                          # g^-y, (S, 1, Y)
+
+    def per_customer(key):
+        return 12 * c[key][:, None, None, None]
+
+    # Only the active income and savings depend on the death age
+    while_alive = (per_customer('monthly_active_income') * working * active_growth
+                   + per_customer('monthly_savings'))                            # (C, S, 1, Y)
+    always = (per_customer('monthly_passive_income') * passive_growth
+              - per_customer('monthly_expense') * price_index)                   # (C, S, 1, Y)
+    # Balance in year-0 money (balance / g^y); balance[y] = present[y] * g^y.
+    # Built in place: this is the only (C, S, D, Y) array besides its suffix minimum
+    present = alive * while_alive                                                # (C, S, D, Y)
+    present += always
+    np.minimum(present, 0, out=present)                                          # deficits
+    present *= discount
+    np.cumsum(present, axis=-1, out=present)
+    present += c['initial_balance'][:, None, None, None]
+    present *= bank_growth[:, None, None]
+
+    # Death year index per customer and death age, as projections[deathAge - currentAge] in the JS
+    # A death age below the current age is invalid even when it ceils to year 0 (33.5 vs 34)
+    before_current = death_ages[None, :] < c['current_age'][:, None]                      # (C, D)
+    death_year = np.ceil(death_ages[None, :] - c['current_age'][:, None]).astype(int)   # (C, D)
+    valid = (~before_current & (death_year < years))[:, None, :]                        # (C, 1, D)
+    index = np.clip(death_year, 0, years - 1)[:, None, :, None]
+    growth_at_death = (bank_growth[None, :, None] ** index[..., 0])                      # g^k, (C, S, D)
+    present_at_death = np.take_along_axis(present, index, axis=-1)[..., 0]
+
+    # Lump sum at death year k: -min over k <= y <= k + years_after_death of
+    # balance[y] / g^(y - k), the minimum of those year-0 balances scaled by g^k
+    window = np.minimum(index + np.arange(years_after_death + 1), years - 1)
+    gap = -np.take_along_axis(present, window, axis=-1).min(axis=-1) * growth_at_death
+
+    negative = present < 0
+    result = {
+        'balance_at_death': np.where(valid, present_at_death * growth_at_death, np.nan),
+        'insurance_gap': np.where(valid, np.maximum(gap, 0), np.nan),
+        'depletion_year': np.where(negative.any(axis=-1), negative.argmax(axis=-1), -1),
+    }
+    if keep_balance:
+        result['balance'] = present / discount
+    return result
+
+
+def simulate(customers: Dict[str, np.ndarray], scenarios: Dict[str, np.ndarray], death_ages,
+             years_after_death: int = DEFAULT_YEARS_AFTER_DEATH, keep_balance: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Bank balance trajectories for every customer x scenario x death age
+
+    Args:
+        customers: (C,) arrays from simulator_inputs / profile_simulator_inputs
+        scenarios: (S,) arrays from scenario_rates
+        death_ages: (D,) death ages
+        years_after_death: Years simulated (and covered by the gap) past each death age
+        keep_balance: Return the full trajectories (set False for book-wide runs)
+
+    Returns:
+        dict: 'balance' (C, S, D, Y); 'balance_at_death', 'insurance_gap' and
+        'depletion_year' (C, S, D), NaN / -1 where not applicable
+    """
+    death_ages = np.asarray(death_ages, dtype=np.float64)
+    n_customers = len(customers['current_age'])
+    n_scenarios = len(scenarios['bank_growth_rate'])
+    years = horizon_years(customers, death_ages, years_after_death)
+
+    # Chunk over customers to bound the (C, S, D, Y) intermediates
+    chunk = max(1, MAX_CHUNK_ELEMENTS // max(n_scenarios * len(death_ages) * years, 1))
+    if chunk >= n_customers:
+        return _simulate_chunk(customers, scenarios, death_ages, years, years_after_death, keep_balance)
+
+    parts = [_simulate_chunk({key: values[i:i + chunk] for key, values in customers.items()},
+                             scenarios, death_ages, years, years_after_death, keep_balance)
+             for i in range(0, n_customers, chunk)]
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+def coverage_needs(customers: Dict[str, np.ndarray], scenarios: Optional[List[str]] = None,
+                   years: int = 20) -> Dict[str, np.ndarray]:
+    """
+    calculateCoverageNeeds (server.js) for every customer x coverage scenario
+
+    Returns:
+        dict: (C, S) arrays 'total_coverage' and each breakdown component
+    """
+    scenarios = scenarios or ['baseline']
+    monthly_income = (customers['monthly_active_income'] + customers['monthly_passive_income'])[:, None]
+    annual_expenses = 12 * customers['monthly_expense'][:, None]
+    education_fund = customers['dependents'][:, None] * EDUCATION_FUND_PER_CHILD
+
+    income_replacement = monthly_income * 12 * min(years, 25)
+    outstanding_mortgage = customers['monthly_mortgage'][:, None] * 12 * 15
+    emergency_buffer = annual_expenses * 2
+
+    buffers = {
+        'baseline': np.zeros_like(annual_expenses),
+        'job_loss': annual_expenses * 3,
+        'medical': np.full_like(annual_expenses, 200000),
+        'new_dependent': EDUCATION_FUND_PER_CHILD + annual_expenses * 5,
+        'recession': annual_expenses * 2,
+    }
+    scenario_buffer = np.concatenate([buffers.get(name, buffers['baseline']) for name in scenarios], axis=1)
+
+    total = (income_replacement + education_fund + outstanding_mortgage + emergency_buffer
+             - customers['initial_balance'][:, None] + scenario_buffer)
+    total = np.maximum(MIN_COVERAGE, _round_half_up(total / COVERAGE_ROUNDING) * COVERAGE_ROUNDING)
+
+    shape = total.shape
+    return {
+        'total_coverage': total,
+        'income_replacement': np.broadcast_to(_round_half_up(income_replacement), shape),
+        'education_fund': np.broadcast_to(_round_half_up(education_fund), shape),
+        'outstanding_mortgage': np.broadcast_to(_round_half_up(outstanding_mortgage), shape),
+        'emergency_buffer': np.broadcast_to(_round_half_up(emergency_buffer), shape),
+        'scenario_buffer': _round_half_up(scenario_buffer),
+        'current_savings': np.broadcast_to(_round_half_up(customers['initial_balance'][:, None]), shape),
+    }
+
+
+def _json_values(values, decimals=2):
+    """Rounded nested lists with NaN as None"""
+    values = np.round(values, decimals)
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+class InsuranceGapSimulator:
+    """Request-level death-age x scenario grids of balances, gaps and coverage needs"""
+
+    def simulate_customers(self, inputs=None, profiles=None, death_ages=None, scenarios=None,
+                           coverage_scenarios=None, coverage_years=20,
+                           years_after_death=DEFAULT_YEARS_AFTER_DEATH, include_trajectories=True):
+        """
+        Args:
+            inputs (list): Explicit simulator input dicts, see SIMULATOR_DEFAULTS
+            profiles (list): Raw customer profiles (used when inputs is None)
+            death_ages (list): Death ages to simulate
+            scenarios (list): Named rate settings dicts, see SCENARIO_RATE_DEFAULTS
+                (default: one "baseline" scenario)
+            coverage_scenarios (list): calculateCoverageNeeds scenarios to report
+            coverage_years (int): Years of coverage for calculateCoverageNeeds
+            years_after_death (int): Years simulated past the oldest death age
+            include_trajectories (bool): Include the yearly balance paths
+
+        Returns:
+            dict: JSON-ready response
+        """
+        try:
+            scenarios = scenarios or [{'name': 'baseline'}]
+            coverage_scenarios = coverage_scenarios or ['baseline']
+            if inputs is not None:
+                customers = simulator_inputs(inputs)
+                ids = [item.get('Customer_ID', f'customer_{i}') for i, item in enumerate(inputs)]
+            else:
+                customers = profile_simulator_inputs(profiles)
+                ids = [record.get('Customer_ID', 'N/A') for record in profiles]
+
+            result = simulate(customers, scenario_rates(scenarios), death_ages, years_after_death,
+                              keep_balance=include_trajectories)
+            coverage = coverage_needs(customers, coverage_scenarios, coverage_years)
+
+            results = []
+            for i, customer_id in enumerate(ids):
+                per_scenario = {}
+                for j, scenario in enumerate(scenarios):
+                    entry = {
+                        "balance_at_death": _json_values(result['balance_at_death'][i, j]),
+                        "insurance_gap": _json_values(result['insurance_gap'][i, j]),
+                        "depletion_age": [None if year < 0 or np.isnan(at_death)
+                                          else float(customers['current_age'][i] + year)
+                                          for year, at_death in zip(result['depletion_year'][i, j].tolist(),
+                                                                    result['balance_at_death'][i, j])],
+                    }
+                    if include_trajectories:
+                        entry["balance"] = _json_values(result['balance'][i, j])
+                    per_scenario[scenario.get('name', f'scenario_{j}')] = entry
+                results.append({
+                    "Customer_ID": customer_id,
+                    "current_age": float(customers['current_age'][i]),
+                    "scenarios": per_scenario,
+                    "coverage_needs": {
+                        name: {key: float(values[i, k]) for key, values in coverage.items()}
+                        for k, name in enumerate(coverage_scenarios)
+                    },
+                })
+
+            return {
+                "success": True,
+                "death_ages": [float(age) for age in death_ages],
+                "years": horizon_years(customers, death_ages, years_after_death),
+                "results": results
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "Insurance gap simulation failed",
+                "details": str(e)
+            }
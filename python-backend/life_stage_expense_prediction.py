@@ -3,6 +3,9 @@ import pandas as pd
 import numpy as np
 import os
 from typing import Dict, Any, List
+from customer_features import flatten_customer_records, extract_customer_columns
+from expense_inference import load_engine
+from metrics import stage_timer
 
 # --- Deployment Configuration ---
 MODEL_DIR = './models/life_stage/'
@@ -16,6 +19,9 @@ TRAINING_FEATURE_ORDER = [
     'Marital_Married', 'Marital_Divorced', 'Marital_Widowed', 'Marital_Single'
 ]
 
+# Life events the unified MLP was trained on
+EVENT_TYPES = ['Marriage', 'Child Birth']
+
 # --- Sample Data (Retained for Context) ---
 NEW_CUSTOMERS_DATA = [
     {
@@ -86,34 +92,68 @@ def feature_engineer_new_record(raw_row: Dict[str, Any], event_type: str) -> pd.
     return data_df[TRAINING_FEATURE_ORDER]
 
 
+def build_event_feature_matrix(raw_rows: List[Dict[str, Any]], event_types: List[str]) -> np.ndarray:
+    """
+    Batch equivalent of feature_engineer_new_record for N customers x M events.
+
+    Returns an (N*M, 11) float64 matrix in TRAINING_FEATURE_ORDER, customer-major
+    (row i*M + j is customer i with event j), already cleaned of inf/NaN.
+    """
+    return event_matrix_from_columns(flatten_customer_records(raw_rows), event_types)
+
+
+def event_matrix_from_columns(columns: Dict[str, np.ndarray], event_types: List[str]) -> np.ndarray:
+    """Expense feature matrix from shared base feature columns"""
+    n_customers, n_events = len(columns['Age']), len(event_types)
+    events = np.asarray(event_types, dtype=object)
+    marriage_flag = (events == 'Marriage').astype(np.float64)
+    childbirth_flag = (events == 'Child Birth').astype(np.float64)
+    marital = columns['Marital_Status']
+
+    # Customer-level columns broadcast across the event axis
+    matrix = np.empty((n_customers, n_events, len(TRAINING_FEATURE_ORDER)), dtype=np.float64)
+    matrix[:, :, 0] = columns['Age'][:, np.newaxis]
+    matrix[:, :, 1] = columns['Active_Income_Annual'][:, np.newaxis]
+    matrix[:, :, 2] = columns['Net_Worth'][:, np.newaxis]
+    matrix[:, :, 3] = columns['Mortgage_Ratio'][:, np.newaxis]
+    matrix[:, :, 4] = columns['Child_Count'][:, np.newaxis] + childbirth_flag  # a birth adds a child
+    matrix[:, :, 5] = marriage_flag
+    matrix[:, :, 6] = childbirth_flag
+    matrix[:, :, 7] = (marital == 'Married')[:, np.newaxis]
+    matrix[:, :, 8] = (marital == 'Divorced')[:, np.newaxis]
+    matrix[:, :, 9] = (marital == 'Widowed')[:, np.newaxis]
+    matrix[:, :, 10] = (marital == 'Single')[:, np.newaxis]
+
+    matrix = matrix.reshape(n_customers * n_events, len(TRAINING_FEATURE_ORDER))
+    return np.nan_to_num(matrix, nan=0.0, posinf=0.0, neginf=0.0, copy=False)
+
+
 class ExpensePredictor:
     def __init__(self):
         try:
             self.model = joblib.load(MLP_MODEL_PATH)
             self.scaler = joblib.load(SCALER_PATH)
             self.feature_names = TRAINING_FEATURE_ORDER
+            # NumPy forward pass with the scaler folded into the first layer
+            self.engine = load_engine(self.model, self.scaler)
             print("MLP and Scaler models loaded successfully.")
         except FileNotFoundError as e:
             print(f"Error loading models: {e}. Please ensure models are saved to {MODEL_DIR}.")
             self.model = None
             self.scaler = None
+            self.engine = None
 
     def predict_event_expense(self, raw_customer_data: Dict[str, Any], event_type: str):
         if not self.model:
             return "Models not initialized."
         
-        # 1. Feature Engineering: Returns a DataFrame with guaranteed column names
-        engineered_df = feature_engineer_new_record(raw_customer_data, event_type)
-        
-        # 2. Robust Cleaning (Needed before scaling)
-        engineered_df = engineered_df.replace([np.inf, -np.inf], 0) 
-        engineered_df = engineered_df.fillna(0) 
-
-        # 3. Scaling (Apply learned transformation)
-        X_new_scaled = self.scaler.transform(engineered_df)
+        # 1-2. Feature Engineering and Cleaning, from the shared (cached) profile features
+        with stage_timer('expense_predictor', 'feature_engineering'):
+            features = event_matrix_from_columns(extract_customer_columns([raw_customer_data]), [event_type])
 
-        # 4. Prediction
-        prediction = self.model.predict(X_new_scaled)[0]
+        # 3-4. Scaling and Prediction (scaler is folded into the engine's first layer)
+        with stage_timer('expense_predictor', 'model_inference'):
+            prediction = self.engine.predict(features)[0]
         
         # 5. Result
         estimated_bump = max(0, prediction)
@@ -124,6 +164,42 @@ class ExpensePredictor:
             'Customer_ID': raw_customer_data.get('Customer_ID', 'N/A')
         }
 
+    def predict_batch(self, raw_customers: List[Dict[str, Any]], event_types: List[str] = EVENT_TYPES) -> np.ndarray:
+        """
+        Predicted expense bumps for every customer x event pair
+
+        Builds one (N*M, 11) feature matrix and runs a single forward pass of
+        the scaler-folded NumPy engine over it.
+
+        Returns:
+            np.ndarray: (N, M) bumps in SGD, clipped at 0
+        """
+        with stage_timer('expense_predictor', 'feature_engineering'):
+            features = event_matrix_from_columns(extract_customer_columns(raw_customers), event_types)
+        with stage_timer('expense_predictor', 'model_inference'):
+            predictions = self.engine.predict(features)
+        return np.maximum(predictions, 0).reshape(len(raw_customers), len(event_types))
+
+    def predict_event_expenses(self, raw_customers: List[Dict[str, Any]], event_types: List[str] = EVENT_TYPES):
+        """
+        Structured batch predictions: one entry per customer with a numeric
+        bump per requested event type
+        """
+        if not self.model:
+            return "Models not initialized."
+        
+        bumps = self.predict_batch(raw_customers, event_types)
+        with stage_timer('expense_predictor', 'result_formatting'):
+            return [
+                {
+                    'Customer_ID': customer.get('Customer_ID', 'N/A'),
+                    'Predicted_Expense_Bump_SGD': {
+                        event_type: round(float(bump), 2) for event_type, bump in zip(event_types, row)
+                    }
+                }
+                for customer, row in zip(raw_customers, bumps)
+            ]
+
 # --- EXECUTION ---
 if __name__ == '__main__':
     predictor = ExpensePredictor()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Load test for the WealthWise Python backend.
+
+Starts the backend in the requested mode(s) on a free port, fires a mix of
+requests from concurrent client threads for a fixed duration, and reports
+requests/second and latency percentiles per mode:
+
+    dev       python app.py (Werkzeug development server)
+    gunicorn  gunicorn -c gunicorn.conf.py wsgi:application
+
+Usage:
+    python loadtest.py [--modes dev gunicorn] [--concurrency 16] [--duration 20]
+    python loadtest.py --url http://localhost:9000   # test an already running server
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+from synthetic_profiles import generate_profiles
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def build_requests(n_profiles=200):
+    """(method, path, body) tuples cycled through by the clients"""
+    requests = [('GET', '/api/predict-rates', None), ('GET', '/api/latest-rates', None)]
+    for profile in generate_profiles(n_profiles):
+        requests.append(('POST', '/api/cluster-customer', profile))
+        requests.append(('POST', '/api/predict-expense', {"customer_data": profile, "event_type": "Marriage"}))
+    return requests
+
+
+def send(base_url, method, path, body):
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    request = urllib.request.Request(base_url + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=60) as response:
+        response.read()
+        return response.status
+
+
+def wait_until_up(base_url, process, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            send(base_url, 'GET', '/', None)
+            return
+        except OSError:
+            time.sleep(0.25)
+    raise RuntimeError("server did not come up")
+
+
+def run_load(base_url, requests, concurrency, duration):
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client(offset):
+        i = offset
+        local = []
+        while time.perf_counter() < stop_at:
+            method, path, body = requests[i % len(requests)]
+            start = time.perf_counter()
+            try:
+                send(base_url, method, path, body)
+                local.append(time.perf_counter() - start)
+            except Exception:
+                with lock:
+                    errors[0] += 1
+            i += concurrency
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(offset,)) for offset in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    pct = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else float('nan')
+    return {"requests": len(latencies), "errors": errors[0], "rps": len(latencies) / elapsed,
+            "p50_ms": pct(0.50), "p95_ms": pct(0.95), "p99_ms": pct(0.99)}
+
+
+def start_server(mode, port):
+    env = dict(os.environ, PORT=str(port), FLASK_DEBUG='0')
+    if mode == 'dev':
+        # The original mode: debug server with the reloader
+        env['FLASK_DEBUG'] = '1'
+        command = [sys.executable, 'app.py']
+    else:
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:application']
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Python backend")
+    parser.add_argument('--modes', nargs='+', default=['dev', 'gunicorn'], choices=['dev', 'gunicorn'])
+    parser.add_argument('--url', help="Test an already running server instead of starting one")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20)
+    args = parser.parse_args()
+
+    requests = build_requests()
+    targets = [('external', args.url)] if args.url else [(mode, None) for mode in args.modes]
+
+    print(f"{'mode':>9} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for mode, url in targets:
+        process = None
+        if url is None:
+            port = free_port()
+            url = f"http://127.0.0.1:{port}"
+            process = start_server(mode, port)
+        try:
+            wait_until_up(url, process)
+            send(url, 'GET', '/api/predict-rates', None)  # let a cold server warm its caches
+            result = run_load(url, requests, args.concurrency, args.duration)
+        finally:
+            if process is not None:
+                os.killpg(process.pid, 15)
+                process.wait()
+        print(f"{mode:>9} {result['requests']:>9} {result['errors']:>7} {result['rps']:>8.1f} "
+              f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+import numpy as np
+
+
+def recursive_forecast(step_fn, initial_window, steps, noise=None):
+    """
+    Recursive multi-step forecast over one preallocated window buffer
+
+    Args:
+        step_fn: Maps a (batch, lookback, features) window to the (batch, features) next step
+        initial_window (np.ndarray): Seed window, (lookback, features) or (batch, lookback, features)
+        steps (int): Number of steps to forecast
+        noise (np.ndarray): Optional per-step perturbation, (steps, features) or (batch, steps, features)
+
+    Returns:
+        np.ndarray: (steps, features), or (batch, steps, features) for a batched seed
+    """
+    window = np.asarray(initial_window, dtype=np.float32)
+    single = window.ndim == 2
+    if single:
+        window = window[np.newaxis]
+
+    batch, lookback, features = window.shape
+    buffer = np.empty((batch, lookback + steps, features), dtype=np.float32)
+    buffer[:, :lookback] = window
+
+    if noise is None:
+        for i in range(steps):
+            buffer[:, lookback + i] = step_fn(buffer[:, i:i + lookback])
+    else:
+        noise = np.asarray(noise, dtype=np.float32)
+        if noise.ndim == 2:
+            noise = noise[np.newaxis]
+        for i in range(steps):
+            buffer[:, lookback + i] = step_fn(buffer[:, i:i + lookback]) + noise[:, i]
+
+    forecasts = buffer[:, lookback:]
+    return forecasts[0] if single else forecasts
+
+
+def keras_step_function(model, lookback, features):
+    """Single-step inference for a trained Keras model, traced once (model.predict is slow per call)"""
+    import tensorflow as tf
+
+    @tf.function(input_signature=[tf.TensorSpec([None, lookback, features], tf.float32)])
+    def step(window):
+        return model(window, training=False)
+
+    return lambda window: step(np.ascontiguousarray(window)).numpy()
+
+
+_ACTIVATIONS = {
+    'relu': lambda x: np.maximum(x, 0),
+    'tanh': np.tanh,
+    'linear': lambda x: x,
+    'sigmoid': lambda x: 1.0 / (1.0 + np.exp(-x)),
+}
+
+
+class NumpyLSTM:
+    """NumPy forward pass of the LSTM -> Dense rate model (Keras gate order i, f, c, o)"""
+
+    WEIGHT_KEYS = ('lstm_kernel', 'lstm_recurrent_kernel', 'lstm_bias', 'dense_kernel', 'dense_bias')
+
+    def __init__(self, lstm_kernel, lstm_recurrent_kernel, lstm_bias, dense_kernel, dense_bias,
+                 activation='relu', dtype=np.float32):
+        self.kernel = np.asarray(lstm_kernel, dtype=dtype)
+        self.recurrent_kernel = np.asarray(lstm_recurrent_kernel, dtype=dtype)
+        self.bias = np.asarray(lstm_bias, dtype=dtype)
+        self.dense_kernel = np.asarray(dense_kernel, dtype=dtype)
+        self.dense_bias = np.asarray(dense_bias, dtype=dtype)
+        self.activation_name = activation
+        self.activation = _ACTIVATIONS[activation]
+        self.units = self.recurrent_kernel.shape[0]
+        self.dtype = dtype
+
+    @classmethod
+    def from_keras(cls, model):
+        """Extract weights from a trained Sequential([LSTM, Dense]) model"""
+        lstm_layer, dense_layer = model.layers[0], model.layers[1]
+        kernel, recurrent_kernel, bias = lstm_layer.get_weights()
+        dense_kernel, dense_bias = dense_layer.get_weights()
+        return cls(kernel, recurrent_kernel, bias, dense_kernel, dense_bias,
+                   activation=lstm_layer.activation.__name__)
+
+    def save(self, path):
+        np.savez(path, lstm_kernel=self.kernel, lstm_recurrent_kernel=self.recurrent_kernel,
+                 lstm_bias=self.bias, dense_kernel=self.dense_kernel, dense_bias=self.dense_bias,
+                 activation=np.array(self.activation_name))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as weights:
+            return cls(*(weights[key] for key in cls.WEIGHT_KEYS),
+                       activation=str(weights['activation']))
+
+    def __call__(self, window):
+        window = np.asarray(window, dtype=self.dtype)
+        batch, lookback, _ = window.shape
+        units = self.units
+
+        # Input projections for all timesteps in one matmul
+        input_proj = window @ self.kernel + self.bias
+        h = np.zeros((batch, units), dtype=self.dtype)
+        c = np.zeros((batch, units), dtype=self.dtype)
+
+        for t in range(lookback):
+            z = input_proj[:, t] + h @ self.recurrent_kernel
+            i = _ACTIVATIONS['sigmoid'](z[:, :units])
+            f = _ACTIVATIONS['sigmoid'](z[:, units:2 * units])
+            c = f * c + i * self.activation(z[:, 2 * units:3 * units])
+            o = _ACTIVATIONS['sigmoid'](z[:, 3 * units:])
+            h = o * self.activation(c)
+
+        return h @ self.dense_kernel + self.dense_bias
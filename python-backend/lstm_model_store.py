@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+
+from lstm_inference import NumpyLSTM
+
+# --- Artifact Layout ---
+DEFAULT_ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'lstm')
+MANIFEST_FILE = 'manifest.json'
+WEIGHTS_FILE = 'lstm_rate.weights.h5'
+SCALER_FILE = 'scaler_rates.joblib'
+STATE_FILE = 'forecast_state.npz'
+NUMPY_WEIGHTS_FILE = 'lstm_rate_weights.npz'
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Content hash of a file, used to detect changes to the training data"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def array_sha256(values):
+    """Content hash of a numeric array, used to check that new data only appends rows"""
+    return hashlib.sha256(np.ascontiguousarray(values, dtype=np.float64).tobytes()).hexdigest()
+
+
+def hyperparameters_hash(hyperparameters):
+    """Stable hash of a hyperparameter dict (key order does not matter)"""
+    payload = json.dumps(hyperparameters, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LSTMModelStore:
+    """
+    On-disk LSTM artifact: weights (Keras and NumPy), scaler, seed window and a
+    manifest with the data and hyperparameter hashes, written last
+    """
+
+    def __init__(self, artifact_dir=DEFAULT_ARTIFACT_DIR):
+        self.artifact_dir = artifact_dir
+
+    def _path(self, name):
+        return os.path.join(self.artifact_dir, name)
+
+    def read_manifest(self):
+        """Return the manifest dict, or None if no complete artifact exists"""
+        try:
+            with open(self._path(MANIFEST_FILE), 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        required = [WEIGHTS_FILE, SCALER_FILE, STATE_FILE]
+        if not all(os.path.exists(self._path(name)) for name in required):
+            return None
+        return manifest
+
+    def manifest_mtime(self):
+        """Modification time of the manifest (ns), or None if there is none"""
+        try:
+            return os.stat(self._path(MANIFEST_FILE)).st_mtime_ns
+        except OSError:
+            return None
+
+    def is_current(self, data_hash, hyperparameters):
+        """True if the stored artifact was trained on this data with these settings"""
+        manifest = self.read_manifest()
+        if manifest is None:
+            return False
+        return (manifest.get('data_hash') == data_hash and
+                manifest.get('hyperparameters_hash') == hyperparameters_hash(hyperparameters))
+
+    def _atomic_write(self, name, writer, suffix=''):
+        """Write to a temporary file in the artifact dir, then rename into place"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.artifact_dir, prefix='.tmp-', suffix=suffix)
+        os.close(fd)
+        try:
+            writer(tmp_path)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self._path(name))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def save(self, model, scaler, last_sequence, data_hash, hyperparameters, extra=None):
+        """
+        Persist a trained model and its serving state
+
+        Returns:
+            dict: The manifest that was written
+        """
+        os.makedirs(self.artifact_dir, exist_ok=True)
+
+        # Drop the manifest first so a crash mid-save never leaves it pointing at mixed files
+        if os.path.exists(self._path(MANIFEST_FILE)):
+            os.remove(self._path(MANIFEST_FILE))
+
+        self._atomic_write(WEIGHTS_FILE, model.save_weights, suffix='.weights.h5')
+        self.export_numpy_weights(model)
+        self._atomic_write(SCALER_FILE, lambda path: joblib.dump(scaler, path))
+        self._atomic_write(
+            STATE_FILE,
+            lambda path: np.savez(path, last_sequence=np.asarray(last_sequence)),
+            suffix='.npz'
+        )
+
+        manifest = {
+            'model_version': file_sha256(self._path(WEIGHTS_FILE))[:16],
+            'data_hash': data_hash,
+            'hyperparameters': hyperparameters,
+            'hyperparameters_hash': hyperparameters_hash(hyperparameters),
+            'trained_at': datetime.now(timezone.utc).isoformat(),
+        }
+        if extra:
+            manifest.update(extra)
+
+        def write_manifest(path):
+            with open(path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+
+        self._atomic_write(MANIFEST_FILE, write_manifest)
+        return manifest
+
+    def export_numpy_weights(self, model):
+        """Write the LSTM and Dense weights of a Keras model to a compact .npz"""
+        self._atomic_write(NUMPY_WEIGHTS_FILE, NumpyLSTM.from_keras(model).save, suffix='.npz')
+
+    def has_numpy_weights(self):
+        return os.path.exists(self._path(NUMPY_WEIGHTS_FILE))
+
+    def load_numpy_model(self):
+        return NumpyLSTM.load(self._path(NUMPY_WEIGHTS_FILE))
+
+    def load_weights_into(self, model):
+        model.load_weights(self._path(WEIGHTS_FILE))
+
+    def load_scaler(self):
+        return joblib.load(self._path(SCALER_FILE))
+
+    def load_state(self):
+        with np.load(self._path(STATE_FILE)) as state:
+            return {key: state[key] for key in state.files}
@@ -2,27 +2,111 @@ import pandas as pd
 import numpy as np
 import json
 from sklearn.preprocessing import MinMaxScaler
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense
-from tensorflow.keras.optimizers import Adam
 import os
+import threading
+import uuid
+from lstm_inference import recursive_forecast, keras_step_function, NumpyLSTM
+import time
+from lstm_model_store import LSTMModelStore, DEFAULT_ARTIFACT_DIR, array_sha256, hyperparameters_hash
+from lstm_windowing import sliding_windows, fit_inputs, validation_inputs
+from rate_history import load_rate_history
+from training_jobs import TrainingJobManager, keras_progress_callback
+from metrics import stage_timer
+
+# Training settings; any change invalidates the persisted model artifact
+DEFAULT_HYPERPARAMETERS = {
+    'lookback': 12,          # 12 months of history
+    'lstm_units': 50,
+    'learning_rate': 0.005,
+    'epochs': 30,
+    'batch_size': 32,
+}
+
+# Best settings found by lstm_tuning.py; merged over the defaults when present
+DEFAULT_TUNED_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'lstm_tuned_hyperparameters.json')
+
+# Serving backend: 'numpy' runs forecasts from the exported .npz weights without
+# importing TensorFlow; 'keras' loads the full model. TensorFlow is always
+# imported lazily, only when training or when the keras backend is selected.
+DEFAULT_INFERENCE_BACKEND = os.environ.get('LSTM_INFERENCE_BACKEND', 'numpy')
+
+# Longest horizon served by /api/predict-rates; the cached trajectory covers it
+MAX_FORECAST_MONTHS = 120
+
+# Ensemble (fan chart) forecasts: number of bootstrapped paths and the
+# quantile bands reported for each month
+DEFAULT_ENSEMBLE_PATHS = 1000
+# Ensembles run on the request thread: 1000 paths x 120 months is ~1.5 s
+MAX_ENSEMBLE_PATHS = 1000
+ENSEMBLE_QUANTILES = {'p10': 10, 'p50': 50, 'p90': 90}
+
+# Incremental updates when months are appended to the rate history: warm-start
+# from the stored weights and fine-tune on the most recent sequences, keeping
+# the stored scaler. Not part of DEFAULT_HYPERPARAMETERS, so changing them does
+# not invalidate artifacts.
+INCREMENTAL_EPOCHS = 5
+INCREMENTAL_WINDOW = 48        # most recent sequences used for fine-tuning
+DRIFT_TOLERANCE = 3.0          # max ratio of the error on new months to the last full fit's test error
+MAX_INCREMENTAL_UPDATES = 12   # force a full retrain after this many updates in a row
+
+def load_tuned_hyperparameters(path=DEFAULT_TUNED_CONFIG):
+    """Hyperparameters written by lstm_tuning.py ({} if there are none)"""
+    try:
+        with open(path, 'r') as f:
+            tuned = json.load(f).get('hyperparameters', {})
+    except (OSError, ValueError):
+        return {}
+    return {key: value for key, value in tuned.items() if key in DEFAULT_HYPERPARAMETERS}
+
+
+def build_rate_model(lookback, features, lstm_units, learning_rate):
+    """Build and compile the (untrained) LSTM(units) -> Dense(features) rate network"""
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, Dense
+    from tensorflow.keras.optimizers import Adam
+
+    model = Sequential([
+        LSTM(lstm_units, activation='relu', input_shape=(lookback, features)),
+        Dense(features)
+    ])
+    model.compile(optimizer=Adam(learning_rate=learning_rate), loss='mse')
+    return model
 
 class LSTMRateController:
     """
     Controller class for LSTM rate prediction that provides nominal rate and inflation rate forecasts
     """
     
-    def __init__(self, data_file_path='ai_model_input_data.csv'):
+    def __init__(self, data_file_path='ai_model_input_data.csv', artifact_dir=DEFAULT_ARTIFACT_DIR,
+                 hyperparameters=None, inference_backend=DEFAULT_INFERENCE_BACKEND,
+                 tuned_config=DEFAULT_TUNED_CONFIG):
         self.data_file_path = data_file_path
         self.model = None
+        self.numpy_model = None
+        self.inference_backend = inference_backend
         self.scaler = None
         self.model_vars = ['Nominal_Rate', 'YoY_Inflation']
-        self.lookback = 12  # 12 months of history
+        # Defaults, then the tuned config (if any), then explicit overrides
+        self.hyperparameters = dict(DEFAULT_HYPERPARAMETERS, **load_tuned_hyperparameters(tuned_config),
+                                    **(hyperparameters or {}))
+        self.lookback = self.hyperparameters['lookback']
         self.forecast_steps = 60  # 5 years forecast
         self.is_trained = False
+        self.data_hash = None
+        self.model_version = None
+        self.model_store = LSTMModelStore(artifact_dir)
+        self._forecast_lock = threading.Lock()
+        self._step_fn = None
+        self._trajectory_cache = None
+        self._response_cache = {}
+        self._residuals_cache = None
+        self._artifact_mtime = self.model_store.manifest_mtime()
+        self.training_jobs = TrainingJobManager()
+        self.last_update = None
         
-        # Try to load and prepare data
-        self._load_data()
+        # Try to load and prepare data, then pick up a previously trained model
+        if self._load_data():
+            self._load_artifact()
         
     def _load_data(self):
         """Load and prepare the data for LSTM model"""
@@ -32,7 +116,10 @@ class LSTMRateController:
                 self.data = None
                 return False
                 
-            self.data = pd.read_csv(self.data_file_path, index_col='Date', parse_dates=True)
+            # Memory-mapped binary copy of the CSV, rebuilt when the CSV changes
+            history = load_rate_history(self.data_file_path)
+            self.data = history.frame
+            self.data_hash = history.sha256
             
             # Check if required columns exist
             missing_cols = [col for col in self.model_vars if col not in self.data.columns]
@@ -53,27 +140,117 @@ class LSTMRateController:
             self.data = None
             return False
     
+    def _build_model(self, features):
+        """Build and compile the (untrained) LSTM network"""
+        return build_rate_model(self.lookback, features, self.hyperparameters['lstm_units'],
+                                self.hyperparameters['learning_rate'])
+
+    def _load_artifact(self):
+        """
+        Load a persisted model if it matches the current data and hyperparameters
+
+        Returns:
+            bool: True if a trained model is now available
+        """
+        try:
+            if not self.model_store.is_current(self.data_hash, self.hyperparameters):
+                return False
+
+            manifest = self.model_store.read_manifest()
+            state = self.model_store.load_state()
+            scaler = self.model_store.load_scaler()
+            if self.inference_backend == 'numpy' and self.model_store.has_numpy_weights():
+                numpy_model, model = self.model_store.load_numpy_model(), None
+            else:
+                model = self._build_model(len(self.model_vars))
+                self.model_store.load_weights_into(model)
+                numpy_model = None
+
+            # Swap in under the forecast lock so concurrent forecasts never mix two artifacts
+            with self._forecast_lock:
+                self.scaler = scaler
+                # An incrementally updated artifact keeps its original scaler
+                self.scaled_data = scaler.transform(self.data_for_model)
+                self.model = model
+                self.numpy_model = numpy_model
+                self.last_sequence = state['last_sequence']
+                self.model_version = manifest['model_version']
+                self._invalidate_forecast_cache()
+                self.is_trained = True
+            return True
+
+        except Exception as e:
+            print(f"Warning: Could not load LSTM artifact, model will be retrained: {str(e)}")
+            with self._forecast_lock:
+                self.model = None
+                self.numpy_model = None
+                self._invalidate_forecast_cache()
+                self.is_trained = False
+            return False
+
+    def train_and_save(self, force=False, incremental=True):
+        """
+        Train the model and persist it, unless a current artifact already exists
+
+        Args:
+            force (bool): Retrain even if the stored artifact is current
+            incremental (bool): If the data only gained new months, fine-tune
+                the stored model instead of training from scratch
+
+        Returns:
+            dict: The artifact manifest
+        """
+        if self.data is None:
+            raise Exception("No data available for training")
+
+        if force:
+            self._train_model()
+        elif not self._load_artifact():
+            self._update_model(incremental=incremental)
+        return self.model_store.read_manifest()
+
+    def export_numpy_weights(self):
+        """Backfill the NumPy weight export for an artifact saved without one"""
+        model = self.model
+        if model is None:
+            model = self._build_model(len(self.model_vars))
+            self.model_store.load_weights_into(model)
+        self.model_store.export_numpy_weights(model)
+
     def _create_sequences(self, data, lookback):
-        """Create sequences for LSTM training"""
-        X, y = [], []
-        for i in range(lookback, len(data)):
-            X.append(data[i-lookback:i, :])
-            y.append(data[i, :])
-        return np.array(X), np.array(y)
+        """Create sequences for LSTM training (zero-copy strided views over data)"""
+        return sliding_windows(data, lookback)
     
-    def _train_model(self):
-        """Train the LSTM model"""
+    def _split_sizes(self, total_sequences):
+        """(train, validation) sizes; the remaining last 10% is the test split"""
+        test_size = int(0.10 * total_sequences)
+        validation_size = int(0.10 * total_sequences)
+        return total_sequences - test_size - validation_size, validation_size
+
+    def _train_model(self, job=None):
+        """
+        Train the LSTM model
+
+        Args:
+            job (TrainingJob): Optional job to report per-epoch progress on
+
+        Returns:
+            str: The new model version
+        """
         if self.data is None:
             raise Exception("No data available for training")
-            
+        
+        start = time.time()
+        
+        # A full fit always refits the scaler on the whole history
+        scaler = MinMaxScaler(feature_range=(0, 1))
+        scaled_data = scaler.fit_transform(self.data_for_model)
+        
         # Create sequences
-        X, y = self._create_sequences(self.scaled_data, self.lookback)
+        X, y = self._create_sequences(scaled_data, self.lookback)
         
         # Split data for training
-        total_sequences = len(X)
-        test_size = int(0.10 * total_sequences)
-        validation_size = int(0.10 * total_sequences)
-        train_size = total_sequences - test_size - validation_size
+        train_size, validation_size = self._split_sizes(len(X))
         
         X_train = X[:train_size]
         y_train = y[:train_size]
@@ -81,104 +258,459 @@ class LSTMRateController:
         y_val = y[train_size:train_size+validation_size]
         
         # Build model
-        features = self.scaled_data.shape[1]
-        self.model = Sequential([
-            LSTM(50, activation='relu', input_shape=(self.lookback, features)),
-            Dense(features)
-        ])
-        
-        self.model.compile(optimizer=Adam(learning_rate=0.005), loss='mse')
+        features = scaled_data.shape[1]
+        model = self._build_model(features)
+        epochs = self.hyperparameters['epochs']
+        batch_size = self.hyperparameters['batch_size']
         
         # Train model
-        self.model.fit(X_train, y_train, epochs=30, batch_size=32, verbose=0,
-                      validation_data=(X_val, y_val))
+        model.fit(**fit_inputs(X_train, y_train, batch_size), epochs=epochs, verbose=0,
+                  validation_data=validation_inputs(X_val, y_val, batch_size),
+                  callbacks=[keras_progress_callback(job, 'validation')] if job else None)
         
         # Retrain with full data for final forecasting
         X_full_train = X[:train_size+validation_size]
         y_full_train = y[:train_size+validation_size]
-        self.model.fit(X_full_train, y_full_train, epochs=30, batch_size=32, verbose=0)
+        model.fit(**fit_inputs(X_full_train, y_full_train, batch_size), epochs=epochs, verbose=0,
+                  callbacks=[keras_progress_callback(job, 'full')] if job else None)
+        
+        # Swap the new model in only once it is fully trained
+        with self._forecast_lock:
+            self.scaler = scaler
+            self.scaled_data = scaled_data
+            self.model = model
+            self.last_sequence = X_full_train[-1].copy()
+            self.numpy_model = NumpyLSTM.from_keras(model) if self.inference_backend == 'numpy' else None
+            self.model_version = f"unsaved-{uuid.uuid4().hex[:8]}"
+            self._invalidate_forecast_cache()
+            self.is_trained = True
+        
+        # Test-split error of the fitted model: the reference for drift checks on later incremental updates
+        X_test, y_test = X[train_size+validation_size:], y[train_size+validation_size:]
+        baseline_error = (float(np.mean((model(X_test.astype(np.float32), training=False).numpy() - y_test) ** 2))
+                          if len(X_test) else None)
+        
+        self.last_update = {"kind": "full", "reason": None, "seconds": round(time.time() - start, 2)}
+        self._save_artifact(model, {
+            'data_rows': len(self.data_for_model),
+            'history_hash': array_sha256(self.data_for_model),
+            'baseline_error': baseline_error,
+            'incremental_updates': 0,
+        })
+        return self.model_version
+
+    def _save_artifact(self, model, extra):
+        """Persist so other workers and restarts skip training"""
+        try:
+            manifest = self.model_store.save(model, self.scaler, self.last_sequence,
+                                             self.data_hash, self.hyperparameters, extra=extra)
+            self.model_version = manifest['model_version']
+            self._artifact_mtime = self.model_store.manifest_mtime()
+        except Exception as e:
+            print(f"Warning: Could not save LSTM artifact: {str(e)}")
+
+    def _incremental_base(self):
+        """
+        The stored manifest if the current data extends the data it was trained
+        on by appended rows only (same settings, identical earlier rows)
+
+        Returns:
+            tuple: (manifest, None), or (None, reason) if a full retrain is needed
+        """
+        manifest = self.model_store.read_manifest()
+        if manifest is None:
+            return None, "no stored model"
+        if manifest.get('hyperparameters_hash') != hyperparameters_hash(self.hyperparameters):
+            return None, "hyperparameters changed"
+        rows = manifest.get('data_rows')
+        if rows is None or manifest.get('baseline_error') is None:
+            return None, "stored model predates incremental updates"
+        if rows >= len(self.data_for_model) or array_sha256(self.data_for_model[:rows]) != manifest.get('history_hash'):
+            return None, "history changed, not just appended"
+        if manifest.get('incremental_updates', 0) >= MAX_INCREMENTAL_UPDATES:
+            return None, f"{MAX_INCREMENTAL_UPDATES} incremental updates since the last full fit"
+        return manifest, None
+
+    def _update_incremental(self, manifest, job=None):
+        """
+        Warm-start from the stored weights and fine-tune on the most recent
+        sequences, keeping the stored scaler
+
+        Returns:
+            str: None on success, otherwise the reason a full retrain is needed
+        """
+        start = time.time()
+        scaler = self.model_store.load_scaler()
+        new_rows = self.data_for_model[manifest['data_rows']:]
+        if np.any(new_rows < scaler.data_min_) or np.any(new_rows > scaler.data_max_):
+            return "new data outside the scaler's fitted range"
+        
+        scaled_data = scaler.transform(self.data_for_model)
+        X, y = self._create_sequences(scaled_data, self.lookback)
+        model = self._build_model(scaled_data.shape[1])
+        self.model_store.load_weights_into(model)
+        
+        # Drift guard: the stored model must still explain the new months
+        X_new, y_new = X[-len(new_rows):], y[-len(new_rows):]
+        new_error = float(np.mean((model(X_new.astype(np.float32), training=False).numpy() - y_new) ** 2))
+        if new_error > DRIFT_TOLERANCE * manifest['baseline_error']:
+            return (f"error on new data {new_error:.5f} exceeds {DRIFT_TOLERANCE}x "
+                    f"the last full fit's {manifest['baseline_error']:.5f}")
+        
+        if job is not None:
+            job.total_epochs = INCREMENTAL_EPOCHS
+        model.fit(**fit_inputs(X[-INCREMENTAL_WINDOW:], y[-INCREMENTAL_WINDOW:], self.hyperparameters['batch_size']),
+                  epochs=INCREMENTAL_EPOCHS, verbose=0,
+                  callbacks=[keras_progress_callback(job, 'incremental')] if job else None)
+        
+        train_size, validation_size = self._split_sizes(len(X))
+        with self._forecast_lock:
+            self.scaler = scaler
+            self.scaled_data = scaled_data
+            self.model = model
+            self.last_sequence = X[train_size+validation_size-1].copy()
+            self.numpy_model = NumpyLSTM.from_keras(model) if self.inference_backend == 'numpy' else None
+            self.model_version = f"unsaved-{uuid.uuid4().hex[:8]}"
+            self._invalidate_forecast_cache()
+            self.is_trained = True
+        
+        self.last_update = {"kind": "incremental", "reason": None, "seconds": round(time.time() - start, 2),
+                            "new_rows": len(new_rows), "new_data_error": new_error}
+        self._save_artifact(model, {
+            'data_rows': len(self.data_for_model),
+            'history_hash': array_sha256(self.data_for_model),
+            'baseline_error': manifest['baseline_error'],
+            'incremental_updates': manifest.get('incremental_updates', 0) + 1,
+            'base_version': manifest.get('base_version', manifest['model_version']),
+        })
+        return None
+
+    def _update_model(self, job=None, incremental=True):
+        """
+        Bring the model up to date with the data: an incremental update when
+        only new months were appended, otherwise (or if it is rejected) a full retrain
+
+        Returns:
+            str: The new model version
+        """
+        reason = "incremental updates disabled"
+        if incremental:
+            manifest, reason = self._incremental_base()
+            if manifest is not None:
+                reason = self._update_incremental(manifest, job)
+                if reason is None:
+                    return self.model_version
+        
+        print(f"Info: full LSTM retrain ({reason})")
+        if job is not None:
+            job.total_epochs = 2 * self.hyperparameters['epochs']
+        self._train_model(job)
+        self.last_update["reason"] = reason
+        return self.model_version
+
+    def start_training(self):
+        """
+        Start background training, or join the job already running
+
+        Returns:
+            TrainingJob: The active training job
+        """
+        if self.data is None:
+            raise Exception("No data available for training")
+        total_epochs = 2 * self.hyperparameters['epochs']  # validation fit + full-data fit
+        job, _ = self.training_jobs.submit(self._update_model, total_epochs)
+        return job
+
+    def training_status(self, job_id):
+        """Progress of a training job, or None if the id is unknown"""
+        job = self.training_jobs.get(job_id)
+        return job.to_dict() if job is not None else None
+        
+    def _step_function(self):
+        """One-step predictor for the current model (NumPy or compiled Keras)"""
+        if self._step_fn is None:
+            if self.numpy_model is not None:
+                self._step_fn = self.numpy_model
+            else:
+                self._step_fn = keras_step_function(self.model, self.lookback, len(self.model_vars))
+        return self._step_fn
+
+    def _forecast_scaled(self, steps):
+        """Recursive multi-step forecast in scaled space"""
+        return recursive_forecast(self._step_function(), self.last_sequence, steps)
+
+    def _bootstrap_residuals(self):
+        """
+        One-step forecast errors on the held-out test split (the last 10% of
+        sequences, never used for fitting), in scaled space, cached per model version
+
+        Returns:
+            np.ndarray: (n_test, features) residuals
+        """
+        cached = self._residuals_cache
+        if cached is not None and cached[0] == self.model_version:
+            return cached[1]
+
+        X, y = self._create_sequences(self.scaled_data, self.lookback)
+        test_size = max(int(0.10 * len(X)), 1)
+        X_test, y_test = X[-test_size:], y[-test_size:]
+        residuals = (y_test - self._step_function()(X_test.astype(np.float32))).astype(np.float32)
+
+        self._residuals_cache = (self.model_version, residuals)
+        return residuals
+
+    def _ensemble_paths(self, months_ahead, paths, seed):
+        """
+        Residual-bootstrap ensemble: every path adds a resampled test-set error
+        to each step's prediction before feeding it back. All paths advance
+        together as one (paths, lookback, features) batch per step.
+
+        Returns:
+            np.ndarray: (paths, months_ahead, features) in original units
+        """
+        residuals = self._bootstrap_residuals()
+        rng = np.random.default_rng(seed)
+        noise = residuals[rng.integers(0, len(residuals), size=(paths, months_ahead))]
+
+        seed_windows = np.broadcast_to(self.last_sequence, (paths,) + self.last_sequence.shape)
+        with stage_timer('lstm_rate_controller', 'ensemble_forecast'):
+            scaled_paths = recursive_forecast(self._step_function(), seed_windows, months_ahead, noise=noise)
+
+        features = scaled_paths.shape[-1]
+        return self.scaler.inverse_transform(
+            scaled_paths.reshape(-1, features)).reshape(paths, months_ahead, features)
+
+    def _forecast_ensemble(self, months_ahead, paths, seed):
+        """
+        Returns:
+            dict: Quantile name -> (months_ahead, features) array in original units
+        """
+        bands = np.percentile(self._ensemble_paths(months_ahead, paths, seed),
+                              list(ENSEMBLE_QUANTILES.values()), axis=0)
+        return dict(zip(ENSEMBLE_QUANTILES, bands))
+
+    def _forecast_trajectory(self, months_ahead):
+        """
+        Full forecast trajectory in original units, computed once per model version
+
+        The recursion is deterministic, so the forecast for any horizon is a
+        prefix of the longest one; shorter requests slice the cached path.
+        """
+        steps = max(months_ahead, MAX_FORECAST_MONTHS)
+        trajectory = self._trajectory_cache
+        if trajectory is not None and trajectory[0] == self.model_version and len(trajectory[1]) >= steps:
+            return trajectory[1]
+        
+        with self._forecast_lock:
+            trajectory = self._trajectory_cache
+            if trajectory is not None and trajectory[0] == self.model_version and len(trajectory[1]) >= steps:
+                return trajectory[1]
+            
+            with stage_timer('lstm_rate_controller', 'recursive_forecast'):
+                forecasted_actual = self.scaler.inverse_transform(self._forecast_scaled(steps))
+            self._trajectory_cache = (self.model_version, forecasted_actual)
+            return forecasted_actual
+
+    def warm_up(self):
+        """
+        Precompute the forecast trajectory for a loaded model, e.g. in a WSGI
+        master before forking so workers inherit it
+
+        Returns:
+            bool: True if the cache is warm
+        """
+        if not self.is_trained:
+            return False
+        self._forecast_trajectory(MAX_FORECAST_MONTHS)
+        return True
+
+    def _invalidate_forecast_cache(self):
+        self._step_fn = None
+        self._trajectory_cache = None
+        self._response_cache = {}
+
+    def _refresh_artifact(self):
+        """Reload the model if the artifact on disk was replaced (e.g. by train_lstm_model.py)"""
+        mtime = self.model_store.manifest_mtime()
+        if mtime is None or mtime == self._artifact_mtime:
+            return
+        self._artifact_mtime = mtime
+        manifest = self.model_store.read_manifest()
+        if manifest is None or manifest.get('model_version') == self.model_version:
+            return
+        self._load_artifact()
+
+    def _format_forecast(self, forecasted_actual, months_ahead, bands=None):
+        """
+        Build the JSON response for a forecast in original units
+
+        bands (quantile name -> (months_ahead, features) array) adds those
+        quantiles to every nominal/inflation entry next to the point forecast.
+        """
+        # Create date index for forecast
+        last_historical_date = self.data.index[-1]
+        forecast_index = pd.date_range(start=last_historical_date, periods=months_ahead + 1, freq='MS')[1:]
         
-        self.is_trained = True
-        self.last_sequence = X_full_train[-1].copy()
+        # Create forecast dataframe
+        forecast_df = pd.DataFrame(forecasted_actual, index=forecast_index, columns=self.model_vars)
+        forecast_df['Nominal_Rate'] = forecast_df['Nominal_Rate'].round(4)
+        forecast_df['YoY_Inflation'] = forecast_df['YoY_Inflation'].round(4)
         
-    def predict_rates(self, months_ahead=None):
+        # Format output as JSON arrays
+        forecast_df['date'] = forecast_df.index.strftime('%Y-%m')
+        
+        # Nominal rate array
+        nominal_rate_array = forecast_df[['date', 'Nominal_Rate']].copy()
+        nominal_rate_array.rename(columns={'Nominal_Rate': 'rate'}, inplace=True)
+        nominal_rate_list = nominal_rate_array.to_dict('records')
+        
+        # Inflation rate array
+        inflation_array = forecast_df[['date', 'YoY_Inflation']].copy()
+        inflation_array.rename(columns={'YoY_Inflation': 'rate'}, inplace=True)
+        inflation_list = inflation_array.to_dict('records')
+        
+        if bands:
+            for column, entries in enumerate((nominal_rate_list, inflation_list)):
+                for name, band in bands.items():
+                    values = np.round(band[:, column], 4).tolist()
+                    for entry, value in zip(entries, values):
+                        entry[name] = value
+        
+        return {
+            "success": True,
+            "forecast_months": months_ahead,
+            "forecast_start_date": forecast_index[0].strftime('%Y-%m'),
+            "forecast_end_date": forecast_index[-1].strftime('%Y-%m'),
+            "nominal_rates": nominal_rate_list,
+            "inflation_rates": inflation_list,
+            "summary": {
+                "avg_nominal_rate": float(forecast_df['Nominal_Rate'].mean().round(4)),
+                "avg_inflation_rate": float(forecast_df['YoY_Inflation'].mean().round(4)),
+                "min_nominal_rate": float(forecast_df['Nominal_Rate'].min().round(4)),
+                "max_nominal_rate": float(forecast_df['Nominal_Rate'].max().round(4)),
+                "min_inflation_rate": float(forecast_df['YoY_Inflation'].min().round(4)),
+                "max_inflation_rate": float(forecast_df['YoY_Inflation'].max().round(4))
+            }
+        }
+        
+    def _ensure_trained(self, wait):
+        """
+        Make sure a trained model is available, training in the background if needed
+
+        Returns:
+            dict: A "still training" response if training is running after
+            `wait` seconds, otherwise None
+        """
+        if not self.is_trained:
+            job = self.start_training()
+            job.wait(wait)
+            if job.status == 'failed':
+                raise Exception(f"Training failed: {job.error}")
+            if not self.is_trained:
+                return {
+                    "success": False,
+                    "status": "training",
+                    "error": "Model is training; poll the job or retry later",
+                    "job": job.to_dict()
+                }
+        else:
+            self._refresh_artifact()
+        return None
+
+    def predict_rates(self, months_ahead=None, wait=None, ensemble_paths=None, seed=0):
         """
         Generate rate predictions for the specified number of months
         
         Args:
             months_ahead (int): Number of months to forecast (default: 60 months/5 years)
+            wait (float): If the model is untrained, seconds to wait for the
+                background training job; None waits until it finishes
+            ensemble_paths (int): If set, also run this many residual-bootstrap
+                paths and add p10/p50/p90 to every rate entry (fan chart)
+            seed (int): Random seed for the ensemble, so responses are reproducible
             
         Returns:
-            dict: JSON response with nominal rates and inflation rates
+            dict: JSON response with nominal rates and inflation rates. Point
+            forecasts are cached per horizon and shared between callers; do not mutate.
+            While training is still running after `wait` seconds, returns
+            {"success": False, "status": "training", "job": {...}} instead.
         """
         try:
             if months_ahead is None:
                 months_ahead = self.forecast_steps
                 
-            # Train model if not already trained
-            if not self.is_trained:
-                self._train_model()
-            
-            # Generate forecasts
-            last_known_sequence = self.last_sequence.copy()
-            forecasted_scaled = []
-            
-            for _ in range(months_ahead):
-                input_seq = last_known_sequence.reshape(1, self.lookback, len(self.model_vars))
-                predicted_step = self.model.predict(input_seq, verbose=0)[0]
-                forecasted_scaled.append(predicted_step)
-                
-                # Recursive update
-                last_known_sequence = np.roll(last_known_sequence, -1, axis=0)
-                last_known_sequence[-1] = predicted_step
-            
-            # Transform back to original scale
-            forecasted_scaled = np.array(forecasted_scaled)
-            forecasted_actual = self.scaler.inverse_transform(forecasted_scaled)
-            
-            # Create date index for forecast
-            last_historical_date = self.data.index[-1]
-            forecast_index = pd.date_range(start=last_historical_date, periods=months_ahead + 1, freq='MS')[1:]
+            # Train model in the background if not already trained, and pick up artifacts retrained elsewhere
+            with stage_timer('lstm_rate_controller', 'model_check'):
+                pending = self._ensure_trained(wait)
+            if pending is not None:
+                return pending
             
-            # Create forecast dataframe
-            forecast_df = pd.DataFrame(forecasted_actual, index=forecast_index, columns=self.model_vars)
-            forecast_df['Nominal_Rate'] = forecast_df['Nominal_Rate'].round(4)
-            forecast_df['YoY_Inflation'] = forecast_df['YoY_Inflation'].round(4)
+            # Point forecasts depend only on the horizon and the model, so serve repeats from cache.
+            # Ensembles are recomputed: their caller-chosen seeds would make the cache unbounded.
+            cache_key = (self.model_version, months_ahead)
+            if not ensemble_paths:
+                cached = self._response_cache.get(cache_key)
+                if cached is not None:
+                    return cached
             
-            # Format output as JSON arrays
-            forecast_df['date'] = forecast_df.index.strftime('%Y-%m')
-            
-            # Nominal rate array
-            nominal_rate_array = forecast_df[['date', 'Nominal_Rate']].copy()
-            nominal_rate_array.rename(columns={'Nominal_Rate': 'rate'}, inplace=True)
-            nominal_rate_list = nominal_rate_array.to_dict('records')
+            forecasted_actual = self._forecast_trajectory(months_ahead)[:months_ahead]
+            bands = self._forecast_ensemble(months_ahead, ensemble_paths, seed) if ensemble_paths else None
+            with stage_timer('lstm_rate_controller', 'result_formatting'):
+                result = self._format_forecast(forecasted_actual, months_ahead, bands)
+            if ensemble_paths:
+                result["ensemble"] = {
+                    "method": "residual_bootstrap",
+                    "paths": ensemble_paths,
+                    "seed": seed,
+                    "quantiles": list(ENSEMBLE_QUANTILES)
+                }
+            else:
+                self._response_cache[cache_key] = result
+            return result
             
-            # Inflation rate array
-            inflation_array = forecast_df[['date', 'YoY_Inflation']].copy()
-            inflation_array.rename(columns={'YoY_Inflation': 'rate'}, inplace=True)
-            inflation_list = inflation_array.to_dict('records')
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "Rate prediction failed",
+                "details": str(e)
+            }
+    
+    def rate_paths(self, months_ahead, paths=None, seed=0, wait=None):
+        """
+        Monthly nominal rate and inflation paths for downstream simulations
+
+        Args:
+            months_ahead (int): Number of months
+            paths (int): None for the point forecast alone, otherwise the
+                number of residual-bootstrap ensemble paths
+            seed (int): Ensemble random seed
+            wait (float): As for predict_rates
+
+        Returns:
+            dict: {"success": True, "paths": (n_paths, months_ahead, 2) array
+            of (Nominal_Rate, YoY_Inflation) in percent, "dates": ['YYYY-MM', ...]},
+            or the predict_rates "training"/error response
+        """
+        try:
+            pending = self._ensure_trained(wait)
+            if pending is not None:
+                return pending
             
+            if paths:
+                rate_paths = self._ensemble_paths(months_ahead, paths, seed)
+            else:
+                rate_paths = self._forecast_trajectory(months_ahead)[np.newaxis, :months_ahead]
+            dates = pd.date_range(start=self.data.index[-1], periods=months_ahead + 1, freq='MS')[1:]
             return {
                 "success": True,
-                "forecast_months": months_ahead,
-                "forecast_start_date": forecast_index[0].strftime('%Y-%m'),
-                "forecast_end_date": forecast_index[-1].strftime('%Y-%m'),
-                "nominal_rates": nominal_rate_list,
-                "inflation_rates": inflation_list,
-                "summary": {
-                    "avg_nominal_rate": float(forecast_df['Nominal_Rate'].mean().round(4)),
-                    "avg_inflation_rate": float(forecast_df['YoY_Inflation'].mean().round(4)),
-                    "min_nominal_rate": float(forecast_df['Nominal_Rate'].min().round(4)),
-                    "max_nominal_rate": float(forecast_df['Nominal_Rate'].max().round(4)),
-                    "min_inflation_rate": float(forecast_df['YoY_Inflation'].min().round(4)),
-                    "max_inflation_rate": float(forecast_df['YoY_Inflation'].max().round(4))
-                }
+                "paths": rate_paths,
+                "dates": list(dates.strftime('%Y-%m'))
             }
             
         except Exception as e:
             return {
                 "success": False,
-                "error": "Rate prediction failed",
+                "error": "Rate path generation failed",
                 "details": str(e)
             }
     
@@ -226,6 +758,11 @@ class LSTMRateController:
         }
         
         status["ready"] = all(status.values())
+        status["model_version"] = self.model_version
+        status["inference_backend"] = 'numpy' if self.numpy_model is not None else 'keras'
+        current_job = self.training_jobs.current
+        status["training"] = current_job.to_dict() if current_job is not None else None
+        status["last_update"] = self.last_update
         
         if self.data is not None:
             status["data_shape"] = self.data.shape
@@ -240,6 +777,7 @@ class LSTMRateController:
             "model_config": {
                 "lookback_months": self.lookback,
                 "default_forecast_months": self.forecast_steps,
-                "variables": self.model_vars
+                "variables": self.model_vars,
+                "hyperparameters": self.hyperparameters
             }
         }
\ No newline at end of file
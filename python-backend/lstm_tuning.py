@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Hyperparameter search for the LSTM rate model.
+
+Runs grid or random search over lookback, LSTM units, learning rate and
+batch size as parallel CPU trials in a process pool. Every trial trains on
+the same 80/10/10 split as LSTMRateController, with early stopping on the
+validation loss (so 'epochs' is searched implicitly, up to --max-epochs),
+and is scored on the test split in original units. Trials are ranked by
+validation RMSE; test metrics are reported but never used for selection.
+
+Outputs:
+    models/lstm/tuning_results.csv        one row per trial (wall time, RMSE, MAE, ...)
+    models/lstm_tuned_hyperparameters.json best config, picked up by LSTMRateController
+
+Usage:
+    python lstm_tuning.py [--search random --trials 12] [--workers N]
+    python lstm_tuning.py --search grid --max-epochs 40
+    python train_lstm_model.py   # then retrain the served model with the tuned config
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+import multiprocessing as mp
+
+import numpy as np
+import pandas as pd
+
+from lstm_model_store import DEFAULT_ARTIFACT_DIR
+from lstm_rate_controller import DEFAULT_HYPERPARAMETERS, DEFAULT_TUNED_CONFIG
+
+SEARCH_SPACE = {
+    'lookback': [6, 12, 18, 24],
+    'lstm_units': [25, 50, 100],
+    'learning_rate': [0.001, 0.005, 0.01],
+    'batch_size': [16, 32, 64],
+}
+MODEL_VARS = ['Nominal_Rate', 'YoY_Inflation']
+DEFAULT_RESULTS_PATH = os.path.join(DEFAULT_ARTIFACT_DIR, 'tuning_results.csv')
+
+
+def grid_configs(space=SEARCH_SPACE):
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+
+
+def random_configs(n_trials, seed=0, space=SEARCH_SPACE):
+    """n_trials distinct configurations sampled from the grid"""
+    grid = grid_configs(space)
+    return random.Random(seed).sample(grid, min(n_trials, len(grid)))
+
+
+def _init_worker():
+    """One TensorFlow thread per trial process, so parallel trials don't oversubscribe the CPU"""
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def run_trial(trial_id, config, data_file, max_epochs, patience, seed):
+    """
+    Train one configuration with early stopping and score it
+
+    Returns:
+        dict: The config plus epochs_run, best_epoch, val_rmse (scaled),
+        test RMSE / MAE per variable in original units, and wall_seconds
+    """
+    start = time.time()
+    result = dict(trial=trial_id, **config)
+    try:
+        import tensorflow as tf
+        from sklearn.preprocessing import MinMaxScaler
+        from lstm_rate_controller import build_rate_model
+        from lstm_windowing import sliding_windows, fit_inputs, validation_inputs
+        from rate_history import load_rate_history
+
+        tf.keras.utils.set_random_seed(seed + trial_id)
+
+        values = load_rate_history(data_file).frame[MODEL_VARS].values
+        scaler = MinMaxScaler(feature_range=(0, 1))
+        scaled = scaler.fit_transform(values)
+        X, y = sliding_windows(scaled, config['lookback'])
+
+        # Same 80/10/10 split as LSTMRateController
+        test_size = int(0.10 * len(X))
+        validation_size = int(0.10 * len(X))
+        train_size = len(X) - test_size - validation_size
+        X_train, y_train = X[:train_size], y[:train_size]
+        X_val, y_val = X[train_size:train_size + validation_size], y[train_size:train_size + validation_size]
+        X_test, y_test = X[train_size + validation_size:], y[train_size + validation_size:]
+
+        model = build_rate_model(config['lookback'], X.shape[2], config['lstm_units'], config['learning_rate'])
+        early_stopping = tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=patience,
+                                                          restore_best_weights=True)
+        history = model.fit(**fit_inputs(X_train, y_train, config['batch_size']), epochs=max_epochs, verbose=0,
+                            validation_data=validation_inputs(X_val, y_val, config['batch_size']),
+                            callbacks=[early_stopping])
+
+        val_loss = history.history['val_loss']
+        predicted = scaler.inverse_transform(model(np.asarray(X_test, dtype=np.float32), training=False).numpy())
+        actual = scaler.inverse_transform(y_test)
+        errors = predicted - actual
+
+        result.update(
+            epochs_run=len(val_loss),
+            best_epoch=int(np.argmin(val_loss)) + 1,
+            val_rmse=float(np.sqrt(np.min(val_loss))),
+            test_rmse_nominal=float(np.sqrt(np.mean(errors[:, 0] ** 2))),
+            test_mae_nominal=float(np.mean(np.abs(errors[:, 0]))),
+            test_rmse_inflation=float(np.sqrt(np.mean(errors[:, 1] ** 2))),
+            test_mae_inflation=float(np.mean(np.abs(errors[:, 1]))),
+            error=None,
+        )
+    except Exception as e:
+        result['error'] = str(e)
+    result['wall_seconds'] = round(time.time() - start, 2)
+    return result
+
+
+def run_search(configs, data_file, workers, max_epochs, patience, seed=0):
+    """Run every config in a spawn-based process pool; returns results sorted by validation RMSE"""
+    results = []
+    context = mp.get_context('spawn')  # TensorFlow is not fork-safe
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as executor:
+        futures = [executor.submit(run_trial, i, config, data_file, max_epochs, patience, seed)
+                   for i, config in enumerate(configs)]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            if result['error']:
+                print(f"[{done}/{len(configs)}] trial {result['trial']} failed: {result['error']}")
+            else:
+                print(f"[{done}/{len(configs)}] trial {result['trial']} {json.dumps({k: result[k] for k in SEARCH_SPACE})} "
+                      f"val_rmse={result['val_rmse']:.4f} epochs={result['epochs_run']} {result['wall_seconds']:.1f}s")
+    return sorted(results, key=lambda r: (r['error'] is not None, r.get('val_rmse', float('inf'))))
+
+
+def best_config(results):
+    """Controller hyperparameters for the best successful trial"""
+    best = next((r for r in results if not r['error']), None)
+    if best is None:
+        return None
+    hyperparameters = {key: best[key] for key in SEARCH_SPACE}
+    # The controller trains for a fixed number of epochs: use where early stopping peaked
+    hyperparameters['epochs'] = best['best_epoch']
+    return {key: hyperparameters.get(key, value) for key, value in DEFAULT_HYPERPARAMETERS.items()}, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hyperparameter search for the LSTM rate model")
+    parser.add_argument('--data', default='ai_model_input_data.csv', help="Path to the rate history CSV")
+    parser.add_argument('--search', choices=['random', 'grid'], default='random')
+    parser.add_argument('--trials', type=int, default=12, help="Configurations to sample (random search)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--max-epochs', type=int, default=60)
+    parser.add_argument('--patience', type=int, default=5, help="Early stopping patience in epochs")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--results', default=DEFAULT_RESULTS_PATH, help="CSV results table")
+    parser.add_argument('--output', default=DEFAULT_TUNED_CONFIG, help="Best config JSON for the controller")
+    args = parser.parse_args()
+
+    configs = grid_configs() if args.search == 'grid' else random_configs(args.trials, args.seed)
+    print(f"Running {len(configs)} trials on {args.workers} worker(s)")
+    start = time.time()
+    results = run_search(configs, args.data, args.workers, args.max_epochs, args.patience, args.seed)
+    elapsed = time.time() - start
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.results)), exist_ok=True)
+    pd.DataFrame(results).to_csv(args.results, index=False)
+    print(f"\n{len(results)} trials in {elapsed:.1f}s; results written to {args.results}")
+
+    selected = best_config(results)
+    if selected is None:
+        print("Error: every trial failed")
+        return 1
+    hyperparameters, best = selected
+    with open(args.output, 'w') as f:
+        json.dump({
+            'hyperparameters': hyperparameters,
+            'trial': {key: value for key, value in best.items() if key not in hyperparameters},
+            'search': args.search,
+            'trials': len(results),
+            'tuned_at': datetime.now(timezone.utc).isoformat(),
+        }, f, indent=2)
+    print(f"Best config (val_rmse={best['val_rmse']:.4f}): {json.dumps(hyperparameters)}")
+    print(f"Written to {args.output}; run train_lstm_model.py to retrain the served model with it")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
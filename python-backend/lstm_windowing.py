@@ -0,0 +1,76 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# --- Zero-Copy Sequence Windowing ---
+
+# Training inputs larger than this are streamed in batches instead of being
+# handed to model.fit as one (copied) array
+STREAMING_MIN_BYTES = 64 * 1024 * 1024
+
+
+def sliding_windows(data, lookback):
+    """
+    Every lookback window of a (rows, features) array and its next row, as strided views
+
+    Returns:
+        tuple: (X, y), X[i] = data[i:i + lookback] and y[i] = data[i + lookback]
+    """
+    data = np.asarray(data)
+    if len(data) <= lookback:
+        return (np.empty((0, lookback, data.shape[1]), dtype=data.dtype),
+                np.empty((0, data.shape[1]), dtype=data.dtype))
+    # sliding_window_view puts the window axis last: (rows - lookback + 1, features, lookback)
+    X = sliding_window_view(data, lookback, axis=0)[:-1].transpose(0, 2, 1)
+    y = data[lookback:]
+    return X, y
+
+
+def window_nbytes(n_windows, lookback, features, dtype=np.float32):
+    """Size of the windows if they were materialised as one array"""
+    return n_windows * lookback * features * np.dtype(dtype).itemsize
+
+
+def window_batches(X, y, batch_size=32, shuffle=False, seed=None, dtype=np.float32):
+    """Yield contiguous (X_batch, y_batch) copies from window views, one batch at a time"""
+    order = np.arange(len(X))
+    if shuffle:
+        np.random.default_rng(seed).shuffle(order)
+    for start in range(0, len(order), batch_size):
+        index = order[start:start + batch_size]
+        if not shuffle:
+            index = slice(index[0], index[-1] + 1)
+        yield np.asarray(X[index], dtype=dtype), np.asarray(y[index], dtype=dtype)
+
+
+def window_dataset(X, y, batch_size=32, shuffle=False, seed=None):
+    """Streaming tf.data.Dataset of (X_batch, y_batch) over window views, reshuffled every epoch"""
+    import tensorflow as tf
+
+    _, lookback, features = X.shape
+    epoch = [0]
+
+    def generate():
+        epoch[0] += 1
+        epoch_seed = None if seed is None else seed + epoch[0]
+        yield from window_batches(X, y, batch_size, shuffle, epoch_seed)
+
+    dataset = tf.data.Dataset.from_generator(
+        generate,
+        output_signature=(tf.TensorSpec([None, lookback, features], tf.float32),
+                          tf.TensorSpec([None, features], tf.float32)))
+    return dataset.prefetch(1)
+
+
+def fit_inputs(X, y, batch_size=32, shuffle=True):
+    """model.fit keyword arguments: one float32 array, or a streaming dataset above STREAMING_MIN_BYTES"""
+    if window_nbytes(*X.shape) < STREAMING_MIN_BYTES:
+        return {'x': np.asarray(X, dtype=np.float32), 'y': np.asarray(y, dtype=np.float32),
+                'batch_size': batch_size, 'shuffle': shuffle}
+    return {'x': window_dataset(X, y, batch_size, shuffle)}
+
+
+def validation_inputs(X, y, batch_size=32):
+    """validation_data for model.fit, streamed on the same rule as fit_inputs"""
+    if window_nbytes(*X.shape) < STREAMING_MIN_BYTES:
+        return (np.asarray(X, dtype=np.float32), np.asarray(y, dtype=np.float32))
+    return window_dataset(X, y, batch_size)
@@ -0,0 +1,239 @@
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import nullcontext
+from time import perf_counter as _perf_counter
+
+# --- Stage Latency Metrics ---
+# Per-stage latency histograms; under gunicorn, workers share them through METRICS_MULTIPROC_DIR
+
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1').lower() not in ('0', 'false', 'no', 'off')
+METRICS_MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR') or None
+METRIC_NAME = 'wealthwise_stage_seconds'
+QUANTILES = (0.5, 0.95, 0.99)
+FLUSH_INTERVAL = 1.0
+
+# Upper bucket bounds in seconds: 10us doubling up to ~42s, then +Inf
+BUCKETS = tuple(1e-5 * 2 ** i for i in range(23))
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in seconds"""
+
+    __slots__ = ('counts', 'total', '_lock')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, _bisect=bisect.bisect_left, _buckets=BUCKETS):
+        index = _bisect(_buckets, seconds)
+        lock = self._lock
+        lock.acquire()
+        self.counts[index] += 1
+        self.total += seconds
+        lock.release()
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self.counts)
+            total = self.total
+        return {'counts': counts, 'sum': total, 'count': sum(counts)}
+
+
+def quantile(snapshot, q):
+    """Quantile estimate from bucket counts, interpolated linearly within the bucket"""
+    count = snapshot['count']
+    if count == 0:
+        return float('nan')
+    rank = q * count
+    cumulative = 0
+    for index, bucket_count in enumerate(snapshot['counts']):
+        if bucket_count and cumulative + bucket_count >= rank:
+            if index == len(BUCKETS):
+                return BUCKETS[-1]
+            lower = BUCKETS[index - 1] if index > 0 else 0.0
+            return lower + (BUCKETS[index] - lower) * (rank - cumulative) / bucket_count
+        cumulative += bucket_count
+    return BUCKETS[-1]
+
+
+def _merge(snapshots):
+    merged = {'counts': [0] * (len(BUCKETS) + 1), 'sum': 0.0, 'count': 0}
+    for snapshot in snapshots:
+        merged['counts'] = [a + b for a, b in zip(merged['counts'], snapshot['counts'])]
+        merged['sum'] += snapshot['sum']
+        merged['count'] += snapshot['count']
+    return merged
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _StageTimer:
+    __slots__ = ('observe', 'start')
+
+    def __init__(self, histogram):
+        self.observe = histogram.observe
+
+    def __enter__(self):
+        self.start = _perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.observe(_perf_counter() - self.start)
+        return False
+
+
+_NULL_TIMER = nullcontext()
+
+
+class MetricsRegistry:
+    """
+    Stage latency histograms keyed by (component, stage)
+
+    Attributes:
+        enabled (bool): When False, timer() is a no-op and nothing is recorded
+        multiproc_dir (str): Shared directory for per-worker snapshots, or None
+    """
+
+    def __init__(self, enabled=METRICS_ENABLED, multiproc_dir=METRICS_MULTIPROC_DIR):
+        self.enabled = enabled
+        self.multiproc_dir = multiproc_dir
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def histogram(self, component, stage):
+        key = (component, stage)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def timer(self, component, stage):
+        """Context manager recording the duration of its block"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self.histogram(component, stage))
+
+    def observe(self, component, stage, seconds):
+        if self.enabled:
+            self.histogram(component, stage).observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    def _local_snapshots(self):
+        return {key: histogram.snapshot() for key, histogram in list(self._histograms.items())}
+
+    def _snapshot_path(self, pid=None):
+        return os.path.join(self.multiproc_dir, f'metrics-{pid or os.getpid()}.json')
+
+    def flush(self, force=False):
+        """Write this process's histograms to the multiprocess directory (throttled)"""
+        if not (self.enabled and self.multiproc_dir):
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < FLUSH_INTERVAL:
+            return
+        self._last_flush = now
+        payload = [[component, stage, snapshot] for (component, stage), snapshot in self._local_snapshots().items()]
+        try:
+            os.makedirs(self.multiproc_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.multiproc_dir, prefix='.tmp-')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self._snapshot_path())
+        except OSError as e:
+            print(f"Warning: Could not write metrics snapshot: {str(e)}")
+
+    def remove_process(self, pid):
+        """Drop an exited worker's snapshot (gunicorn child_exit)"""
+        if self.multiproc_dir:
+            try:
+                os.remove(self._snapshot_path(pid))
+            except OSError:
+                pass
+
+    def collect(self):
+        """
+        Returns:
+            dict: (component, stage) -> snapshot, merged across workers if multiproc_dir is set
+        """
+        if not self.multiproc_dir:
+            return self._local_snapshots()
+
+        self.flush(force=True)
+        groups = {}
+        try:
+            names = [name for name in os.listdir(self.multiproc_dir)
+                     if name.startswith('metrics-') and name.endswith('.json')]
+        except OSError:
+            names = []
+        for name in names:
+            try:
+                with open(os.path.join(self.multiproc_dir, name), 'r') as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for component, stage, snapshot in entries:
+                groups.setdefault((component, stage), []).append(snapshot)
+        return {key: _merge(snapshots) for key, snapshots in groups.items()}
+
+    def summary(self):
+        """count, mean and p50/p95/p99 in milliseconds per component and stage"""
+        result = {}
+        for (component, stage), snapshot in sorted(self.collect().items()):
+            if not snapshot['count']:
+                continue
+            entry = {'count': snapshot['count'], 'mean_ms': round(1000 * snapshot['sum'] / snapshot['count'], 3)}
+            for q in QUANTILES:
+                entry[f'p{int(q * 100)}_ms'] = round(1000 * quantile(snapshot, q), 3)
+            result.setdefault(component, {})[stage] = entry
+        return result
+
+    def render_prometheus(self):
+        """Prometheus text exposition: a histogram plus a quantile summary per stage"""
+        snapshots = sorted(self.collect().items())
+        lines = [
+            f'# HELP {METRIC_NAME} Wall-clock time per request stage',
+            f'# TYPE {METRIC_NAME} histogram',
+        ]
+        for (component, stage), snapshot in snapshots:
+            labels = f'component="{_escape(component)}",stage="{_escape(stage)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS, snapshot['counts']):
+                cumulative += bucket_count
+                lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_bucket{{{labels},le="+Inf"}} {snapshot["count"]}')
+            lines.append(f'{METRIC_NAME}_sum{{{labels}}} {snapshot["sum"]:.9g}')
+            lines.append(f'{METRIC_NAME}_count{{{labels}}} {snapshot["count"]}')
+
+        lines += [
+            f'# HELP {METRIC_NAME}_quantile Stage latency quantiles estimated from the histogram buckets',
+            f'# TYPE {METRIC_NAME}_quantile gauge',
+        ]
+        for (component, stage), snapshot in snapshots:
+            if not snapshot['count']:
+                continue
+            labels = f'component="{_escape(component)}",stage="{_escape(stage)}"'
+            for q in QUANTILES:
+                lines.append(f'{METRIC_NAME}_quantile{{{labels},quantile="{q}"}} {quantile(snapshot, q):.9g}')
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry used by the instrumented components and app.py
+metrics = MetricsRegistry()
+
+
+def stage_timer(component, stage):
+    """Time a block into the process-wide registry (no-op when metrics are disabled)"""
+    return metrics.timer(component, stage)
@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# --- Model Registry ---
+# Models load in background threads, at startup (MODEL_LOADING=eager) or on first use (lazy)
+
+MODEL_LOADING = os.environ.get('MODEL_LOADING', 'eager').lower()
+MODEL_WAIT_SECONDS = float(os.environ.get('MODEL_WAIT_SECONDS', '30'))
+# Retry-After sent with a 503 for a model that is still loading
+RETRY_AFTER_SECONDS = 5
+
+# Load states
+PENDING = 'pending'
+LOADING = 'loading'
+READY = 'ready'
+# Constructed, but its model files were missing (e.g. categorizer.gmm is None)
+UNAVAILABLE = 'unavailable'
+# The loader raised
+FAILED = 'failed'
+
+
+_DEFAULT_WAIT = object()
+
+
+class ModelNotReady(Exception):
+    """Raised when a model is still loading or could not be loaded"""
+
+    def __init__(self, name, state, error=None, retry_after=None):
+        self.name = name
+        self.state = state
+        self.error = error
+        self.retry_after = retry_after
+        super().__init__(f"Model '{name}' is {state}" + (f": {error}" if error else ""))
+
+
+class _Entry:
+    __slots__ = ('name', 'loader', 'check', 'state', 'model', 'error', 'load_seconds', 'done', 'thread')
+
+    def __init__(self, name, loader, check):
+        self.name = name
+        self.loader = loader
+        self.check = check
+        self.state = PENDING
+        self.model = None
+        self.error = None
+        self.load_seconds = None
+        self.done = threading.Event()
+        self.thread = None
+
+
+class ModelRegistry:
+    """
+    Named models loaded in background threads, with per-model readiness
+
+    Attributes:
+        mode (str): 'eager' (start every load on start()) or 'lazy' (load on first get)
+        wait_seconds (float): Default time get() waits for a model that is still loading
+    """
+
+    def __init__(self, mode=MODEL_LOADING, wait_seconds=MODEL_WAIT_SECONDS):
+        if mode not in ('eager', 'lazy'):
+            print(f"Warning: Unknown MODEL_LOADING '{mode}', using 'eager'")
+            mode = 'eager'
+        self.mode = mode
+        self.wait_seconds = wait_seconds
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any], check: Optional[Callable[[Any], bool]] = None):
+        """
+        Args:
+            loader: Builds the model; may call get() for models it depends on
+            check: Returns False if the built model cannot serve requests
+        """
+        self._entries[name] = _Entry(name, loader, check)
+
+    def start(self):
+        """Start loading every model in parallel (eager mode only)"""
+        if self.mode == 'eager':
+            for name in self._entries:
+                self.load(name)
+
+    def load(self, name):
+        """Start loading a model in a background thread, unless it already started"""
+        entry = self._entries[name]
+        with self._lock:
+            if entry.state != PENDING:
+                return
+            entry.state = LOADING
+            entry.thread = threading.Thread(target=self._load, args=(entry,), name=f'load-{name}', daemon=True)
+            entry.thread.start()
+
+    def _load(self, entry):
+        start = time.perf_counter()
+        try:
+            model = entry.loader()
+            if entry.check is not None and not entry.check(model):
+                entry.model, entry.state = model, UNAVAILABLE
+                entry.error = "Model files could not be loaded"
+            else:
+                entry.model, entry.state = model, READY
+        except Exception as e:
+            print(f"Warning: Could not load model '{entry.name}': {str(e)}")
+            entry.error = str(e)
+            entry.state = FAILED
+        finally:
+            entry.load_seconds = round(time.perf_counter() - start, 3)
+            entry.done.set()
+
+    def wait_all(self, timeout=None):
+        """
+        Load every model and join the loader threads, e.g. before a WSGI master forks
+
+        Returns:
+            bool: True if every model is ready
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for name in self._entries:
+            self.wait(name, None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return self.ready
+
+    def wait(self, name, timeout=None):
+        """Load a model if needed and join its loader thread; returns its state"""
+        self.load(name)
+        self._entries[name].thread.join(timeout)
+        return self._entries[name].state
+
+    def get(self, name: str, timeout=_DEFAULT_WAIT, require_ready: bool = True):
+        """
+        The loaded model, starting its load first if it is still pending
+
+        Args:
+            timeout: Seconds to wait while it loads (default wait_seconds,
+                None waits for as long as it takes)
+            require_ready: If False, a model that loaded without its files is
+                returned instead of raising
+
+        Raises:
+            ModelNotReady: Still loading after the timeout, failed, or unavailable
+        """
+        entry = self._entries[name]
+        if entry.state != READY:
+            self.load(name)
+            entry.done.wait(self.wait_seconds if timeout is _DEFAULT_WAIT else timeout)
+        state = entry.state
+        if state == READY or (state == UNAVAILABLE and not require_ready):
+            return entry.model
+        if state == LOADING:
+            raise ModelNotReady(name, state, retry_after=RETRY_AFTER_SECONDS)
+        raise ModelNotReady(name, state, entry.error)
+
+    def loaded(self, name: str):
+        """The model if its load has finished (even unusable), without waiting or triggering a load"""
+        entry = self._entries.get(name)
+        return entry.model if entry is not None and entry.done.is_set() else None
+
+    def proxy(self, name: str):
+        """Stand-in resolving attribute access to the loaded model"""
+        return ModelProxy(self, name)
+
+    def status(self):
+        """
+        Returns:
+            dict: Per model: state, load_seconds and error
+        """
+        return {
+            name: {'state': entry.state, 'load_seconds': entry.load_seconds, 'error': entry.error}
+            for name, entry in self._entries.items()
+        }
+
+    @property
+    def ready(self):
+        return all(entry.state == READY for entry in self._entries.values())
+
+
+class ModelProxy:
+    """Module-level stand-in for a registered model (unusable models included, for the `if not x.model` checks)"""
+
+    __slots__ = ('_registry', '_name')
+
+    def __init__(self, registry, name):
+        object.__setattr__(self, '_registry', registry)
+        object.__setattr__(self, '_name', name)
+
+    def __getattr__(self, attribute):
+        return getattr(self._registry.get(self._name, require_ready=False), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self._registry.get(self._name, require_ready=False), attribute, value)
+
+    def __repr__(self):
+        return f"<ModelProxy '{self._name}'>"
@@ -0,0 +1,117 @@
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List
+
+# --- Multi-Process Batch Scoring ---
+# Forked workers inherit the loaded models copy-on-write; spawned workers load them once each
+
+DEFAULT_WORKERS = int(os.environ.get('SCORING_WORKERS', '0'))
+DEFAULT_MIN_PARALLEL_BATCH = int(os.environ.get('PARALLEL_MIN_BATCH', '20000'))
+MIN_SHARD_SIZE = 2000
+
+# Models used inside worker processes
+_worker_models: Dict[str, Any] = {}
+
+
+def _load_worker_models():
+    """Initializer for spawned workers: load each model once per process"""
+    if 'categorizer' not in _worker_models:
+        from customer_categorizer import NewCustomerCategorizer
+        _worker_models['categorizer'] = NewCustomerCategorizer()
+    if 'expense_predictor' not in _worker_models:
+        from life_stage_expense_prediction import ExpensePredictor
+        _worker_models['expense_predictor'] = ExpensePredictor()
+
+
+def _ping(_=None):
+    return os.getpid()
+
+
+def _categorize_shard(records, options):
+    return _worker_models['categorizer'].preprocess_and_categorize(records, **options)
+
+
+def _expense_shard(customers, event_types):
+    return _worker_models['expense_predictor'].predict_event_expenses(customers, event_types)
+
+
+class ParallelScorer:
+    """Shards scoring batches of at least min_batch_size across worker processes"""
+
+    def __init__(self, categorizer, expense_predictor, workers=DEFAULT_WORKERS,
+                 min_batch_size=DEFAULT_MIN_PARALLEL_BATCH, start_method=None):
+        self.categorizer = categorizer
+        self.expense_predictor = expense_predictor
+        self.workers = workers
+        self.min_batch_size = min_batch_size
+        self._executor = None
+
+        if workers > 1:
+            if start_method is None:
+                start_method = 'fork' if 'fork' in mp.get_all_start_methods() else 'spawn'
+            self.start_method = start_method
+            self._start()
+
+    def _start(self):
+        context = mp.get_context(self.start_method)
+        initializer = None
+        if self.start_method == 'fork':
+            # Children inherit these objects copy-on-write at fork time
+            _worker_models['categorizer'] = self.categorizer
+            _worker_models['expense_predictor'] = self.expense_predictor
+        else:
+            initializer = _load_worker_models
+
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                             initializer=initializer)
+        # Start every worker now, before the server starts request threads
+        list(self._executor.map(_ping, range(self.workers)))
+
+    @property
+    def enabled(self):
+        return self._executor is not None
+
+    def _shards(self, items):
+        shard_size = max(MIN_SHARD_SIZE, -(-len(items) // (self.workers * 4)))
+        return [items[i:i + shard_size] for i in range(0, len(items), shard_size)]
+
+    def _use_pool(self, items):
+        return self.enabled and len(items) >= self.min_batch_size
+
+    def categorize(self, records: List[Dict[str, Any]], include_posteriors: bool = False, **options):
+        """
+        Same results as categorizer.preprocess_and_categorize, in input order
+        (options: include_products, top_segments, max_products)
+        """
+        options['include_posteriors'] = include_posteriors
+        if not self._use_pool(records):
+            return self.categorizer.preprocess_and_categorize(records, **options)
+
+        shards = self._shards(records)
+        results = []
+        for shard_results in self._executor.map(_categorize_shard, shards, [options] * len(shards)):
+            results.extend(shard_results)
+        return results
+
+    def predict_event_expenses(self, customers: List[Dict[str, Any]], event_types: List[str]):
+        """Same results as expense_predictor.predict_event_expenses, in input order"""
+        if not self._use_pool(customers):
+            return self.expense_predictor.predict_event_expenses(customers, event_types)
+
+        shards = self._shards(customers)
+        results = []
+        for shard_results in self._executor.map(_expense_shard, shards, [event_types] * len(shards)):
+            results.extend(shard_results)
+        return results
+
+    def reset_after_fork(self):
+        """Start a fresh pool in a forked server worker (the inherited one's threads did not survive)"""
+        if self._executor is not None:
+            self._executor = None
+            self._start()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
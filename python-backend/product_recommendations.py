@@ -0,0 +1,96 @@
+import json
+import os
+from typing import Dict, Any, List
+
+import numpy as np
+
+# --- Segment Product Recommendation Index ---
+# N_recommender.json as a (K, P) matrix of per-segment product rank weights, blended by GMM posterior
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'public',
+                                    'N_recommender.json')
+# Segments blended per customer and products returned
+DEFAULT_TOP_SEGMENTS = 2
+DEFAULT_MAX_PRODUCTS = 5
+
+
+def _category_key(name):
+    """Category names differ in spacing ('Mid-Career/Transitional' vs 'Mid-Career / Transitional')"""
+    return ' '.join(name.replace('/', ' / ').split()).lower()
+
+
+class ProductRecommendationIndex:
+    """
+    Products per Segment_ID, blended by GMM posterior
+
+    Attributes:
+        products (list): Distinct product dicts (name, description), P entries
+        scores (np.ndarray): (K, P) rank weights of each segment's products
+    """
+
+    def __init__(self, archetype_map: Dict[int, str], catalog_path: str = DEFAULT_CATALOG_PATH):
+        with open(catalog_path, 'r') as f:
+            catalog = json.load(f)
+        by_category = {_category_key(cluster['category']): cluster.get('products', [])
+                       for cluster in catalog.get('clusters', [])}
+
+        n_segments = max(archetype_map) + 1
+        self.products: List[Dict[str, Any]] = []
+        product_ids = {}
+        rows = []
+        for segment_id in range(n_segments):
+            products = by_category.get(_category_key(archetype_map.get(segment_id, '')))
+            if products is None:
+                print(f"Warning: No products for segment {segment_id} ({archetype_map.get(segment_id)})")
+                products = []
+            ids = []
+            for product in products:
+                if product['name'] not in product_ids:
+                    product_ids[product['name']] = len(self.products)
+                    self.products.append({'name': product['name'], 'description': product.get('description', '')})
+                ids.append(product_ids[product['name']])
+            rows.append(ids)
+
+        self.scores = np.zeros((n_segments, len(self.products)))
+        for segment_id, ids in enumerate(rows):
+            if ids:
+                weights = np.arange(len(ids), 0, -1, dtype=np.float64)
+                self.scores[segment_id, ids] = weights / weights.sum()
+
+    @property
+    def n_segments(self):
+        return len(self.scores)
+
+    def recommend(self, posteriors: np.ndarray, top_segments: int = DEFAULT_TOP_SEGMENTS,
+                  max_products: int = DEFAULT_MAX_PRODUCTS) -> List[List[Dict[str, Any]]]:
+        """
+        Ranked products per customer from the renormalized top_segments of its (K,) posterior row
+
+        Returns:
+            list: Per customer, up to max_products dicts with name, description,
+            score and the Segment_ID contributing most to it
+        """
+        posteriors = np.asarray(posteriors, dtype=np.float64)
+        k = max(1, min(top_segments, self.n_segments))
+        top = np.argsort(-posteriors, axis=1, kind='stable')[:, :k]                   # (n, k)
+        weights = np.take_along_axis(posteriors, top, axis=1)
+        weights /= np.maximum(weights.sum(axis=1, keepdims=True), 1e-300)
+
+        contributions = weights[:, :, np.newaxis] * self.scores[top]                  # (n, k, P)
+        scores = contributions.sum(axis=1)                                            # (n, P)
+        source = np.take_along_axis(top, contributions.argmax(axis=1), axis=1)       # (n, P)
+
+        n_products = min(max_products, scores.shape[1])
+        order = np.argsort(-scores, axis=1, kind='stable')[:, :n_products]
+        # Scores that round to 0 come from segments with negligible posterior and are dropped
+        ranked_scores = np.round(np.take_along_axis(scores, order, axis=1), 6)
+        ranked_source = np.take_along_axis(source, order, axis=1)
+
+        names = [product['name'] for product in self.products]
+        descriptions = [product['description'] for product in self.products]
+        return [
+            [{'name': names[p], 'description': descriptions[p], 'score': score, 'segment_id': segment}
+             for p, score, segment in zip(row_products, row_scores, row_sources) if score > 0]
+            for row_products, row_scores, row_sources in zip(order.tolist(), ranked_scores.tolist(),
+                                                             ranked_source.tolist())
+        ]
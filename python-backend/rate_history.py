@@ -0,0 +1,147 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from lstm_model_store import file_sha256
+
+# --- Binary Rate History Cache ---
+# Memory-mapped .npy copy of the rate CSV (values + months since 1970-01), rebuilt when its hash changes
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'rate_history')
+CACHE_FORMAT_VERSION = 2
+
+
+class RateHistory:
+    """
+    Rate history loaded from the binary cache (or the CSV on a cache miss)
+
+    Attributes:
+        frame (pd.DataFrame): As pd.read_csv(path, index_col='Date', parse_dates=True) returns it
+        sha256 (str): Content hash of the CSV
+        from_cache (bool): False if the CSV was parsed on this load
+    """
+
+    def __init__(self, frame, sha256, from_cache):
+        self.frame = frame
+        self.sha256 = sha256
+        self.from_cache = from_cache
+
+
+def _cache_name(csv_path):
+    return os.path.splitext(os.path.basename(csv_path))[0]
+
+
+def _frame_from_arrays(values, months, columns, index_dtype):
+    index = pd.DatetimeIndex(months.astype('datetime64[M]').astype(index_dtype), name='Date')
+    return pd.DataFrame(values, index=index, columns=columns, copy=False)
+
+
+def _months_since_epoch(index):
+    """int64 months since 1970-01, or None if any date is not the first of a month"""
+    months = index.values.astype('datetime64[M]')
+    if not np.array_equal(months.astype(index.values.dtype), index.values):
+        return None
+    return months.astype(np.int64)
+
+
+class RateHistoryCache:
+    """Reads and maintains the binary cache for one rate history CSV"""
+
+    def __init__(self, csv_path, cache_dir=DEFAULT_CACHE_DIR):
+        self.csv_path = csv_path
+        self.cache_dir = cache_dir
+        name = _cache_name(csv_path)
+        self.values_path = os.path.join(cache_dir, f'{name}.values.npy')
+        self.months_path = os.path.join(cache_dir, f'{name}.months.npy')
+        self.meta_path = os.path.join(cache_dir, f'{name}.meta.json')
+
+    def _read_meta(self):
+        try:
+            with open(self.meta_path, 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('format') != CACHE_FORMAT_VERSION:
+            return None
+        if not (os.path.exists(self.values_path) and os.path.exists(self.months_path)):
+            return None
+        return meta
+
+    def _atomic_write(self, path, writer, suffix=''):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.tmp-', suffix=suffix)
+        os.close(fd)
+        try:
+            writer(tmp_path)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _write(self, frame, months, stat, sha256):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._atomic_write(self.values_path, lambda p: np.save(p, np.ascontiguousarray(frame.values)), suffix='.npy')
+        self._atomic_write(self.months_path, lambda p: np.save(p, months), suffix='.npy')
+        self._write_meta({
+            'format': CACHE_FORMAT_VERSION,
+            'columns': list(frame.columns),
+            # read_csv's datetime resolution differs between pandas versions
+            'index_dtype': str(frame.index.dtype),
+            'rows': len(frame),
+            'csv_size': stat.st_size,
+            'csv_mtime_ns': stat.st_mtime_ns,
+            'csv_sha256': sha256,
+        })
+
+    def _write_meta(self, meta):
+        def writer(path):
+            with open(path, 'w') as f:
+                json.dump(meta, f, indent=2)
+        self._atomic_write(self.meta_path, writer)
+
+    def load(self):
+        """
+        Returns:
+            RateHistory: From the cache when it matches the CSV, otherwise parsed (and the cache rewritten)
+        """
+        stat = os.stat(self.csv_path)
+        meta = self._read_meta()
+        sha256 = None
+
+        if meta is not None:
+            unchanged = meta['csv_size'] == stat.st_size and meta['csv_mtime_ns'] == stat.st_mtime_ns
+            if not unchanged:
+                # Touched but possibly identical (e.g. a fresh checkout): re-hash before rebuilding
+                sha256 = file_sha256(self.csv_path)
+                if sha256 == meta['csv_sha256']:
+                    meta.update(csv_size=stat.st_size, csv_mtime_ns=stat.st_mtime_ns)
+                    try:
+                        self._write_meta(meta)
+                    except OSError:
+                        pass
+                    unchanged = True
+            if unchanged:
+                values = np.load(self.values_path, mmap_mode='r')
+                months = np.load(self.months_path, mmap_mode='r')
+                return RateHistory(_frame_from_arrays(values, months, meta['columns'], meta['index_dtype']),
+                                   meta['csv_sha256'], from_cache=True)
+
+        frame = pd.read_csv(self.csv_path, index_col='Date', parse_dates=True)
+        sha256 = sha256 or file_sha256(self.csv_path)
+
+        # Only all-float histories with month-start dates fit the binary layout
+        months = _months_since_epoch(frame.index)
+        if months is not None and all(np.issubdtype(dtype, np.floating) for dtype in frame.dtypes):
+            try:
+                self._write(frame, months, stat, sha256)
+            except OSError as e:
+                print(f"Warning: Could not write rate history cache: {str(e)}")
+        return RateHistory(frame, sha256, from_cache=False)
+
+
+def load_rate_history(csv_path, cache_dir=DEFAULT_CACHE_DIR):
+    """Load the rate history CSV through its binary cache (see RateHistoryCache)"""
+    return RateHistoryCache(csv_path, cache_dir).load()
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# --- Response Cache ---
+# Keyed on the fields the models consume (customer_features.consumed_fields); cleared when models/ changes
+
+DEFAULT_MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+DEFAULT_TTL_SECONDS = float(os.environ.get('RESPONSE_CACHE_TTL', '600'))
+DEFAULT_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '10000'))
+DEFAULT_MAX_BYTES = int(float(os.environ.get('RESPONSE_CACHE_MAX_MB', '64')) * 1024 * 1024)
+
+
+def cache_key(*parts):
+    """Canonical hash of JSON-serialisable key parts"""
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def models_fingerprint(models_dir):
+    """(path, mtime, size) of every file under models_dir"""
+    entries = []
+    for root, _, files in os.walk(models_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
+
+class ResponseCache:
+    """Thread-safe LRU response cache with a TTL and an entry and JSON-byte budget"""
+
+    def __init__(self, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_bytes=DEFAULT_MAX_BYTES, models_dir=DEFAULT_MODELS_DIR, check_interval=2.0,
+                 clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.models_dir = models_dir
+        self.check_interval = check_interval
+        self._clock = clock
+
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._models_fingerprint = models_fingerprint(models_dir)
+        self._next_models_check = clock() + check_interval
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _check_models(self, now):
+        """Clear everything if model files changed (checked at most every check_interval)"""
+        if now < self._next_models_check:
+            return
+        self._next_models_check = now + self.check_interval
+        fingerprint = models_fingerprint(self.models_dir)
+        if fingerprint != self._models_fingerprint:
+            self._models_fingerprint = fingerprint
+            self._entries.clear()
+            self._bytes = 0
+            self.invalidations += 1
+
+    def get(self, key):
+        now = self._clock()
+        with self._lock:
+            self._check_models(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, size, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        size = len(json.dumps(value, separators=(',', ':'), default=str))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+
+            self._entries[key] = (self._clock() + self.ttl_seconds, size, value)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,66 @@
+import numpy as np
+from typing import Dict, Any, List
+
+# --- Synthetic Customer Profiles ---
+# NEW_CUSTOMERS_DATA-schema profiles for benchmarks and tests (plausible SGD ranges, no real data)
+
+ASSET_TYPES = ['Residential Property', 'Stocks/Bonds', 'Bank Savings', 'Rental Property', 'CPF']
+LIABILITY_TYPES = ['Mortgage', 'Loan', 'Credit Card']
+MARITAL_STATUSES = ['Single', 'Married', 'Divorced', 'Widowed']
+GENDERS = ['Male', 'Female']
+
+
+def generate_profiles(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Generate n synthetic customer profiles, reproducible for a given seed"""
+    rng = np.random.default_rng(seed)
+    ages = rng.integers(21, 75, size=n)
+    incomes = np.round(rng.lognormal(8.6, 0.5, size=n)).astype(int)
+    asset_counts = rng.integers(0, 4, size=n)
+    liability_counts = rng.integers(0, 3, size=n)
+    child_counts = rng.integers(0, 4, size=n)
+    marital = rng.choice(MARITAL_STATUSES, size=n, p=[0.4, 0.45, 0.1, 0.05])
+    genders = rng.choice(GENDERS, size=n)
+
+    profiles = []
+    for idx in range(n):
+        assets = []
+        for _ in range(asset_counts[idx]):
+            asset_type = ASSET_TYPES[rng.integers(len(ASSET_TYPES))]
+            assets.append({
+                "Asset Type": asset_type,
+                "Current Value": int(rng.integers(5_000, 2_000_000)),
+                "Return on Investment": round(float(rng.uniform(0.0, 0.08)), 4),
+            })
+        liabilities = []
+        for _ in range(liability_counts[idx]):
+            liabilities.append({
+                "Liability Type": LIABILITY_TYPES[rng.integers(len(LIABILITY_TYPES))],
+                "Current Value": int(rng.integers(1_000, 1_200_000)),
+            })
+        income = [{"Income_Type": "Active", "Amount": int(incomes[idx]), "Frequency": "Monthly"}]
+        if rng.random() < 0.2:
+            income.append({"Income_Type": "Passive", "Amount": int(rng.integers(200, 5_000)), "Frequency": "Monthly"})
+            rng.shuffle(income)
+
+        total_assets = sum(a["Current Value"] for a in assets)
+        total_liabilities = sum(l["Current Value"] for l in liabilities)
+        annual_income = int(incomes[idx]) * 12
+        profiles.append({
+            "Customer_ID": 100000 + idx,
+            "Personal Details": {
+                "Age": int(ages[idx]),
+                "Gender": str(genders[idx]),
+                "Marital Status": str(marital[idx]),
+            },
+            "Dependents": [{"Relationship": "Child"} for _ in range(child_counts[idx])],
+            "Financial Details": {
+                "Assets": assets,
+                "Liabilities": liabilities,
+                "Income": income,
+                "Derived": {
+                    "Total_Networth": total_assets - total_liabilities,
+                    "Net_Cashflow": int(annual_income * rng.uniform(-0.1, 0.5)),
+                },
+            },
+        })
+    return profiles
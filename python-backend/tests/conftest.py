@@ -0,0 +1,64 @@
+import os
+import shutil
+
+import pytest
+
+from synthetic_profiles import generate_profiles
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session', autouse=True)
+def backend_cwd():
+    """Model paths such as ./models/life_stage/ are relative to python-backend"""
+    previous = os.getcwd()
+    os.chdir(BACKEND_DIR)
+    yield
+    os.chdir(previous)
+
+
+@pytest.fixture(scope='session')
+def profiles():
+    """Synthetic profiles in the NEW_CUSTOMERS_DATA schema (fixed seed)"""
+    return generate_profiles(3000)
+
+
+@pytest.fixture(scope='session')
+def categorizer(backend_cwd):
+    from customer_categorizer import NewCustomerCategorizer
+    return NewCustomerCategorizer()
+
+
+@pytest.fixture(scope='session')
+def expense_predictor(backend_cwd):
+    from life_stage_expense_prediction import ExpensePredictor
+    return ExpensePredictor()
+
+
+# Smallest LSTM that still trains end to end, for controller tests
+TINY_HYPERPARAMETERS = {'lstm_units': 4, 'epochs': 1}
+
+
+@pytest.fixture
+def rate_csv(tmp_path, monkeypatch):
+    """Copy of the rate history CSV, with its binary cache under tmp_path"""
+    import lstm_rate_controller
+    import rate_history
+    cache_dir = str(tmp_path / 'rate_cache')
+    monkeypatch.setattr(lstm_rate_controller, 'load_rate_history',
+                        lambda path: rate_history.load_rate_history(path, cache_dir))
+    path = tmp_path / 'rates.csv'
+    shutil.copy(os.path.join(BACKEND_DIR, 'ai_model_input_data.csv'), path)
+    return str(path)
+
+
+@pytest.fixture
+def make_controller(rate_csv, tmp_path):
+    """Builds LSTMRateControllers over rate_csv with a tmp artifact dir and tiny hyperparameters"""
+    from lstm_rate_controller import LSTMRateController
+
+    def make(**hyperparameters):
+        return LSTMRateController(rate_csv, artifact_dir=str(tmp_path / 'lstm'),
+                                  hyperparameters=dict(TINY_HYPERPARAMETERS, **hyperparameters),
+                                  tuned_config=str(tmp_path / 'no_tuned_config.json'))
+    return make
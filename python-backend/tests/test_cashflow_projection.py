@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from cashflow_projection import CashflowProjector, sample_months
+
+
+class StubRates:
+    model_version = 'stub'
+
+    def rate_paths(self, months_ahead, paths=None, seed=0, wait=None):
+        n_paths = paths or 1
+        return {
+            "success": True,
+            "paths": np.tile([3.0, 2.0], (n_paths, months_ahead, 1)),
+            "dates": [f"2030-{m + 1:02d}" if m < 12 else f"m{m}" for m in range(months_ahead)],
+        }
+
+
+class StubExpense:
+    model = True
+
+    def predict_batch(self, customers, event_types):
+        return np.full((len(customers), len(event_types)), 500.0)
+
+
+@pytest.mark.parametrize('months, expected', [(6, [5]), (12, [11]), (30, [11, 23, 29]), (36, [11, 23, 35])])
+def test_yearly_sample_ends_on_the_last_month(months, expected):
+    assert sample_months(months).tolist() == expected
+    assert sample_months(months, 'monthly').tolist() == list(range(months))
+
+
+def test_short_horizon_reports_the_final_month(profiles):
+    result = CashflowProjector(StubRates(), StubExpense()).project_customers(profiles[:2], months=6)
+    assert result["success"]
+    assert result["dates"] == ["2030-06"]
+    baseline = result["results"][0]["scenarios"]["baseline"]
+    for name in ('balance', 'real_balance', 'net_worth', 'real_net_worth'):
+        assert len(baseline[name]) == 1
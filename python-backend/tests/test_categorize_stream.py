@@ -0,0 +1,34 @@
+import json
+
+
+def test_bad_lines_yield_errors_in_order(categorizer, profiles):
+    records = profiles[:7]
+    lines = [json.dumps(record) for record in records[:3]]
+    lines += ['{"Customer_ID": "broken', '', '[1, 2]']
+    lines += [json.dumps(record) for record in records[3:]]
+    lines.append(json.dumps({'Customer_ID': 'C-missing'}))
+    stream = [(line + '\n').encode('utf-8') for line in lines]
+
+    results = list(categorizer.categorize_stream(stream, chunk_size=2))
+    expected = categorizer.preprocess_and_categorize(records)
+
+    # Blank lines are skipped; every other line yields exactly one entry, in order
+    assert len(results) == len(records) + 3
+    assert results[:3] == expected[:3]
+    assert results[3]['line'] == 4 and results[3]['error'].startswith("Invalid JSON")
+    assert results[4] == {'Customer_ID': 'N/A', 'line': 6, 'error': "Invalid customer data format"}
+    assert results[5:9] == expected[3:]
+    assert results[9]['Customer_ID'] == 'C-missing' and results[9]['line'] == 11
+    assert results[9]['error'].startswith("Categorization failed")
+
+
+def test_stream_route(profiles):
+    import app
+    body = '\n'.join([json.dumps(profiles[0]), 'not json', json.dumps(profiles[1])]) + '\n'
+    response = app.app.test_client().post('/api/categorize/stream?chunk_size=1', data=body,
+                                          content_type='application/x-ndjson')
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [result['Customer_ID'] for result in results] == [profiles[0]['Customer_ID'], 'N/A',
+                                                             profiles[1]['Customer_ID']]
+    assert 'error' in results[1]
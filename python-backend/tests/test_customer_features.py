@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+import customer_categorizer
+import life_stage_expense_prediction
+from customer_categorizer import FEATURE_NAMES, build_feature_matrix
+from customer_features import (CACHED_BATCH_LIMIT, CustomerFeatures, extract_customer_columns,
+                               features_to_columns, flatten_customer_records)
+from life_stage_expense_prediction import (EVENT_TYPES, TRAINING_FEATURE_ORDER, build_event_feature_matrix,
+                                           event_matrix_from_columns)
+
+
+def test_categorizer_matrix_matches_per_record(profiles):
+    reference = pd.DataFrame([customer_categorizer.feature_engineer_new_record(record) for record in profiles],
+                             columns=FEATURE_NAMES).to_numpy(dtype=np.float64)
+    np.testing.assert_array_equal(build_feature_matrix(profiles), reference)
+
+
+def test_expense_matrix_matches_per_record(profiles):
+    records = profiles[:500]
+    reference = np.vstack([
+        life_stage_expense_prediction.feature_engineer_new_record(record, event_type)[TRAINING_FEATURE_ORDER]
+        .to_numpy(dtype=np.float64)
+        for record in records for event_type in EVENT_TYPES
+    ])
+    np.testing.assert_array_equal(build_event_feature_matrix(records, EVENT_TYPES),
+                                  np.nan_to_num(reference, nan=0.0, posinf=0.0, neginf=0.0))
+
+
+def test_cached_records_match_columnar(profiles):
+    records = profiles[:1000] + life_stage_expense_prediction.NEW_CUSTOMERS_DATA
+    columnar = flatten_customer_records(records)
+    cached = features_to_columns([CustomerFeatures.from_profile(record) for record in records])
+
+    np.testing.assert_array_equal(customer_categorizer.feature_matrix_from_columns(cached),
+                                  customer_categorizer.feature_matrix_from_columns(columnar))
+    np.testing.assert_array_equal(event_matrix_from_columns(cached, EVENT_TYPES),
+                                  event_matrix_from_columns(columnar, EVENT_TYPES))
+
+
+def test_small_batches_use_the_cache_with_identical_columns(profiles):
+    records = profiles[:CACHED_BATCH_LIMIT]
+    first = extract_customer_columns(records)
+    # Second call is served from the feature cache
+    second = extract_customer_columns(records)
+    columnar = flatten_customer_records(records)
+    for key, values in columnar.items():
+        np.testing.assert_array_equal(first[key], values)
+        np.testing.assert_array_equal(second[key], values)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from expense_inference import FoldedMLP
+from life_stage_expense_prediction import EVENT_TYPES, TRAINING_FEATURE_ORDER, build_event_feature_matrix
+
+
+@pytest.fixture(scope='module')
+def features(profiles):
+    return build_event_feature_matrix(profiles, EVENT_TYPES)
+
+
+@pytest.fixture(scope='module')
+def reference(expense_predictor, features):
+    model, scaler = expense_predictor.model, expense_predictor.scaler
+    return model.predict(scaler.transform(pd.DataFrame(features, columns=TRAINING_FEATURE_ORDER)))
+
+
+def relative_difference(values, reference):
+    return np.max(np.abs(values - reference) / np.maximum(np.abs(reference), 1))
+
+
+def test_served_engine_matches_sklearn(expense_predictor, features, reference):
+    # The engine as loaded by ExpensePredictor: the exported .npz or an in-memory fold
+    assert relative_difference(expense_predictor.engine.predict(features), reference) < 1e-9
+
+
+def test_folded_engine_matches_sklearn(expense_predictor, features, reference):
+    engine = FoldedMLP.from_sklearn(expense_predictor.model, expense_predictor.scaler)
+    assert relative_difference(engine.predict(features), reference) < 1e-9
+    assert relative_difference(engine.predict(features.astype(np.float32)), reference) < 1e-4
+
+
+def test_export_round_trip(expense_predictor, features, tmp_path):
+    engine = FoldedMLP.from_sklearn(expense_predictor.model, expense_predictor.scaler, fingerprint='abc')
+    path = tmp_path / 'folded.npz'
+    engine.save(path)
+    loaded = FoldedMLP.load(path)
+    assert loaded.fingerprint == 'abc'
+    np.testing.assert_array_equal(loaded.predict(features), engine.predict(features))
@@ -0,0 +1,33 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from customer_categorizer import FEATURE_NAMES, build_feature_matrix
+from gmm_scoring import GMMScoringEngine
+
+MODEL_DIR = os.path.join('models', 'cluster')
+
+
+@pytest.fixture(scope='module')
+def models():
+    return (joblib.load(os.path.join(MODEL_DIR, 'gmm_k8_segmenter.joblib')),
+            joblib.load(os.path.join(MODEL_DIR, 'scaler_transform.joblib')))
+
+
+def test_engine_matches_sklearn(models, profiles):
+    gmm, scaler = models
+    X = build_feature_matrix(profiles)
+    scaled = scaler.transform(pd.DataFrame(X, columns=FEATURE_NAMES))
+
+    # Small blocks so the batch also crosses block boundaries
+    result = GMMScoringEngine(gmm, scaler, block_size=1000).score(
+        X, return_posteriors=True, return_log_likelihood=True)
+
+    np.testing.assert_array_equal(result['segment_ids'], gmm.predict(scaled))
+    posteriors = gmm.predict_proba(scaled)
+    np.testing.assert_allclose(result['posteriors'], posteriors, rtol=0, atol=1e-8)
+    np.testing.assert_allclose(result['confidence'], posteriors.max(axis=1), rtol=0, atol=1e-8)
+    np.testing.assert_allclose(result['log_likelihood'], gmm.score_samples(scaled), rtol=1e-9)
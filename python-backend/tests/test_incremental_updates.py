@@ -0,0 +1,90 @@
+import pandas as pd
+import pytest
+
+import lstm_rate_controller
+
+
+@pytest.fixture
+def history(rate_csv):
+    """The rate history rows, and a writer that replaces rate_csv with some of them"""
+    rows = pd.read_csv(rate_csv)
+
+    def write(frame):
+        frame.to_csv(rate_csv, index=False)
+    return rows, write
+
+
+@pytest.fixture
+def trained(make_controller, history, monkeypatch):
+    """A full fit on all but the last 6 months, stored in the tmp artifact dir"""
+    monkeypatch.setattr(lstm_rate_controller, 'DRIFT_TOLERANCE', float('inf'))
+    rows, write = history
+    write(rows[:-6])
+    controller = make_controller()
+    controller.train_and_save()
+    assert controller.last_update['kind'] == 'full'
+    return controller.model_store.read_manifest()
+
+
+def update(make_controller):
+    controller = make_controller()
+    manifest = controller.train_and_save()
+    return controller.last_update, manifest
+
+
+def test_appended_months_update_incrementally(make_controller, history, trained):
+    rows, write = history
+    write(rows[:-3])
+    last_update, manifest = update(make_controller)
+
+    assert last_update['kind'] == 'incremental' and last_update['new_rows'] == 3
+    assert manifest['incremental_updates'] == 1
+    assert manifest['base_version'] == trained['model_version']
+    assert manifest['data_rows'] == len(rows) - 3
+    assert manifest['baseline_error'] == trained['baseline_error']
+
+
+def test_edited_history_retrains(make_controller, history, trained):
+    rows, write = history
+    edited = rows[:-3].copy()
+    edited.loc[10, 'Nominal_Rate'] += 0.25
+    write(edited)
+    last_update, manifest = update(make_controller)
+
+    assert last_update['kind'] == 'full'
+    assert last_update['reason'] == "history changed, not just appended"
+    assert manifest['incremental_updates'] == 0
+
+
+def test_out_of_range_month_retrains(make_controller, history, trained):
+    rows, write = history
+    extended = rows[:-5].copy()
+    extended.loc[extended.index[-1], 'Nominal_Rate'] = 1000.0
+    write(extended)
+    last_update, _ = update(make_controller)
+
+    assert last_update['kind'] == 'full'
+    assert last_update['reason'] == "new data outside the scaler's fitted range"
+
+
+def test_drift_retrains(make_controller, history, trained, monkeypatch):
+    monkeypatch.setattr(lstm_rate_controller, 'DRIFT_TOLERANCE', 0.0)
+    rows, write = history
+    write(rows[:-3])
+    last_update, _ = update(make_controller)
+
+    assert last_update['kind'] == 'full'
+    assert last_update['reason'].startswith("error on new data")
+
+
+def test_update_limit_forces_full_fit(make_controller, history, trained, monkeypatch):
+    monkeypatch.setattr(lstm_rate_controller, 'MAX_INCREMENTAL_UPDATES', 1)
+    rows, write = history
+    write(rows[:-3])
+    assert update(make_controller)[0]['kind'] == 'incremental'
+
+    write(rows)
+    last_update, manifest = update(make_controller)
+    assert last_update['kind'] == 'full'
+    assert last_update['reason'] == "1 incremental updates since the last full fit"
+    assert manifest['incremental_updates'] == 0
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from insurance_gap import SCENARIO_RATE_DEFAULTS, scenario_rates, simulate, simulator_inputs
+
+
+def js_balance_at_death(customer, death_age, rates=SCENARIO_RATE_DEFAULTS):
+    """The year-by-year loop of bank_balance_calculator.js, for one customer and death age"""
+    balance = customer['initial_balance']
+    for year in range(int(death_age - customer['current_age']) + 1):
+        age = customer['current_age'] + year
+        alive = age < death_age
+        active = 0.0
+        if alive and age < rates['retirement_age']:
+            active = 12 * customer['monthly_active_income'] * (1 + rates['active_income_growth']) ** year
+        passive = 12 * customer['monthly_passive_income'] * (1 + rates['passive_income_growth']) ** year
+        expense = 12 * customer['monthly_expense'] * (1 + rates['expense_inflation']) ** year
+        savings = 12 * customer['monthly_savings'] if alive else 0.0
+        net = active + passive + savings - expense
+        if net < 0:
+            balance += net
+        balance *= 1 + rates['bank_growth_rate']
+    return balance
+
+
+def test_balance_at_death_matches_js_loop():
+    items = [
+        {'current_age': 30, 'monthly_active_income': 9000, 'monthly_passive_income': 500,
+         'monthly_expense': 8000, 'initial_balance': 120000},
+        {'current_age': 45, 'monthly_active_income': 3000, 'monthly_passive_income': 0,
+         'monthly_expense': 6000, 'initial_balance': 20000, 'monthly_savings': 200},
+    ]
+    death_ages = [50, 60, 70, 80]
+    customers = simulator_inputs(items)
+    result = simulate(customers, scenario_rates([{}]), death_ages, keep_balance=False)
+
+    expected = np.array([[js_balance_at_death({key: values[i] for key, values in customers.items()}, age)
+                          for age in death_ages] for i in range(len(items))])
+    np.testing.assert_allclose(result['balance_at_death'][:, 0], expected, rtol=1e-9)
+
+
+def test_death_age_before_current_age_is_nan():
+    customers = simulator_inputs([{'current_age': 34}])
+    result = simulate(customers, scenario_rates([{}]), [33.5, 34, 34.5, 60])
+
+    at_death = result['balance_at_death'][0, 0]
+    gap = result['insurance_gap'][0, 0]
+    # 33.5 ceils to year 0 but is before the current age
+    assert np.isnan(at_death[0]) and np.isnan(gap[0])
+    assert not np.isnan(at_death[1:]).any()
+    assert not np.isnan(gap[1:]).any()
+
+
+@pytest.mark.parametrize('body', [
+    {'inputs': [{'current_age': -1e7}], 'death_ages': [60]},
+    {'inputs': [{'current_age': True}], 'death_ages': [60]},
+    {'inputs': [{'monthly_expense': float('inf')}], 'death_ages': [60]},
+    {'inputs': [{}] * 1001, 'death_ages': [60]},
+    {'inputs': [{}], 'death_ages': [True]},
+    {'inputs': [{}], 'death_ages': list(range(40, 100))},
+    {'inputs': [{}], 'death_ages': [60], 'include_trajectories': 'false'},
+])
+def test_route_rejects_invalid_inputs(body):
+    import app
+    response = app.app.test_client().post('/api/insurance-gap', json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from lstm_inference import NumpyLSTM, keras_step_function, recursive_forecast
+from lstm_rate_controller import build_rate_model
+
+LOOKBACK, FEATURES = 12, 2
+
+
+@pytest.fixture(scope='module')
+def keras_model():
+    """The rate network with random weights (biases included)"""
+    model = build_rate_model(LOOKBACK, FEATURES, lstm_units=8, learning_rate=0.005)
+    rng = np.random.default_rng(0)
+    model.set_weights([rng.normal(0, 0.3, weight.shape).astype(np.float32) for weight in model.get_weights()])
+    return model
+
+
+def test_numpy_forward_pass_matches_keras(keras_model):
+    window = np.random.default_rng(1).random((64, LOOKBACK, FEATURES), dtype=np.float32)
+    expected = keras_model(window, training=False).numpy()
+    np.testing.assert_allclose(NumpyLSTM.from_keras(keras_model)(window), expected, rtol=1e-4, atol=1e-5)
+
+
+def test_save_load_round_trip(keras_model, tmp_path):
+    numpy_model = NumpyLSTM.from_keras(keras_model)
+    path = str(tmp_path / 'weights.npz')
+    numpy_model.save(path)
+    loaded = NumpyLSTM.load(path)
+
+    assert loaded.activation_name == numpy_model.activation_name == 'relu'
+    window = np.random.default_rng(2).random((4, LOOKBACK, FEATURES), dtype=np.float32)
+    np.testing.assert_array_equal(loaded(window), numpy_model(window))
+
+
+def test_recursive_forecast_matches_keras_steps(keras_model):
+    seed = np.random.default_rng(3).random((LOOKBACK, FEATURES), dtype=np.float32)
+    expected = recursive_forecast(keras_step_function(keras_model, LOOKBACK, FEATURES), seed, 24)
+    forecast = recursive_forecast(NumpyLSTM.from_keras(keras_model), seed, 24)
+    assert forecast.shape == (24, FEATURES)
+    np.testing.assert_allclose(forecast, expected, rtol=1e-3, atol=1e-4)
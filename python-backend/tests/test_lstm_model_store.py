@@ -0,0 +1,84 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+from lstm_model_store import LSTMModelStore, hyperparameters_hash
+from lstm_rate_controller import build_rate_model
+
+HYPERPARAMETERS = {'lookback': 12, 'lstm_units': 4}
+
+
+def test_artifact_round_trip(tmp_path):
+    store = LSTMModelStore(str(tmp_path / 'lstm'))
+    assert store.read_manifest() is None and not store.is_current('abc', HYPERPARAMETERS)
+
+    model = build_rate_model(12, 2, 4, 0.005)
+    scaler = MinMaxScaler().fit(np.random.default_rng(0).random((50, 2)))
+    last_sequence = np.random.default_rng(1).random((12, 2))
+    manifest = store.save(model, scaler, last_sequence, 'abc', HYPERPARAMETERS, extra={'data_rows': 50})
+
+    assert store.read_manifest() == manifest
+    assert manifest['data_rows'] == 50
+    assert manifest['hyperparameters_hash'] == hyperparameters_hash(dict(reversed(HYPERPARAMETERS.items())))
+    np.testing.assert_array_equal(store.load_state()['last_sequence'], last_sequence)
+    np.testing.assert_array_equal(store.load_scaler().data_max_, scaler.data_max_)
+
+    loaded = build_rate_model(12, 2, 4, 0.005)
+    store.load_weights_into(loaded)
+    for expected, weight in zip(model.get_weights(), loaded.get_weights()):
+        np.testing.assert_array_equal(weight, expected)
+    assert store.has_numpy_weights()
+    np.testing.assert_array_equal(store.load_numpy_model().kernel, model.layers[0].get_weights()[0])
+
+    assert store.is_current('abc', HYPERPARAMETERS)
+    assert not store.is_current('def', HYPERPARAMETERS)
+    assert not store.is_current('abc', dict(HYPERPARAMETERS, lstm_units=8))
+
+
+def test_controller_reuses_only_a_current_artifact(make_controller, rate_csv):
+    trained = make_controller()
+    assert not trained.is_trained
+    version = trained.train_and_save()['model_version']
+
+    # Unchanged data and settings: loaded at construction, no training
+    reloaded = make_controller()
+    assert reloaded.is_trained and reloaded.model_version == version
+    np.testing.assert_array_equal(reloaded.last_sequence, trained.last_sequence)
+
+    assert not make_controller(lstm_units=5).is_trained
+
+    rows = pd.read_csv(rate_csv)
+    rows.loc[0, 'Nominal_Rate'] += 0.1
+    rows.to_csv(rate_csv, index=False)
+    changed = make_controller()
+    assert not changed.is_trained
+    assert changed.train_and_save(incremental=False)['model_version'] != version
+
+
+def test_refresh_swaps_artifacts_atomically(make_controller):
+    serving = make_controller()
+    serving.train_and_save()
+    old = serving.predict_rates(24)['nominal_rates']
+
+    retrained = make_controller()
+    new_version = retrained.train_and_save(force=True)['model_version']
+    new = retrained.predict_rates(24)['nominal_rates']
+    assert new != old
+
+    results = []
+
+    def forecast():
+        for _ in range(20):
+            results.append(serving.predict_rates(24)['nominal_rates'])
+
+    threads = [threading.Thread(target=forecast) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert serving.model_version == new_version
+    assert all(result in (old, new) for result in results)
+    assert results[-1] == new
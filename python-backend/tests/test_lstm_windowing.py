@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from lstm_windowing import sliding_windows, window_batches
+
+
+def loop_sequences(data, lookback):
+    """The original list-building implementation"""
+    X, y = [], []
+    for i in range(lookback, len(data)):
+        X.append(data[i - lookback:i])
+        y.append(data[i])
+    return np.array(X), np.array(y)
+
+
+@pytest.fixture
+def data():
+    return np.random.default_rng(0).random((100, 3))
+
+
+@pytest.mark.parametrize('lookback', [1, 6, 12, 36, 99])
+def test_sliding_windows_match_loop(data, lookback):
+    X, y = sliding_windows(data, lookback)
+    expected_X, expected_y = loop_sequences(data, lookback)
+    np.testing.assert_array_equal(X, expected_X)
+    np.testing.assert_array_equal(y, expected_y)
+    assert np.shares_memory(X, data)
+
+
+def test_short_history_has_no_windows(data):
+    X, y = sliding_windows(data[:12], 12)
+    assert X.shape == (0, 12, 3) and y.shape == (0, 3)
+
+
+@pytest.mark.parametrize('lookback', [1, 12, 36])
+@pytest.mark.parametrize('shuffle', [False, True])
+def test_window_batches_cover_every_window_once(data, lookback, shuffle):
+    X, y = sliding_windows(data, lookback)
+    batches = list(window_batches(X, y, batch_size=16, shuffle=shuffle, seed=1, dtype=np.float64))
+    assert all(len(batch_X) <= 16 for batch_X, _ in batches)
+
+    all_X = np.concatenate([batch_X for batch_X, _ in batches])
+    all_y = np.concatenate([batch_y for _, batch_y in batches])
+    expected_X, expected_y = loop_sequences(data, lookback)
+    # Each window's target is a distinct row, so sorting by it recovers the original order
+    order = np.lexsort(all_y.T[::-1])
+    expected_order = np.lexsort(expected_y.T[::-1])
+    np.testing.assert_array_equal(all_X[order], expected_X[expected_order])
+    np.testing.assert_array_equal(all_y[order], expected_y[expected_order])
+    if not shuffle:
+        np.testing.assert_array_equal(all_X, expected_X)
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from metrics import BUCKETS, METRIC_NAME, LatencyHistogram, MetricsRegistry, quantile
+
+
+def test_bucket_placement():
+    histogram = LatencyHistogram()
+    for seconds in (0.0, BUCKETS[0], BUCKETS[0] * 1.5, BUCKETS[5], BUCKETS[-1] * 2):
+        histogram.observe(seconds)
+    snapshot = histogram.snapshot()
+
+    # Bounds are inclusive upper limits; anything past the last bound goes to +Inf
+    assert snapshot['counts'][0] == 2
+    assert snapshot['counts'][1] == 1
+    assert snapshot['counts'][5] == 1
+    assert snapshot['counts'][-1] == 1
+    assert snapshot['count'] == 5
+    assert snapshot['sum'] == pytest.approx(BUCKETS[0] * 2.5 + BUCKETS[5] + BUCKETS[-1] * 2)
+
+
+def test_quantiles_interpolate_within_buckets():
+    histogram = LatencyHistogram()
+    for _ in range(100):
+        histogram.observe(BUCKETS[3])
+    snapshot = histogram.snapshot()
+    assert BUCKETS[2] < quantile(snapshot, 0.5) <= BUCKETS[3]
+    assert quantile(snapshot, 0.99) == pytest.approx(BUCKETS[2] + 0.99 * (BUCKETS[3] - BUCKETS[2]))
+
+
+def test_prometheus_rendering():
+    registry = MetricsRegistry(enabled=True, multiproc_dir=None)
+    registry.observe('categorizer', 'inference', BUCKETS[0])
+    registry.observe('categorizer', 'inference', BUCKETS[2])
+    with registry.timer('app', 'serialize "json"'):
+        pass
+    lines = registry.render_prometheus().splitlines()
+
+    labels = 'component="categorizer",stage="inference"'
+    assert f'# TYPE {METRIC_NAME} histogram' in lines
+    assert f'{METRIC_NAME}_bucket{{{labels},le="{BUCKETS[0]:.6g}"}} 1' in lines
+    assert f'{METRIC_NAME}_bucket{{{labels},le="{BUCKETS[1]:.6g}"}} 1' in lines
+    assert f'{METRIC_NAME}_bucket{{{labels},le="{BUCKETS[2]:.6g}"}} 2' in lines
+    assert f'{METRIC_NAME}_bucket{{{labels},le="+Inf"}} 2' in lines
+    assert f'{METRIC_NAME}_count{{{labels}}} 2' in lines
+    assert any(line.startswith(f'{METRIC_NAME}_quantile{{{labels},quantile="0.95"}} ') for line in lines)
+    assert f'{METRIC_NAME}_count{{component="app",stage="serialize \\"json\\""}} 1' in lines
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False, multiproc_dir=None)
+    with registry.timer('app', 'parse') as timer:
+        pass
+    registry.observe('app', 'parse', 0.1)
+    assert timer is None
+    assert registry.collect() == {}
+    assert registry.summary() == {}
+
+
+def test_worker_snapshots_merge(tmp_path, monkeypatch):
+    directory = str(tmp_path)
+    worker = MetricsRegistry(enabled=True, multiproc_dir=directory)
+    monkeypatch.setattr(worker, '_snapshot_path', lambda pid=None: os.path.join(directory, 'metrics-1.json'))
+    worker.observe('app', 'parse', BUCKETS[0])
+    worker.observe('app', 'inference', BUCKETS[4])
+    worker.flush(force=True)
+
+    scraped = MetricsRegistry(enabled=True, multiproc_dir=directory)
+    scraped.observe('app', 'parse', BUCKETS[1])
+    merged = scraped.collect()
+
+    assert merged[('app', 'parse')]['count'] == 2
+    assert merged[('app', 'parse')]['counts'][:2] == [1, 1]
+    assert merged[('app', 'parse')]['sum'] == pytest.approx(BUCKETS[0] + BUCKETS[1])
+    assert merged[('app', 'inference')]['count'] == 1
+
+    scraped.remove_process(1)
+    assert scraped.collect()[('app', 'parse')]['count'] == 1
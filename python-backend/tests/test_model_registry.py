@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from model_registry import FAILED, LOADING, UNAVAILABLE, ModelNotReady, ModelRegistry
+
+
+def test_states_and_errors():
+    registry = ModelRegistry(mode='lazy', wait_seconds=0.05)
+    release = threading.Event()
+    registry.register('slow', lambda: release.wait() and 'slow model')
+    registry.register('broken', lambda: 1 / 0)
+    registry.register('no_files', lambda: 'empty', check=lambda model: False)
+
+    assert registry.status()['slow']['state'] == 'pending'
+    with pytest.raises(ModelNotReady) as error:
+        registry.get('slow')
+    assert error.value.state == LOADING and error.value.retry_after
+
+    release.set()
+    assert registry.get('slow', timeout=None) == 'slow model'
+    assert registry.wait('broken') == FAILED
+    assert registry.wait('no_files') == UNAVAILABLE
+    with pytest.raises(ModelNotReady):
+        registry.get('no_files')
+    assert registry.get('no_files', require_ready=False) == 'empty'
+    assert registry.proxy('slow').upper() == 'SLOW MODEL'
+    assert not registry.ready
+
+
+@pytest.fixture
+def degraded_app(monkeypatch):
+    """app with a failed expense model, a still-loading rate model and an unready scoring pool"""
+    import app
+    registry = app.model_registry
+    registry.wait_all()
+    monkeypatch.setattr(registry, 'wait_seconds', 0.05)
+    monkeypatch.setattr(app, 'SCORING_WORKERS', 2)
+    saved = {name: (entry.state, entry.done) for name, entry in registry._entries.items()}
+
+    registry._entries['expense_predictor'].state = FAILED
+    registry._entries['lstm_controller'].state = LOADING
+    registry._entries['lstm_controller'].done = threading.Event()
+    registry.register('parallel_scorer', lambda: time.sleep(60))
+    registry._entries['parallel_scorer'].state = LOADING
+    yield app.app.test_client()
+
+    for name, (state, done) in saved.items():
+        registry._entries[name].state, registry._entries[name].done = state, done
+    if 'parallel_scorer' not in saved:
+        del registry._entries['parallel_scorer']
+
+
+def test_healthy_models_keep_serving(degraded_app, profiles):
+    response = degraded_app.post('/api/categorize', json=profiles[:3])
+    assert response.status_code == 200
+    assert len(response.get_json()['results']) == 3
+    assert degraded_app.post('/api/cluster-customer', json=profiles[0]).status_code == 200
+
+    response = degraded_app.post('/api/predict-expense', json={"customer_data": profiles[0], "event_type": "Marriage"})
+    assert response.status_code == 503
+    assert response.get_json()['state'] == FAILED
+
+    response = degraded_app.get('/api/latest-rates')
+    assert response.status_code == 503
+    assert response.headers['Retry-After']
+    assert degraded_app.get('/api/health').status_code == 503
+    assert degraded_app.get('/').status_code == 200
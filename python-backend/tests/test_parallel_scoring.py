@@ -0,0 +1,23 @@
+import pytest
+
+from life_stage_expense_prediction import EVENT_TYPES
+from parallel_scoring import ParallelScorer
+
+
+@pytest.fixture(scope='module')
+def scorer(categorizer, expense_predictor):
+    # 3000 profiles split into two shards (MIN_SHARD_SIZE is 2000)
+    scorer = ParallelScorer(categorizer, expense_predictor, workers=2, min_batch_size=1)
+    yield scorer
+    scorer.shutdown()
+
+
+def test_categorize_matches_in_process(scorer, categorizer, profiles):
+    assert scorer.enabled
+    expected = categorizer.preprocess_and_categorize(profiles, include_posteriors=True)
+    assert scorer.categorize(profiles, include_posteriors=True) == expected
+
+
+def test_expense_batch_matches_in_process(scorer, expense_predictor, profiles):
+    expected = expense_predictor.predict_event_expenses(profiles, EVENT_TYPES)
+    assert scorer.predict_event_expenses(profiles, EVENT_TYPES) == expected
@@ -0,0 +1,69 @@
+import json
+
+import numpy as np
+import pytest
+
+from customer_categorizer import ARCHETYPE_MAP
+from product_recommendations import ProductRecommendationIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Three segments: A, B, C lists with one product shared by A and B"""
+    catalog = {'clusters': [
+        {'category': 'Seg A', 'products': [{'name': 'a1', 'description': 'first'}, {'name': 'shared'}]},
+        {'category': 'Seg  B', 'products': [{'name': 'shared'}, {'name': 'b2'}, {'name': 'b3'}]},
+        {'category': 'Seg C', 'products': [{'name': 'c1'}]},
+    ]}
+    path = tmp_path / 'catalog.json'
+    path.write_text(json.dumps(catalog))
+    return ProductRecommendationIndex({0: 'Seg A', 1: 'seg b', 2: 'Seg C'}, str(path))
+
+
+def test_rank_weights(index):
+    # A segment's products get weights n, n-1, ..., 1, normalised to sum to 1
+    names = [product['name'] for product in index.products]
+    assert names == ['a1', 'shared', 'b2', 'b3', 'c1']
+    np.testing.assert_allclose(index.scores.sum(axis=1), 1.0)
+    np.testing.assert_allclose(index.scores[1, [1, 2, 3]], [3 / 6, 2 / 6, 1 / 6])
+
+
+def test_top_segments_blend_renormalised(index):
+    posteriors = np.array([[0.5, 0.3, 0.2]])
+    [products] = index.recommend(posteriors, top_segments=2, max_products=10)
+
+    # Top two segments renormalise to 0.625 / 0.375; segment C is dropped
+    weights = {0: 0.625, 1: 0.375}
+    expected = {
+        'a1': weights[0] * 2 / 3,
+        'shared': weights[0] * 1 / 3 + weights[1] * 3 / 6,
+        'b2': weights[1] * 2 / 6,
+        'b3': weights[1] * 1 / 6,
+    }
+    assert [product['name'] for product in products] == sorted(expected, key=expected.get, reverse=True)
+    for product in products:
+        assert product['score'] == pytest.approx(expected[product['name']], abs=1e-6)
+    assert sum(product['score'] for product in products) == pytest.approx(1.0, abs=1e-5)
+    assert {product['name']: product['segment_id'] for product in products} == \
+        {'a1': 0, 'shared': 0, 'b2': 1, 'b3': 1}
+    assert products[0]['description'] == 'first'
+
+
+def test_single_segment_and_limits(index):
+    posteriors = np.array([[0.1, 0.1, 0.8], [0.2, 0.7, 0.1]])
+    assert index.recommend(posteriors, top_segments=1) == [
+        [{'name': 'c1', 'description': '', 'score': 1.0, 'segment_id': 2}],
+        [{'name': 'shared', 'description': '', 'score': 0.5, 'segment_id': 1},
+         {'name': 'b2', 'description': '', 'score': pytest.approx(1 / 3, abs=1e-6), 'segment_id': 1},
+         {'name': 'b3', 'description': '', 'score': pytest.approx(1 / 6, abs=1e-6), 'segment_id': 1}],
+    ]
+    assert len(index.recommend(posteriors, top_segments=3, max_products=2)[1]) == 2
+    # top_segments beyond K blends every segment
+    assert len(index.recommend(posteriors, top_segments=10, max_products=10)[0]) == 5
+
+
+def test_every_archetype_matches_the_catalog():
+    # ARCHETYPE_MAP writes 'Mid-Career/Transitional', the catalog 'Mid-Career / Transitional'
+    index = ProductRecommendationIndex(ARCHETYPE_MAP)
+    assert index.n_segments == len(ARCHETYPE_MAP)
+    assert (index.scores.sum(axis=1) > 0).all()
@@ -0,0 +1,49 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from conftest import BACKEND_DIR
+from rate_history import load_rate_history
+
+
+@pytest.fixture
+def csv_copy(tmp_path):
+    path = str(tmp_path / 'rates.csv')
+    shutil.copy(os.path.join(BACKEND_DIR, 'ai_model_input_data.csv'), path)
+    return path
+
+
+def test_cached_frame_matches_read_csv(csv_copy, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    expected = pd.read_csv(csv_copy, index_col='Date', parse_dates=True)
+
+    first = load_rate_history(csv_copy, cache_dir)
+    second = load_rate_history(csv_copy, cache_dir)
+    assert not first.from_cache and second.from_cache
+    assert first.sha256 == second.sha256
+    pd.testing.assert_frame_equal(first.frame, expected)
+    pd.testing.assert_frame_equal(second.frame, expected)
+
+
+def test_cache_rebuilds_only_when_content_changes(csv_copy, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    original = load_rate_history(csv_copy, cache_dir)
+
+    # A new mtime with the same bytes re-hashes but keeps the cache
+    stat = os.stat(csv_copy)
+    os.utime(csv_copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    touched = load_rate_history(csv_copy, cache_dir)
+    assert touched.from_cache and touched.sha256 == original.sha256
+
+    rows = pd.read_csv(csv_copy)
+    rows.loc[0, 'Nominal_Rate'] += 1.0
+    rows.to_csv(csv_copy, index=False)
+    changed = load_rate_history(csv_copy, cache_dir)
+    assert not changed.from_cache and changed.sha256 != original.sha256
+    assert changed.frame['Nominal_Rate'].iloc[0] == original.frame['Nominal_Rate'].iloc[0] + 1.0
+
+    reloaded = load_rate_history(csv_copy, cache_dir)
+    assert reloaded.from_cache
+    pd.testing.assert_frame_equal(reloaded.frame, changed.frame)
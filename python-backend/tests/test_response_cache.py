@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from customer_features import profile_fingerprint
+from response_cache import ResponseCache, cache_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    path = tmp_path / 'models'
+    path.mkdir()
+    (path / 'model.joblib').write_bytes(b'v1')
+    return path
+
+
+def make_cache(clock, models_dir, **options):
+    return ResponseCache(models_dir=str(models_dir), clock=clock, **options)
+
+
+def test_entries_expire_after_ttl(clock, models_dir):
+    cache = make_cache(clock, models_dir, ttl_seconds=10)
+    cache.put('a', {'value': 1})
+    clock.now += 9.9
+    assert cache.get('a') == {'value': 1}
+    clock.now += 0.1
+    assert cache.get('a') is None
+    stats = cache.stats()
+    assert (stats['entries'], stats['bytes'], stats['hits'], stats['misses'], stats['expirations']) == (0, 0, 1, 1, 1)
+
+
+def test_entry_limit_evicts_least_recently_used(clock, models_dir):
+    cache = make_cache(clock, models_dir, max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_byte_budget_evicts(clock, models_dir):
+    value = {'payload': 'x' * 100}
+    size = len(json.dumps(value, separators=(',', ':')))
+    cache = make_cache(clock, models_dir, max_bytes=2 * size)
+    for key in 'abc':
+        cache.put(key, value)
+    assert cache.get('a') is None and cache.get('c') == value
+    assert cache.stats()['bytes'] == 2 * size
+
+    cache.put('huge', {'payload': 'x' * (3 * size)})
+    assert cache.get('huge') is None and cache.stats()['bytes'] == 2 * size
+
+
+def test_model_file_changes_clear_the_cache(clock, models_dir):
+    cache = make_cache(clock, models_dir, check_interval=2.0)
+    cache.put('a', 1)
+    (models_dir / 'model.joblib').write_bytes(b'version 2')
+    # Checked at most every check_interval
+    assert cache.get('a') == 1
+    clock.now += 2.0
+    assert cache.get('a') is None
+    assert cache.stats()['invalidations'] == 1
+
+    cache.put('a', 1)
+    (models_dir / 'new_model.npz').write_bytes(b'')
+    clock.now += 2.0
+    assert cache.get('a') is None
+    assert cache.stats()['invalidations'] == 2
+
+
+def test_key_ignores_unconsumed_fields(profiles):
+    profile = profiles[0]
+    edited = dict(profile, Customer_Notes="prefers email",
+                  **{'Personal Details': dict(profile['Personal Details'], Name="Someone Else")})
+    assert profile_fingerprint(edited) == profile_fingerprint(profile)
+    assert cache_key('predict-expense', profile_fingerprint(edited), 'Marriage') == \
+        cache_key('predict-expense', profile_fingerprint(profile), 'Marriage')
+
+    older = dict(profile, **{'Personal Details': dict(profile['Personal Details'],
+                                                      Age=profile['Personal Details']['Age'] + 1)})
+    assert profile_fingerprint(older) != profile_fingerprint(profile)
+    assert cache_key('predict-expense', profile_fingerprint(profile), 'Divorce') != \
+        cache_key('predict-expense', profile_fingerprint(profile), 'Marriage')
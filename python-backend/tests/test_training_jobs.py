@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+
+def gate_training(controller, fail=False):
+    """Hold the controller's training job until the returned event is set"""
+    release = threading.Event()
+    update_model = controller._update_model
+
+    def gated(job=None, incremental=True):
+        release.wait(30)
+        if fail:
+            raise RuntimeError("disk full")
+        return update_model(job, incremental)
+
+    controller._update_model = gated
+    return release
+
+
+@pytest.fixture
+def rate_app(monkeypatch):
+    """app with its registered lstm_controller swapped for another controller"""
+    import app
+    app.model_registry.wait_all()
+    entry = app.model_registry._entries['lstm_controller']
+
+    def use(controller):
+        monkeypatch.setattr(entry, 'model', controller)
+        return app.app.test_client()
+    return use
+
+
+def test_concurrent_cold_calls_share_one_job(make_controller):
+    controller = make_controller()
+    release = gate_training(controller)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def cold_call():
+        barrier.wait()
+        results.append(controller.predict_rates(12, wait=0))
+
+    threads = [threading.Thread(target=cold_call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(result['status'] == 'training' for result in results)
+    assert len({result['job']['job_id'] for result in results}) == 1
+    release.set()
+    job = controller.training_jobs.current
+    assert job.wait(60) and job.status == 'succeeded'
+    assert controller.predict_rates(12)['success']
+
+
+def test_route_answers_202_then_200(make_controller, rate_app):
+    controller = make_controller()
+    release = gate_training(controller)
+    client = rate_app(controller)
+
+    response = client.get('/api/predict-rates?wait=0')
+    assert response.status_code == 202
+    assert response.headers['Retry-After']
+    location = response.headers['Location']
+    assert location == f"/api/predict-rates/jobs/{response.get_json()['job']['job_id']}"
+    assert client.get(location).get_json()['job']['status'] in ('queued', 'running')
+
+    release.set()
+    deadline = time.monotonic() + 60
+    while client.get(location).get_json()['job']['status'] != 'succeeded':
+        assert time.monotonic() < deadline
+        time.sleep(0.1)
+    response = client.get('/api/predict-rates')
+    assert response.status_code == 200
+    assert len(response.get_json()['nominal_rates']) == 60
+    assert client.get('/api/predict-rates/jobs/unknown').status_code == 404
+
+
+def test_failed_job_reports_failed(make_controller, rate_app):
+    controller = make_controller()
+    release = gate_training(controller, fail=True)
+    client = rate_app(controller)
+
+    location = client.get('/api/predict-rates?wait=0').headers['Location']
+    release.set()
+    controller.training_jobs.current.wait(30)
+
+    job = client.get(location).get_json()['job']
+    assert job['status'] == 'failed'
+    assert job['error'] == "disk full"
+    # The next cold call starts a new job rather than reporting the old failure
+    response = client.get('/api/predict-rates?wait=0')
+    assert response.status_code == 202
+    assert response.headers['Location'] != location
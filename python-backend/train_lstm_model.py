@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Offline / deploy-time training for the LSTM rate model.
+
+Trains the model and writes the artifact (weights, scaler, last sequence and
+manifest) to models/lstm/ so the Flask backend can load it at startup instead
+of training on the first /api/predict-rates request. Training is skipped when
+the stored artifact already matches the data file hash and hyperparameters.
+When the data file only gained new months, the stored model is fine-tuned on
+the recent window instead (seconds rather than a full fit), unless the new
+data leaves the scaler's range or the model's error on it has drifted.
+
+Usage:
+    python train_lstm_model.py [--data ai_model_input_data.csv] [--force] [--full]
+    python train_lstm_model.py --export-numpy   # backfill lstm_rate_weights.npz
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from lstm_rate_controller import LSTMRateController
+from lstm_model_store import DEFAULT_ARTIFACT_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and persist the LSTM rate model")
+    parser.add_argument('--data', default='ai_model_input_data.csv', help="Path to the rate history CSV")
+    parser.add_argument('--artifact-dir', default=DEFAULT_ARTIFACT_DIR, help="Where to write the model artifact")
+    parser.add_argument('--force', action='store_true', help="Retrain even if the artifact is current")
+    parser.add_argument('--full', action='store_true',
+                        help="Train from scratch even if the data only gained new months")
+    parser.add_argument('--export-numpy', action='store_true',
+                        help="Only (re)write the NumPy weight export for the current artifact")
+    args = parser.parse_args()
+
+    start = time.time()
+    controller = LSTMRateController(data_file_path=args.data, artifact_dir=args.artifact_dir)
+    if controller.data is None:
+        print(f"Error: could not load training data from '{args.data}'")
+        return 1
+
+    if args.export_numpy:
+        if not controller.is_trained:
+            print("Error: no current artifact to export; train it first")
+            return 1
+        controller.export_numpy_weights()
+        print(f"NumPy weights exported to {args.artifact_dir}")
+        return 0
+
+    manifest = controller.train_and_save(force=args.force, incremental=not args.full)
+    if manifest is None:
+        print("Error: model was trained but the artifact could not be written")
+        return 1
+
+    print(f"LSTM artifact ready in {time.time() - start:.1f}s")
+    if controller.last_update is not None:
+        print(f"Update: {json.dumps(controller.last_update)}")
+    print(json.dumps(manifest, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
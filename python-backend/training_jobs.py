@@ -0,0 +1,144 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Background LSTM Training Jobs ---
+
+
+class TrainingJob:
+    """State of one training run, updated by the training thread"""
+
+    def __init__(self, total_epochs):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.status = 'queued'  # queued -> running -> succeeded | failed
+        self.total_epochs = total_epochs
+        self.epochs_done = 0
+        self.phase = None
+        self.loss = None
+        self.val_loss = None
+        self.error = None
+        self.model_version = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self._lock = threading.Lock()
+
+    @property
+    def done(self):
+        return self.status in ('succeeded', 'failed')
+
+    def mark_running(self):
+        with self._lock:
+            self.status = 'running'
+            self.started_at = time.time()
+
+    def record_epoch(self, phase, logs):
+        """Called at the end of every epoch of every fit() phase"""
+        with self._lock:
+            self.phase = phase
+            self.epochs_done += 1
+            if 'loss' in logs:
+                self.loss = float(logs['loss'])
+            if 'val_loss' in logs:
+                self.val_loss = float(logs['val_loss'])
+
+    def mark_finished(self, error=None, model_version=None):
+        with self._lock:
+            self.status = 'failed' if error is not None else 'succeeded'
+            self.error = error
+            self.model_version = model_version
+            self.finished_at = time.time()
+
+    def wait(self, timeout=None):
+        """Block until the job finishes or the timeout passes; True if it is done"""
+        if self.future is not None and not self.done:
+            try:
+                self.future.result(timeout=timeout)
+            except Exception:
+                pass
+        return self.done
+
+    def to_dict(self):
+        with self._lock:
+            now = self.finished_at or time.time()
+            elapsed = now - self.started_at if self.started_at else 0.0
+            progress = self.epochs_done / self.total_epochs if self.total_epochs else 0.0
+            eta = None
+            if self.status == 'running' and self.epochs_done:
+                eta = round(elapsed / self.epochs_done * (self.total_epochs - self.epochs_done), 1)
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "phase": self.phase,
+                "epochs_done": self.epochs_done,
+                "total_epochs": self.total_epochs,
+                "progress": round(progress, 4),
+                "loss": self.loss,
+                "val_loss": self.val_loss,
+                "elapsed_seconds": round(elapsed, 1),
+                "eta_seconds": eta,
+                "model_version": self.model_version,
+                "error": self.error,
+            }
+
+
+def keras_progress_callback(job, phase):
+    """Keras callback that records each epoch's logs on the job"""
+    from tensorflow.keras.callbacks import Callback
+
+    class _JobProgress(Callback):
+        def on_epoch_end(self, epoch, logs=None):
+            job.record_epoch(phase, logs or {})
+
+    return _JobProgress()
+
+
+class TrainingJobManager:
+    """Runs at most one training job at a time on a background thread"""
+
+    def __init__(self, max_history=20):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='lstm-training')
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._max_history = max_history
+        self.current = None
+
+    def submit(self, train_fn, total_epochs):
+        """
+        Start train_fn(job) in the background unless a job is already active
+
+        Args:
+            train_fn (callable): train_fn(job) trains, reports progress and returns the model version
+            total_epochs (int): Epochs across all fit() phases, for progress/ETA
+
+        Returns:
+            tuple: (TrainingJob, bool started) - the active job if one exists
+        """
+        with self._lock:
+            if self.current is not None and not self.current.done:
+                return self.current, False
+
+            job = TrainingJob(total_epochs)
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > self._max_history:
+                del self._jobs[next(iter(self._jobs))]
+            self.current = job
+            job.future = self._executor.submit(self._run, job, train_fn)
+            return job, True
+
+    @staticmethod
+    def _run(job, train_fn):
+        job.mark_running()
+        try:
+            model_version = train_fn(job)
+        except Exception as e:
+            job.mark_finished(error=str(e))
+            raise
+        job.mark_finished(model_version=model_version)
+        return model_version
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
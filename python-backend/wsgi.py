@@ -0,0 +1,11 @@
+"""
+Production WSGI entry point for the WealthWise Python backend.
+
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+See gunicorn.conf.py for worker, thread and reload settings.
+"""
+
+from app import create_app
+
+application = create_app()